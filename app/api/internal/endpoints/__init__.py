@@ -1,7 +1,8 @@
 from fastapi import APIRouter
 
-from app.api.internal.endpoints import game_server
+from app.api.internal.endpoints import game_server, rooms
 
 internal_router = APIRouter()
 
 internal_router.include_router(game_server.router, prefix="/game-server")
+internal_router.include_router(rooms.router, prefix="/rooms")
@@ -0,0 +1,65 @@
+from fastapi import APIRouter, status
+
+from app.core.metrics import quick_match_stats
+from app.core.room_connection_manager import room_manager
+from app.schemas.common import BaseResponse
+from app.schemas.room import RoomCleanupResponse
+from app.services.presence_registry import presence_registry
+from app.services.room_state import room_state_store
+from app.services.room_sweeper import room_sweeper
+
+router = APIRouter(tags=["rooms"])
+
+
+@router.post(
+    "/cleanup",
+    response_model=RoomCleanupResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def run_room_cleanup():
+    return await room_sweeper.sweep()
+
+
+@router.get(
+    "/cleanup",
+    response_model=BaseResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def read_room_cleanup_stats():
+    return BaseResponse(message="Room cleanup stats", data=room_sweeper.stats())
+
+
+@router.get(
+    "/quick-match",
+    response_model=BaseResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def read_quick_match_stats():
+    return BaseResponse(message="Quick match stats", data=quick_match_stats.as_dict())
+
+
+@router.get(
+    "/connections",
+    response_model=BaseResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def read_connection_stats():
+    return BaseResponse(message="Room connection stats", data=room_manager.stats())
+
+
+@router.get(
+    "/presence",
+    response_model=BaseResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def read_presence_stats():
+    return BaseResponse(message="Room presence stats", data=presence_registry.stats())
+
+
+@router.get(
+    "/state",
+    response_model=BaseResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def read_room_state_stats():
+    return BaseResponse(message="Room state stats", data=room_state_store.stats())
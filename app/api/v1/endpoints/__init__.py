@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, room, user, watch, ws_room
+from app.api.v1.endpoints import auth, room, user, watch, ws_lobby, ws_room
 
 api_router = APIRouter()
 
@@ -8,6 +8,8 @@ api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 
 api_router.include_router(ws_room.router, prefix="/ws/room", tags=["ws"])
 
+api_router.include_router(ws_lobby.router, prefix="/ws/lobby", tags=["ws"])
+
 api_router.include_router(user.router, prefix="/user", tags=["users"])
 
 api_router.include_router(room.router, prefix="/room", tags=["rooms"])
@@ -1,6 +1,9 @@
-from fastapi import APIRouter, Depends, status
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 
 from app.core.error import DomainErrorCode, MCRDomainError
+from app.core.lobby_cache import encode_rooms
 from app.dependencies.auth import get_current_user
 from app.dependencies.repositories import get_room_by_number
 from app.dependencies.services import get_room_service
@@ -10,6 +13,7 @@ from app.models.user import User
 from app.schemas.common import BaseResponse
 from app.schemas.room import (
     AvailableRoomResponse,
+    LobbyQuery,
     RoomDetailResponse,
     RoomResponse,
     RoomUsersResponse,
@@ -64,17 +68,53 @@ async def join_room(
     )
 
 
+@router.post(
+    "/quick-match",
+    response_model=RoomResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def quick_match(
+    current_user: User = Depends(get_current_user),
+    room_service: RoomService = Depends(get_room_service),
+):
+    existing_ru = await room_service.room_user_repository.filter_one(
+        user_id=current_user.id
+    )
+    if existing_ru:
+        await room_service.leave_room(
+            user_id=current_user.id, room_id=existing_ru.room_id
+        )
+
+    return await room_service.quick_match(current_user.id)
+
+
 @router.get(
     "",
     response_model=list[AvailableRoomResponse],
     status_code=status.HTTP_200_OK,
 )
 async def get_available_rooms(
+    request: Request,
+    query: Annotated[LobbyQuery, Query()],
     current_user: User = Depends(get_current_user),  # noqa : ARG001
     room_service: RoomService = Depends(get_room_service),
 ):
-    await room_service.cleanup_rooms()
-    return await room_service.get_available_rooms()
+    snapshot = await room_service.get_lobby_snapshot()
+    etag = snapshot.etag_for(**query.model_dump(exclude_defaults=True))
+    headers = {"ETag": etag, "X-Lobby-Version": str(snapshot.version)}
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if query == LobbyQuery():
+        content = snapshot.payload
+    else:
+        rooms, next_cursor = snapshot.page(**query.model_dump())
+        if next_cursor is not None:
+            headers["X-Next-Cursor"] = str(next_cursor)
+        content = encode_rooms(rooms)
+
+    return Response(content=content, media_type="application/json", headers=headers)
 
 
 @router.get(
@@ -86,7 +126,7 @@ async def read_room_users(
     room: Room = Depends(get_room_by_number),
     room_service: RoomService = Depends(get_room_service),
 ):
-    return await room_service.get_room_users(room.id)
+    return await room_service.get_room_snapshot(room)
 
 
 @router.post(
@@ -157,7 +197,7 @@ async def get_my_room(
             details={"room_id": str(room_user.room_id)},
         )
 
-    room_users_response = await room_service.get_room_users(room.id)
+    room_users_response = await room_service.get_room_snapshot(room)
     users = room_users_response.users
 
     return RoomDetailResponse(
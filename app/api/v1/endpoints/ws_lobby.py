@@ -0,0 +1,41 @@
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+
+from app.api.v1.endpoints.ws_room import decode_frame
+from app.core.lobby_connection_manager import lobby_manager
+from app.core.security import get_user_id_from_token
+from app.schemas.ws import WebSocketResponse, WSActionType
+
+router = APIRouter()
+
+
+@router.websocket("")
+async def lobby_websocket(websocket: WebSocket) -> None:
+    token = websocket.query_params.get("authorization")
+    if not token or not get_user_id_from_token(token):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await lobby_manager.connect(websocket)
+    try:
+        while True:
+            decoded = decode_frame(await websocket.receive_text())
+            if decoded is None:
+                await websocket.send_text(
+                    WebSocketResponse(
+                        status="error",
+                        action=WSActionType.ERROR,
+                        error="Invalid message format",
+                    ).model_dump_json()
+                )
+            elif decoded[0] == WSActionType.PING:
+                await websocket.send_text(
+                    WebSocketResponse(
+                        status="success",
+                        action=WSActionType.PONG,
+                        data={"message": "pong"},
+                    ).model_dump_json()
+                )
+    except WebSocketDisconnect:
+        pass
+    finally:
+        lobby_manager.disconnect(websocket)
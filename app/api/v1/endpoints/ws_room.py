@@ -1,19 +1,27 @@
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, suppress
+from functools import lru_cache
+from typing import Any, ClassVar
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, status
-from fastapi.encoders import jsonable_encoder
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
 from fastapi.websockets import WebSocketState
 from pydantic import ValidationError
+from pydantic_core import from_json, to_json
 from sqlalchemy.orm import selectinload
 
 from app.core.error import MCRDomainError
+from app.core.rate_limit import ActionRateLimiter
 from app.core.room_connection_manager import room_manager
 from app.core.security import get_user_id_from_token
-from app.dependencies.services import get_room_service
+from app.core.ws_codec import unpack
+from app.models.room import Room
 from app.models.room_user import RoomUser
 from app.models.user import User
 from app.schemas.character import CharacterResponse
 from app.schemas.ws import (
+    RoomProtocol,
     UserJoinedData,
     UserLeftData,
     UserListData,
@@ -22,25 +30,184 @@ from app.schemas.ws import (
     WebSocketResponse,
     WSActionType,
 )
-from app.services.room_service import RoomService
+from app.services.presence_registry import presence_registry
+from app.services.room_service import RoomService, room_service_scope
 
 router = APIRouter()
 
+PONG_FRAME = to_json(
+    {"status": "success", "action": WSActionType.PONG, "data": {"message": "pong"}}
+).decode()
+
+
+@lru_cache(maxsize=256)
+def error_frame(error: str) -> str:
+    return to_json(
+        {"status": "error", "action": WSActionType.ERROR, "error": error}
+    ).decode()
+
+
+RATE_LIMITED_FRAME = error_frame("Rate limit exceeded")
+
+
+def decode_frame(frame: str | bytes) -> tuple[str, Any] | None:
+    """Return (action, data) from a client frame, or None if it is malformed.
+
+    Text frames are JSON; binary frames are MessagePack with short keys.
+    """
+    try:
+        raw = unpack(frame) if isinstance(frame, bytes) else from_json(frame)
+    except ValueError:
+        return None
+    if not isinstance(raw, dict):
+        return None
+    action = raw.get("action", "")
+    if not isinstance(action, str):
+        return None
+    return action, raw.get("data")
+
+
+def negotiate_protocol(offered: str | None) -> RoomProtocol | None:
+    """Pick the first subprotocol in a Sec-WebSocket-Protocol header we speak."""
+    if not offered:
+        return None
+    for token in offered.split(","):
+        try:
+            return RoomProtocol(token.strip())
+        except ValueError:
+            continue
+    return None
+
+
+ServiceScope = Callable[[], AbstractAsyncContextManager[RoomService]]
+
 
 class RoomWebSocketHandler:
+    """Serves one room socket.
+
+    The socket holds no database session while idle: ``service_scope`` opens
+    one (and its pooled connection) only around validation, each DB-backed
+    action and the disconnect path, and releases it right after.
+    """
+
     def __init__(
-        self, websocket: WebSocket, room_number: int, room_service: RoomService
+        self,
+        websocket: WebSocket,
+        room_number: int,
+        service_scope: ServiceScope = room_service_scope,
     ):
         self.websocket = websocket
         self.room_number = room_number
-        self.room_service = room_service
+        self.service_scope = service_scope
+        self._room_service: RoomService | None = None
         self.user_id: UUID | None = None
         self.room_id: UUID | None = None
         self.user: User | None = None
         self.room_user: RoomUser | None = None
+        self.room_playing = False
+        self.returning = False
+        self.reaped = False
+        self.kicked = False
+        self.rate_limiter = ActionRateLimiter()
+        self.protocol: RoomProtocol | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def room_service(self) -> RoomService:
+        if self._room_service is None:
+            raise RuntimeError("room_service is only available inside self.session()")  # noqa: TRY003
+        return self._room_service
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[RoomService]:
+        if self._room_service is not None:
+            yield self._room_service
+            return
+        async with self.service_scope() as room_service:
+            self._room_service = room_service
+            try:
+                yield room_service
+            finally:
+                self._room_service = None
+
+    def resume_token(self) -> tuple[str | None, int | None]:
+        """The (epoch, seq) of the last event a reconnecting client applied."""
+        epoch = self.websocket.query_params.get("resume_epoch")
+        try:
+            seq = int(self.websocket.query_params.get("resume_seq", ""))
+        except ValueError:
+            seq = None
+        return epoch, seq
+
+    async def snapshot_frame(self, room: Room) -> str:
+        snapshot = await self.room_service.get_room_snapshot(room)
+        return WebSocketResponse(
+            status="success",
+            action=WSActionType.ROOM_SNAPSHOT,
+            data=snapshot.model_dump(),
+        ).model_dump_json()
+
+    async def open(self, user_id: UUID) -> None:
+        """Validate the seat, accept the socket and queue the opening frames.
+
+        A client presenting a resume token still covered by the room's replay
+        buffer gets only the events it missed; every other client gets a
+        ``room_snapshot`` of host, seats, ready flags and characters first.
+        The position is read before the snapshot, so events racing the query
+        are replayed after it instead of being lost, and nothing broadcast
+        later can reach the socket ahead of it. Only clients that presented a
+        token or negotiated v2 are sent the ``resume`` frame itself.
+        """
+        resume_epoch, resume_seq = self.resume_token()
+        snapshot: str | None = None
+        async with self.session() as room_service:
+            (
+                self.user,
+                room,
+                self.room_user,
+            ) = await room_service.validate_room_user_connection(
+                user_id, self.room_number
+            )
+            if room_manager.can_resume(room.id, resume_epoch, resume_seq):
+                after = resume_seq or 0
+            else:
+                _, after = room_manager.position(room.id)
+                snapshot = await self.snapshot_frame(room)
+
+        self.user_id = self.user.id
+        self.room_id = room.id
+        self.room_playing = room.is_playing
+        # Back within the grace period: the others never saw this user leave.
+        self.returning = room_manager.cancel_grace(self.room_id, self.user_id)
+
+        self.protocol = negotiate_protocol(
+            self.websocket.headers.get("sec-websocket-protocol")
+        )
+        await room_manager.connect(
+            self.websocket,
+            self.room_id,
+            self.user_id,
+            on_dead=self.reap,
+            protocol=self.protocol,
+        )
+        room_manager.resume(
+            self.room_id,
+            self.user_id,
+            after,
+            snapshot,
+            announce=resume_epoch is not None
+            or (self.protocol is not None and self.protocol.coalesced),
+        )
+
+    def reap(self) -> None:
+        """Called by the heartbeat when the client has gone silent."""
+        self.reaped = True
+        if self._task is not None:
+            self._task.cancel()
 
     async def handle_connection(self):
         result = True
+        self._task = asyncio.current_task()
         try:
             token = self.websocket.query_params.get("authorization")
             if not token:
@@ -52,33 +219,15 @@ class RoomWebSocketHandler:
                     await self.websocket.close(code=status.WS_1008_POLICY_VIOLATION)
                     result = False
                 else:
-                    (
-                        self.user,
-                        room,
-                        self.room_user,
-                    ) = await self.room_service.validate_room_user_connection(
-                        user_id, self.room_number
-                    )
-
-                    self.user_id = self.user.id
-                    self.room_id = room.id
-
-                    await room_manager.connect(
-                        self.websocket, self.room_id, self.user_id
-                    )
+                    await self.open(user_id)
+                    presence_registry.touch()
 
                     if self.user is None or self.room_user is None:
-                        await self.websocket.send_json(
-                            jsonable_encoder(
-                                WebSocketResponse(
-                                    status="error",
-                                    action=WSActionType.ERROR,
-                                    error="User or room user data is missing",
-                                )
-                            )
-                        )
+                        await self.send_error("User or room user data is missing")
                         await self.websocket.close(code=status.WS_1011_INTERNAL_ERROR)
                         result = False
+                    elif self.returning:
+                        await self.handle_messages()
                     else:
                         join_data = UserJoinedData(
                             user_uid=self.user.uid,
@@ -96,7 +245,7 @@ class RoomWebSocketHandler:
                                 status="success",
                                 action=WSActionType.USER_JOINED,
                                 data=join_data.model_dump(),
-                            ).model_dump(),
+                            ),
                             self.room_id,
                             exclude_user_id=self.user_id,
                         )
@@ -110,6 +259,17 @@ class RoomWebSocketHandler:
         except WebSocketDisconnect:
             await self.handle_disconnection()
             result = False
+        except asyncio.CancelledError:
+            if not self.reaped or self._task is None:
+                raise
+            self._task.uncancel()
+            await self.handle_disconnection()
+            with suppress(Exception):
+                await asyncio.wait_for(
+                    self.websocket.close(code=status.WS_1001_GOING_AWAY),
+                    room_manager.send_timeout,
+                )
+            result = False
         except Exception as e:
             await self.handle_error(e)
             result = False
@@ -117,44 +277,74 @@ class RoomWebSocketHandler:
         return result
 
     async def handle_messages(self):
+        receive: Callable[[], Awaitable[str | bytes]] = (
+            self.websocket.receive_bytes
+            if self.protocol and self.protocol.binary
+            else self.websocket.receive_text
+        )
         while True:
-            data = await self.websocket.receive_json()
+            frame = await receive()
+            if self.user_id is not None:
+                room_manager.touch(self.user_id)
+            await self.dispatch(frame)
+
+    async def dispatch(self, frame: str | bytes) -> None:
+        decoded = decode_frame(frame)
+        action, data = decoded or ("", None)
+        if not self.rate_limiter.allow(action):
+            await self.reject_rate_limited()
+            return
+        if decoded is None:
+            await self.send_error("Invalid message format")
+            return
+
+        handler = self.HANDLERS.get(action)
+        if handler is None:
+            await self.send_error(f"Unknown action: {action}")
+            return
+        if not (self.user_id and self.room_id and self.room_user):
+            await self.send_error("User or room user data is missing")
+            return
+
+        if action in self.VALIDATED_ACTIONS:
             try:
-                message = WebSocketMessage(
-                    action=data.get("action", ""), data=data.get("data")
-                )
+                message = WebSocketMessage(action=action, data=data)
             except ValidationError as e:
-                await self.websocket.send_json(
-                    jsonable_encoder(
-                        WebSocketResponse(
-                            status="error",
-                            action=WSActionType.ERROR,
-                            error=f"Invalid message format: {e!s}",
-                        )
-                    )
-                )
-                continue
-
-            message_handlers = {
-                WSActionType.PING: self.handle_ping,
-                WSActionType.READY: self.handle_ready,
-                WSActionType.LEAVE: self.handle_leave,
-                WSActionType.ADD_BOT: self.handle_add_bot,
-            }
-
-            handler = message_handlers.get(message.action)
-            if handler and self.user_id and self.room_id and self.room_user:
-                await handler(message)
-            else:
-                await self.websocket.send_json(
-                    jsonable_encoder(
-                        WebSocketResponse(
-                            status="error",
-                            action=WSActionType.ERROR,
-                            error=f"Unknown action: {message.action}",
-                        )
-                    )
-                )
+                await self.send_error(f"Invalid message format: {e!s}")
+                return
+        else:
+            message = WebSocketMessage.model_construct(action=action, data=None)
+
+        if action in self.DB_ACTIONS:
+            async with self.session():
+                await handler(self, message)
+        else:
+            await handler(self, message)
+
+    async def reject_rate_limited(self) -> None:
+        if not self.rate_limiter.exhausted:
+            await self.send_frame(RATE_LIMITED_FRAME)
+            return
+        # Kicked, not lost: no grace period to reconnect into the seat.
+        self.kicked = True
+        await self.websocket.close(
+            code=status.WS_1008_POLICY_VIOLATION, reason="Rate limit exceeded"
+        )
+        raise WebSocketDisconnect(code=status.WS_1008_POLICY_VIOLATION)
+
+    async def send_frame(self, frame: str) -> None:
+        """Queue behind this socket's broadcasts once connected, else send now."""
+        if (
+            self.room_id
+            and self.user_id
+            and room_manager.is_user_in_room(self.room_id, self.user_id)
+        ):
+            room_manager.send_frame(self.room_id, self.user_id, frame)
+        else:
+            await self.websocket.send_text(frame)
+
+    async def send_error(self, error: str) -> None:
+        await self.send_frame(error_frame(error))
 
     async def handle_add_bot(self, message: WebSocketMessage):
         slot_index: int | None = None
@@ -172,27 +362,11 @@ class RoomWebSocketHandler:
                 slot_index = None
 
         if slot_index is None or slot_index < 0:
-            await self.websocket.send_json(
-                jsonable_encoder(
-                    WebSocketResponse(
-                        status="error",
-                        action=WSActionType.ERROR,
-                        error=f"invalid slot index {slot_index}",
-                    )
-                )
-            )
+            await self.send_error(f"invalid slot index {slot_index}")
             return
 
         if self.user_id is None or self.room_id is None:
-            await self.websocket.send_json(
-                jsonable_encoder(
-                    WebSocketResponse(
-                        status="error",
-                        action=WSActionType.ERROR,
-                        error="Internal server error: no user_id or room_id",
-                    )
-                )
-            )
+            await self.send_error("Internal server error: no user_id or room_id")
             return
 
         host_id: UUID = self.user_id
@@ -205,15 +379,7 @@ class RoomWebSocketHandler:
                 slot_index=slot_index,
             )
         except MCRDomainError as e:
-            await self.websocket.send_json(
-                jsonable_encoder(
-                    WebSocketResponse(
-                        status="error",
-                        action=WSActionType.ERROR,
-                        error=str(e),
-                    )
-                )
-            )
+            await self.send_error(str(e))
             return
 
         ru_db = await self.room_service.room_user_repository.filter_one_with_options(
@@ -223,15 +389,7 @@ class RoomWebSocketHandler:
         )
 
         if ru_db is None:
-            await self.websocket.send_json(
-                jsonable_encoder(
-                    WebSocketResponse(
-                        status="error",
-                        action=WSActionType.ERROR,
-                        error=f"No room user found in slot {slot_index}",
-                    )
-                )
-            )
+            await self.send_error(f"No room user found in slot {slot_index}")
             return
 
         join_data = UserJoinedData(
@@ -246,61 +404,43 @@ class RoomWebSocketHandler:
         )
 
         await room_manager.broadcast(
-            jsonable_encoder(
-                WebSocketResponse(
-                    status="success",
-                    action=WSActionType.USER_JOINED,
-                    data=join_data.model_dump(),
-                )
+            WebSocketResponse(
+                status="success",
+                action=WSActionType.USER_JOINED,
+                data=join_data.model_dump(),
             ),
             room_id,
         )
 
     async def handle_ping(self, _: WebSocketMessage):
         if self.room_id and self.user_id:
-            await room_manager.send_personal_message(
-                jsonable_encoder(
-                    WebSocketResponse(
-                        status="success",
-                        action=WSActionType.PONG,
-                        data={"message": "pong"},
-                    )
-                ),
-                self.room_id,
-                self.user_id,
+            room_manager.send_frame(
+                self.room_id, self.user_id, PONG_FRAME, WSActionType.PONG
             )
 
+    async def handle_pong(self, _: WebSocketMessage):
+        # Reply to the server heartbeat; receiving it already refreshed last_seen.
+        pass
+
     async def handle_ready(self, message: WebSocketMessage):
         if self.user is None:
-            await self.websocket.send_json(
-                jsonable_encoder(
-                    WebSocketResponse(
-                        status="error",
-                        action=WSActionType.ERROR,
-                        error="User data is missing.",
-                    )
-                )
-            )
+            await self.send_error("User data is missing.")
             return
 
         if self.room_user and self.room_id and self.user_id:
             is_ready = message.data.get("is_ready", False) if message.data else False
 
-            updated_room_user = await self.room_service.update_user_ready_status(
+            seat = await self.room_service.update_user_ready_status(
                 self.user_id, self.room_id, is_ready
             )
 
-            ready_data = UserReadyData(
-                user_uid=self.user.uid, is_ready=updated_room_user.is_ready
-            )
+            ready_data = UserReadyData(user_uid=self.user.uid, is_ready=seat.is_ready)
 
             await room_manager.broadcast(
-                jsonable_encoder(
-                    WebSocketResponse(
-                        status="success",
-                        action=WSActionType.USER_READY_CHANGED,
-                        data=ready_data.model_dump(),
-                    )
+                WebSocketResponse(
+                    status="success",
+                    action=WSActionType.USER_READY_CHANGED,
+                    data=ready_data.model_dump(),
                 ),
                 self.room_id,
             )
@@ -328,7 +468,7 @@ class RoomWebSocketHandler:
                 status="success",
                 action=WSActionType.USER_LEFT,
                 data=left_data.model_dump(),
-            ).model_dump(),
+            ),
             self.room_id,
         )
 
@@ -338,7 +478,7 @@ class RoomWebSocketHandler:
                 status="success",
                 action=WSActionType.USER_LIST,
                 data=user_list_data.model_dump(),
-            ).model_dump(),
+            ),
             self.room_id,
         )
 
@@ -351,25 +491,68 @@ class RoomWebSocketHandler:
         await self.websocket.close(code=status.WS_1000_NORMAL_CLOSURE)
 
     async def handle_disconnection(self):
+        """Start the grace period for a lobby seat, or leave right away.
+
+        Within a game, or with the grace period off, the leave path runs
+        now; otherwise ``expire_grace`` runs it once the timer fires without
+        the user coming back. A client kicked for flooding leaves at once.
+        """
         if not (self.room_id and self.user_id):
             return
+        if self.kicked:
+            async with self.session():
+                await self._handle_disconnection(remove=True)
+            return
+        if room_manager.grace_period > 0 and not (
+            self.room_playing or room_manager.has_started(self.room_id)
+        ):
+            room_manager.start_grace(
+                self.room_id, self.user_id, self.websocket, self.expire_grace
+            )
+            return
+        async with self.session():
+            await self._handle_disconnection()
+
+    async def expire_grace(self) -> None:
+        """The user did not come back in time: free the seat for good."""
+        async with self.session():
+            await self._handle_disconnection(release=False, remove=True)
+
+    async def _handle_disconnection(
+        self, *, release: bool = True, remove: bool = False
+    ):
+        """Leave the room and tell the others.
+
+        ``remove`` deletes the seat (and hands over the host) rather than
+        leaving it to the cleanup sweep; ``release`` drops the socket.
+        """
+        room_id, user_id, user = self.room_id, self.user_id, self.user
+        if room_id is None or user_id is None or user is None:
+            return
+        if await presence_registry.is_live_elsewhere(
+            self.room_service.session, room_id, user_id
+        ):
+            # Already reconnected through another worker: only drop this socket.
+            if release:
+                await room_manager.disconnect(room_id=room_id, user_id=user_id)
+            return
         try:
             new_list = await self.room_service.leave_room(
-                user_id=self.user_id,
-                room_id=self.room_id,
-                disconnect_only=True,
+                user_id=user_id,
+                room_id=room_id,
+                disconnect_only=not remove,
             )
         except MCRDomainError:
             new_list = []
         if new_list:
-            left_data = UserLeftData(user_uid=self.user.uid)
+            left_data = UserLeftData(user_uid=user.uid)
             await room_manager.broadcast(
                 WebSocketResponse(
                     status="success",
                     action=WSActionType.USER_LEFT,
                     data=left_data.model_dump(),
-                ).model_dump(),
-                self.room_id,
+                ),
+                room_id,
             )
             user_list_data = UserListData(users=[u.model_dump() for u in new_list])
             await room_manager.broadcast(
@@ -377,15 +560,16 @@ class RoomWebSocketHandler:
                     status="success",
                     action=WSActionType.USER_LIST,
                     data=user_list_data.model_dump(),
-                ).model_dump(),
-                self.room_id,
+                ),
+                room_id,
+            )
+        if release:
+            await room_manager.disconnect(
+                room_id=room_id,
+                user_id=user_id,
+                session=self.room_service.session,
+                room_repository=self.room_service.room_repository,
             )
-        await room_manager.disconnect(
-            room_id=self.room_id,
-            user_id=self.user_id,
-            session=self.room_service.session,
-            room_repository=self.room_service.room_repository,
-        )
 
     async def handle_error(self, e: Exception):
         if self.room_id and self.user_id:
@@ -395,12 +579,29 @@ class RoomWebSocketHandler:
                 code=status.WS_1011_INTERNAL_ERROR, reason=str(e)
             )
 
+    HANDLERS: ClassVar[
+        dict[str, Callable[["RoomWebSocketHandler", WebSocketMessage], Awaitable[None]]]
+    ] = {
+        WSActionType.PING: handle_ping,
+        WSActionType.PONG: handle_pong,
+        WSActionType.READY: handle_ready,
+        WSActionType.LEAVE: handle_leave,
+        WSActionType.ADD_BOT: handle_add_bot,
+    }
+    # Only these actions read message.data, so only they pay for validation.
+    VALIDATED_ACTIONS: ClassVar[frozenset[str]] = frozenset(
+        {WSActionType.READY, WSActionType.ADD_BOT}
+    )
+    # Actions that touch the database and so get a session for their duration.
+    DB_ACTIONS: ClassVar[frozenset[str]] = frozenset(
+        {WSActionType.READY, WSActionType.LEAVE, WSActionType.ADD_BOT}
+    )
+
 
 @router.websocket("/{room_number}")
 async def room_websocket(
     websocket: WebSocket,
     room_number: int,
-    room_service: RoomService = Depends(get_room_service),
 ):
-    handler = RoomWebSocketHandler(websocket, room_number, room_service)
+    handler = RoomWebSocketHandler(websocket, room_number)
     await handler.handle_connection()
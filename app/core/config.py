@@ -1,5 +1,6 @@
 from enum import Enum
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -41,6 +42,48 @@ class Settings(BaseSettings):
     GAME_SERVER_URL: str = "http://127.0.0.1:8001"
     AGENT_SERVER_URL: str = "http://mcrbot.duckdns.org:8080/"
 
+    ROOM_CLEANUP_INTERVAL_SECONDS: float = 60.0
+    ROOM_CLEANUP_JITTER_SECONDS: float = 5.0
+
+    LOBBY_DELTA_WINDOW_SECONDS: float = 0.1
+    QUICK_MATCH_INDEX_MAX_AGE_SECONDS: float = 2.0
+
+    WS_SEND_TIMEOUT_SECONDS: float = 2.0
+    WS_OUTBOUND_QUEUE_SIZE: int = 64
+    WS_OUTBOUND_OVERFLOW_POLICY: Literal["drop_oldest", "coalesce", "disconnect"] = (
+        "coalesce"
+    )
+
+    ROOM_PUBSUB_BACKEND: Literal["memory", "postgres"] = "memory"
+    ROOM_PUBSUB_CHANNEL: str = "mcr_room_events"
+
+    WS_HEARTBEAT_INTERVAL_SECONDS: float = 15.0
+    WS_HEARTBEAT_DEADLINE_SECONDS: float = 45.0
+    WS_TIMER_TICK_SECONDS: float = 0.5
+
+    ROOM_COALESCE_WINDOW_SECONDS: float = 0.05
+    ROOM_REPLAY_BUFFER_SIZE: int = 64
+    ROOM_REPLAY_TTL_SECONDS: float = 120.0
+    # Seconds a lost lobby socket keeps its seat; 0 leaves immediately.
+    ROOM_DISCONNECT_GRACE_SECONDS: float = 20.0
+
+    # action -> (tokens per second, burst); "*" covers every other action.
+    WS_ACTION_RATE_LIMITS: dict[str, tuple[float, int]] = {
+        "ready": (2.0, 5),
+        "add_bot": (0.5, 3),
+        "leave": (1.0, 2),
+        "ping": (1.0, 5),
+        "pong": (1.0, 5),
+        "*": (2.0, 5),
+    }
+    WS_RATE_LIMIT_STRIKES: int = 20
+    WS_RATE_LIMIT_STRIKE_WINDOW_SECONDS: float = 60.0
+
+    PRESENCE_HEARTBEAT_SECONDS: float = 10.0
+    PRESENCE_TTL_SECONDS: float = 30.0
+
+    ROOM_STATE_FLUSH_SECONDS: float = 1.0
+
     @property
     def sync_database_uri(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
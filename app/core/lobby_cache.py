@@ -0,0 +1,220 @@
+import asyncio
+import hashlib
+import time
+from bisect import bisect_right
+from collections.abc import Iterator
+from functools import cached_property
+from uuid import UUID, uuid4
+
+from pydantic import TypeAdapter
+
+from app.schemas.room import AvailableRoomResponse
+
+_rooms_adapter = TypeAdapter(list[AvailableRoomResponse])
+
+
+def encode_rooms(rooms: list[AvailableRoomResponse]) -> bytes:
+    return _rooms_adapter.dump_json(rooms)
+
+
+class _RoomIndex:
+    def __init__(self, rooms: list[AvailableRoomResponse]) -> None:
+        self.rooms = rooms
+        self.room_numbers = [room.room_number for room in rooms]
+
+    def page(
+        self, cursor: int | None, limit: int | None
+    ) -> tuple[list[AvailableRoomResponse], int | None]:
+        start = 0 if cursor is None else bisect_right(self.room_numbers, cursor)
+        if limit is None:
+            return self.rooms[start:], None
+
+        end = start + limit
+        page = self.rooms[start:end]
+        next_cursor = page[-1].room_number if end < len(self.rooms) else None
+        return page, next_cursor
+
+
+class OpenRoom:
+    __slots__ = ("free_slots", "name", "room_id", "room_number")
+
+    def __init__(
+        self, room_number: int, name: str, room_id: UUID, free_slots: int
+    ) -> None:
+        self.room_number = room_number
+        self.name = name
+        self.room_id = room_id
+        self.free_slots = free_slots
+
+
+class OpenRoomIndex:
+    """Open rooms bucketed by free slot count.
+
+    There are at most ``max_users`` buckets, so finding the fullest room that
+    still has a seat does not depend on how many rooms are open. Quick match
+    keeps the index up to date with its own placements instead of rebuilding
+    it from the lobby after every join.
+    """
+
+    def __init__(
+        self, rooms: list[AvailableRoomResponse], room_ids: dict[int, UUID]
+    ) -> None:
+        self.built = time.monotonic()
+        self._rooms: dict[int, OpenRoom] = {}
+        self._buckets: dict[int, dict[int, OpenRoom]] = {}
+        for room in rooms:
+            room_id = room_ids.get(room.room_number)
+            if room_id is not None:
+                self.add(
+                    OpenRoom(
+                        room.room_number,
+                        room.name,
+                        room_id,
+                        room.max_users - room.current_users,
+                    )
+                )
+
+    def add(self, room: OpenRoom) -> None:
+        if room.free_slots > 0:
+            self._rooms[room.room_number] = room
+            self._buckets.setdefault(room.free_slots, {})[room.room_number] = room
+
+    def remove(self, room_number: int) -> OpenRoom | None:
+        room = self._rooms.pop(room_number, None)
+        if room is not None:
+            bucket = self._buckets[room.free_slots]
+            del bucket[room_number]
+            if not bucket:
+                del self._buckets[room.free_slots]
+        return room
+
+    def take_seat(self, room_number: int) -> None:
+        room = self.remove(room_number)
+        if room is not None:
+            room.free_slots -= 1
+            self.add(room)
+
+    def candidates(self) -> Iterator[OpenRoom]:
+        for free_slots in sorted(self._buckets):
+            yield from list(self._buckets.get(free_slots, {}).values())
+
+
+class LobbySnapshot:
+    """Immutable view of the lobby at one cache version.
+
+    ``rooms`` is ordered by room_number, which lets pages be keyed on the
+    last room_number a client has seen and located by bisection.
+    """
+
+    def __init__(
+        self,
+        epoch: str,
+        version: int,
+        rooms: list[AvailableRoomResponse],
+        room_ids: dict[int, UUID] | None = None,
+    ) -> None:
+        self.epoch = epoch
+        self.version = version
+        self.rooms = rooms
+        self.room_ids = room_ids or {}
+
+    @property
+    def etag(self) -> str:
+        return self.etag_for()
+
+    def etag_for(self, **query: object) -> str:
+        """ETag of one view of this snapshot.
+
+        ``query`` holds the non-default list parameters; each page and
+        filter gets its own tag, so a client switching views never gets a
+        304 for a body it does not have.
+        """
+        if not query:
+            return f'"{self.epoch}-{self.version}"'
+        params = "&".join(f"{key}={value}" for key, value in sorted(query.items()))
+        digest = hashlib.blake2b(params.encode(), digest_size=8).hexdigest()
+        return f'"{self.epoch}-{self.version}-{digest}"'
+
+    @cached_property
+    def payload(self) -> bytes:
+        return encode_rooms(self.rooms)
+
+    @cached_property
+    def _all_rooms(self) -> _RoomIndex:
+        return _RoomIndex(self.rooms)
+
+    @cached_property
+    def _open_rooms(self) -> _RoomIndex:
+        return _RoomIndex([r for r in self.rooms if r.current_users < r.max_users])
+
+    @cached_property
+    def _full_rooms(self) -> _RoomIndex:
+        return _RoomIndex([r for r in self.rooms if r.current_users >= r.max_users])
+
+    @cached_property
+    def open_rooms(self) -> OpenRoomIndex:
+        return OpenRoomIndex(self.rooms, self.room_ids)
+
+    def page(
+        self,
+        *,
+        cursor: int | None = None,
+        limit: int | None = None,
+        has_free_slot: bool | None = None,
+        exclude_full: bool = False,
+    ) -> tuple[list[AvailableRoomResponse], int | None]:
+        if has_free_slot is False:
+            if exclude_full:
+                return [], None
+            index = self._full_rooms
+        elif has_free_slot or exclude_full:
+            index = self._open_rooms
+        else:
+            index = self._all_rooms
+        return index.page(cursor, limit)
+
+
+class LobbyCache:
+    """Process-level snapshot of the lobby room list.
+
+    The version is bumped on every invalidation, and a snapshot built from an
+    older version is never stored, so a read racing a mutation cannot pin stale
+    data in the cache.
+
+    ``open_rooms`` is quick match's index and survives invalidation; it is
+    only rebuilt from a snapshot once it is older than the caller allows.
+    """
+
+    def __init__(self) -> None:
+        self.epoch = uuid4().hex[:8]
+        self.version = 0
+        self.lock = asyncio.Lock()
+        self.open_rooms: OpenRoomIndex | None = None
+        self._snapshot: LobbySnapshot | None = None
+
+    def get(self) -> LobbySnapshot | None:
+        return self._snapshot
+
+    def open_room_index(self, max_age: float) -> OpenRoomIndex | None:
+        index = self.open_rooms
+        if index is None or time.monotonic() - index.built > max_age:
+            return None
+        return index
+
+    def store(
+        self,
+        version: int,
+        rooms: list[AvailableRoomResponse],
+        room_ids: dict[int, UUID] | None = None,
+    ) -> LobbySnapshot:
+        snapshot = LobbySnapshot(self.epoch, version, rooms, room_ids)
+        if version == self.version:
+            self._snapshot = snapshot
+        return snapshot
+
+    def invalidate(self) -> None:
+        self.version += 1
+        self._snapshot = None
+
+
+lobby_cache = LobbyCache()
@@ -0,0 +1,159 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+from fastapi import WebSocket
+
+from app.core.config import settings
+from app.core.lobby_cache import LobbySnapshot
+from app.schemas.room import AvailableRoomResponse
+from app.schemas.ws import WebSocketResponse, WSActionType
+
+logger = logging.getLogger(__name__)
+
+SnapshotLoader = Callable[[], Awaitable[LobbySnapshot]]
+
+
+def diff_rooms(
+    before: dict[int, AvailableRoomResponse],
+    after: dict[int, AvailableRoomResponse],
+) -> list[tuple[WSActionType, dict]]:
+    deltas: list[tuple[WSActionType, dict]] = []
+    for room_number, room in after.items():
+        previous = before.get(room_number)
+        if previous is None:
+            deltas.append((WSActionType.ROOM_CREATED, {"room": room.model_dump()}))
+        elif previous != room:
+            deltas.append((WSActionType.ROOM_UPDATED, {"room": room.model_dump()}))
+    deltas.extend(
+        (WSActionType.ROOM_REMOVED, {"room_number": room_number})
+        for room_number in before
+        if room_number not in after
+    )
+    return deltas
+
+
+class LobbyConnectionManager:
+    """Pushes lobby changes to subscribers instead of having them poll.
+
+    Mutations only call ``notify``; the first call in a window schedules a
+    flush, later ones ride along. The flush rebuilds the lobby snapshot once
+    and sends the per-room difference against what subscribers last received,
+    so a burst of ready toggles in one room becomes a single ``room_updated``.
+    """
+
+    def __init__(self, window: float = settings.LOBBY_DELTA_WINDOW_SECONDS) -> None:
+        self.window = window
+        self.snapshot_loader: SnapshotLoader | None = None
+        self.connections: set[WebSocket] = set()
+        # Subscribers still being sent their snapshot, with deltas held back.
+        self._joining: dict[WebSocket, list[str]] = {}
+        self._sent: dict[int, AvailableRoomResponse] = {}
+        self._version = 0
+        self._flush_task: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+
+    async def _load_snapshot(self) -> LobbySnapshot:
+        if self.snapshot_loader is None:
+            raise RuntimeError("Lobby snapshot loader is not configured")  # noqa: TRY003
+        return await self.snapshot_loader()
+
+    async def connect(self, websocket: WebSocket) -> None:
+        """Send the lobby as subscribers last received it, then subscribe.
+
+        The snapshot is taken and the socket subscribed under the flush lock,
+        so no delta can fall between them; the send happens after the lock is
+        released, so a slow client does not hold up flushes for everyone.
+        Deltas broadcast meanwhile are queued and sent right after the
+        snapshot. A newer lobby than the one last sent is left to the next
+        flush, which reaches this socket too.
+        """
+        await websocket.accept()
+        async with self._flush_lock:
+            snapshot = await self._load_snapshot()
+            if not self.connections:
+                self._sent = {room.room_number: room for room in snapshot.rooms}
+                self._version = snapshot.version
+
+            frame = WebSocketResponse(
+                status="success",
+                action=WSActionType.LOBBY_SNAPSHOT,
+                data={
+                    "version": self._version,
+                    "rooms": [room.model_dump() for room in self._sent.values()],
+                },
+            ).model_dump_json()
+            self.connections.add(websocket)
+            self._joining[websocket] = []
+        if snapshot.version > self._version:
+            self.notify()
+
+        try:
+            await websocket.send_text(frame)
+            while queued := self._joining.get(websocket):
+                self._joining[websocket] = []
+                for message in queued:
+                    await websocket.send_text(message)
+        except Exception:
+            self.disconnect(websocket)
+            raise
+        finally:
+            self._joining.pop(websocket, None)
+
+    def disconnect(self, websocket: WebSocket) -> None:
+        self.connections.discard(websocket)
+        self._joining.pop(websocket, None)
+
+    def notify(self) -> None:
+        if not self.connections or self.snapshot_loader is None:
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.window)
+        self._flush_task = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Lobby delta flush failed")
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self.connections:
+                return
+            snapshot = await self._load_snapshot()
+            if snapshot.version < self._version:
+                return
+
+            after = {room.room_number: room for room in snapshot.rooms}
+            deltas = diff_rooms(self._sent, after)
+            self._sent = after
+            self._version = snapshot.version
+
+            for action, data in deltas:
+                data["version"] = snapshot.version
+                await self.broadcast(
+                    WebSocketResponse(
+                        status="success", action=action, data=data
+                    ).model_dump_json()
+                )
+
+    async def broadcast(self, message: str) -> None:
+        connections = []
+        for websocket in self.connections:
+            queued = self._joining.get(websocket)
+            if queued is not None:
+                queued.append(message)
+            else:
+                connections.append(websocket)
+        results = await asyncio.gather(
+            *(websocket.send_text(message) for websocket in connections),
+            return_exceptions=True,
+        )
+        for websocket, result in zip(connections, results, strict=True):
+            if isinstance(result, Exception):
+                self.connections.discard(websocket)
+
+
+lobby_manager = LobbyConnectionManager()
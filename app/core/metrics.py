@@ -0,0 +1,47 @@
+class DurationStats:
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.last = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        self.max = max(self.max, seconds)
+
+    @property
+    def avg(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "avg_seconds": self.avg,
+            "last_seconds": self.last,
+            "max_seconds": self.max,
+        }
+
+
+class QuickMatchStats:
+    def __init__(self) -> None:
+        self.snapshot_load = DurationStats()
+        self.placement = DurationStats()
+        self.joined = 0
+        self.created = 0
+        self.retries = 0
+        self.index_reused = 0
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "snapshot_load": self.snapshot_load.as_dict(),
+            "placement": self.placement.as_dict(),
+            "joined": self.joined,
+            "created": self.created,
+            "retries": self.retries,
+            "index_reused": self.index_reused,
+        }
+
+
+quick_match_stats = QuickMatchStats()
@@ -0,0 +1,164 @@
+import asyncio
+from collections import deque
+from collections.abc import Callable
+from enum import Enum
+
+from fastapi import WebSocket
+
+from app.schemas.ws import WSActionType
+
+
+class OverflowPolicy(str, Enum):
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+    DISCONNECT = "disconnect"
+
+
+# Frames a client cannot recover from losing; never dropped on overflow.
+UNDROPPABLE_ACTIONS = frozenset(
+    {
+        WSActionType.GAME_STARTED,
+        WSActionType.USER_LIST,
+        WSActionType.ROOM_STATE,
+        WSActionType.ROOM_SNAPSHOT,
+    }
+)
+# Frames that carry full state, so a newer one supersedes any queued older one.
+COALESCABLE_ACTIONS = frozenset({WSActionType.USER_LIST})
+
+
+class QueueStats:
+    def __init__(self) -> None:
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_depth = 0
+
+
+class OutboundQueue:
+    """Bounded outbound buffer drained by one writer task per connection.
+
+    Producers never await the socket: ``put`` only appends and returns. When
+    the buffer is full the overflow policy decides whether to drop the oldest
+    droppable frame, replace a queued user_list, or give up on the client.
+    Returning False from ``put`` means the connection must be dropped; the
+    writer reports send errors and timeouts through ``on_failure``.
+
+    Sends are not wrapped in a timeout each. A watchdog armed by the first
+    send checks the send in flight every ``send_timeout`` and re-arms only
+    while frames keep flowing, so a busy queue costs one timer per period
+    rather than one per frame.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        *,
+        maxsize: int,
+        policy: OverflowPolicy,
+        send_timeout: float,
+        on_failure: Callable[["OutboundQueue", BaseException], None],
+    ) -> None:
+        self.websocket = websocket
+        self.maxsize = maxsize
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.stats = QueueStats()
+        self.closed = False
+        self._on_failure = on_failure
+        self._frames: deque[tuple[str | None, str | bytes]] = deque()
+        self._ready = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._loop = asyncio.get_running_loop()
+        self._sending_since: float | None = None
+        self._watchdog: asyncio.TimerHandle | None = None
+        self._writer = asyncio.create_task(self._run())
+
+    @property
+    def depth(self) -> int:
+        return len(self._frames)
+
+    def put(self, frame: str | bytes, action: str | None = None) -> bool:
+        if self.closed:
+            return False
+
+        if len(self._frames) >= self.maxsize and not self._make_room(action):
+            return False
+
+        self._frames.append((action, frame))
+        self.stats.max_depth = max(self.stats.max_depth, len(self._frames))
+        self._idle.clear()
+        self._ready.set()
+        return True
+
+    def _make_room(self, action: str | None) -> bool:
+        if self.policy == OverflowPolicy.DISCONNECT:
+            return False
+
+        if self.policy == OverflowPolicy.COALESCE and action in COALESCABLE_ACTIONS:
+            for index, (queued_action, _) in enumerate(self._frames):
+                if queued_action == action:
+                    del self._frames[index]
+                    self.stats.coalesced += 1
+                    return True
+
+        for index, (queued_action, _) in enumerate(self._frames):
+            if queued_action not in UNDROPPABLE_ACTIONS:
+                del self._frames[index]
+                self.stats.dropped += 1
+                return True
+        return False
+
+    async def _run(self) -> None:
+        while True:
+            if not self._frames:
+                self._ready.clear()
+                self._idle.set()
+                await self._ready.wait()
+                continue
+
+            _, frame = self._frames.popleft()
+            self._sending_since = self._loop.time()
+            if self._watchdog is None:
+                self._watchdog = self._loop.call_at(
+                    self._sending_since + self.send_timeout, self._check_send
+                )
+            try:
+                if isinstance(frame, bytes):
+                    await self.websocket.send_bytes(frame)
+                else:
+                    await self.websocket.send_text(frame)
+            except Exception as e:
+                self._shutdown()
+                self._on_failure(self, e)
+                return
+            self._sending_since = None
+            self.stats.sent += 1
+
+    def _check_send(self) -> None:
+        self._watchdog = None
+        since = self._sending_since
+        if since is None or self.closed:
+            return
+        deadline = since + self.send_timeout
+        if self._loop.time() < deadline:
+            self._watchdog = self._loop.call_at(deadline, self._check_send)
+            return
+        self.close()
+        self._on_failure(self, TimeoutError())
+
+    async def drain(self) -> None:
+        await self._idle.wait()
+
+    def _shutdown(self) -> None:
+        self.closed = True
+        self._frames.clear()
+        self._idle.set()
+        if self._watchdog is not None:
+            self._watchdog.cancel()
+            self._watchdog = None
+
+    def close(self) -> None:
+        self._shutdown()
+        self._writer.cancel()
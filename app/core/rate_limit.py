@@ -0,0 +1,61 @@
+import time
+
+from app.core.config import settings
+
+# Budget for actions with no entry of their own, including unknown ones.
+DEFAULT_ACTION = "*"
+
+
+class TokenBucket:
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self, now: float) -> bool:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+
+class ActionRateLimiter:
+    """Per-connection token buckets, one per action type.
+
+    All buckets are built when the socket connects; ``allow`` only updates
+    them in place. Every rejection spends a strike from a slower bucket, and
+    ``exhausted`` turns true once a client keeps hammering after being told
+    to back off.
+    """
+
+    __slots__ = ("buckets", "default", "rejected", "strikes")
+
+    def __init__(
+        self,
+        limits: dict[str, tuple[float, int]] = settings.WS_ACTION_RATE_LIMITS,
+        strikes: int = settings.WS_RATE_LIMIT_STRIKES,
+        strike_window: float = settings.WS_RATE_LIMIT_STRIKE_WINDOW_SECONDS,
+    ) -> None:
+        self.buckets = {
+            action: TokenBucket(rate, burst) for action, (rate, burst) in limits.items()
+        }
+        self.default = self.buckets.get(DEFAULT_ACTION) or TokenBucket(10.0, 20)
+        self.strikes = TokenBucket(strikes / strike_window, strikes)
+        self.rejected = 0
+
+    def allow(self, action: str) -> bool:
+        now = time.monotonic()
+        if self.buckets.get(action, self.default).take(now):
+            return True
+        self.rejected += 1
+        self.strikes.take(now)
+        return False
+
+    @property
+    def exhausted(self) -> bool:
+        return self.strikes.tokens < 1.0
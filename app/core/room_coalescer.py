@@ -0,0 +1,154 @@
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import Any
+from uuid import UUID
+
+from pydantic_core import from_json, to_json
+
+from app.core.config import settings
+from app.schemas.ws import WSActionType
+
+logger = logging.getLogger(__name__)
+
+# Room events that v2 clients receive merged into one ``room_state`` frame.
+COALESCED_ACTIONS = frozenset(
+    {
+        WSActionType.USER_JOINED,
+        WSActionType.USER_LEFT,
+        WSActionType.USER_READY_CHANGED,
+        WSActionType.USER_LIST,
+    }
+)
+
+
+class RoomDelta:
+    """Room changes accumulated during one window.
+
+    Clients apply ``users`` (a full list, when present) first, then ``left``,
+    ``joined`` and ``ready``. A full list resets everything merged before it,
+    and ready toggles from one user keep only the last value. ``seq`` is
+    that of the last event folded in, when the events were sequenced.
+    """
+
+    __slots__ = ("events", "joined", "left", "ready", "seq", "users")
+
+    def __init__(self) -> None:
+        self.users: list[Any] | None = None
+        self.left: dict[str, None] = {}
+        self.joined: dict[str, dict[str, Any]] = {}
+        self.ready: dict[str, bool] = {}
+        self.seq: int | None = None
+        self.events = 0
+
+    def apply_frame(self, action: str, frame: str) -> bool:
+        """Fold in an encoded event frame; False if it cannot be decoded."""
+        try:
+            raw = from_json(frame)
+            data = raw.get("data") or {}
+        except (ValueError, AttributeError):
+            return False
+        if isinstance(raw.get("seq"), int):
+            self.seq = raw["seq"]
+        self.apply(action, data)
+        return True
+
+    def apply(self, action: str, data: dict[str, Any]) -> None:
+        self.events += 1
+        if action == WSActionType.USER_LIST:
+            self.users = data.get("users", [])
+            self.left.clear()
+            self.joined.clear()
+            self.ready.clear()
+            return
+
+        user_uid = data.get("user_uid")
+        if not isinstance(user_uid, str):
+            return
+        if action == WSActionType.USER_JOINED:
+            self.left.pop(user_uid, None)
+            self.ready.pop(user_uid, None)
+            self.joined[user_uid] = data
+        elif action == WSActionType.USER_LEFT:
+            self.joined.pop(user_uid, None)
+            self.ready.pop(user_uid, None)
+            self.left[user_uid] = None
+        elif action == WSActionType.USER_READY_CHANGED:
+            is_ready = bool(data.get("is_ready"))
+            if user_uid in self.joined:
+                self.joined[user_uid] = {**self.joined[user_uid], "is_ready": is_ready}
+            else:
+                self.ready[user_uid] = is_ready
+
+    def encode(self) -> str:
+        data: dict[str, Any] = {}
+        if self.users is not None:
+            data["users"] = self.users
+        if self.left:
+            data["left"] = list(self.left)
+        if self.joined:
+            data["joined"] = list(self.joined.values())
+        if self.ready:
+            data["ready"] = self.ready
+        frame: dict[str, Any] = {
+            "status": "success",
+            "action": WSActionType.ROOM_STATE,
+            "data": data,
+        }
+        if self.seq is not None:
+            frame["seq"] = self.seq
+        return to_json(frame).decode()
+
+
+class RoomUpdateCoalescer:
+    """Merges a room's membership and ready events into one frame per window.
+
+    The first event for a room starts its window; later ones are folded into
+    the same ``RoomDelta``, which ``send`` delivers once when the window
+    closes. ``flush`` delivers early, so a frame that must not overtake the
+    room's pending changes (``game_started``) can go out right after them.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[UUID, str], None],
+        window: float = settings.ROOM_COALESCE_WINDOW_SECONDS,
+    ) -> None:
+        self.send = send
+        self.window = window
+        self.pending: dict[UUID, RoomDelta] = {}
+        self._timers: dict[UUID, asyncio.TimerHandle] = {}
+        self.events = 0
+        self.frames = 0
+
+    def add(self, room_id: UUID, action: str, frame: str) -> None:
+        delta = self.pending.get(room_id)
+        if delta is None:
+            delta = self.pending[room_id] = RoomDelta()
+            self._timers[room_id] = asyncio.get_running_loop().call_later(
+                self.window, self.flush, room_id
+            )
+        if not delta.apply_frame(action, frame):
+            logger.warning("Dropping undecodable %s frame for room %s", action, room_id)
+            return
+        self.events += 1
+
+    def flush(self, room_id: UUID) -> None:
+        timer = self._timers.pop(room_id, None)
+        if timer is not None:
+            timer.cancel()
+        delta = self.pending.pop(room_id, None)
+        if delta is None:
+            return
+        self.frames += 1
+        try:
+            self.send(room_id, delta.encode())
+        except Exception:
+            logger.exception("Room state delivery failed")
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "events": self.events,
+            "frames": self.frames,
+            "pending_rooms": len(self.pending),
+        }
@@ -1,32 +1,366 @@
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Coroutine
+from contextlib import suppress
+from typing import Any
 from uuid import UUID
 
 from fastapi import WebSocket, status
-from fastapi.encoders import jsonable_encoder
-from fastapi.websockets import WebSocketState
+from pydantic import BaseModel
+from pydantic_core import to_json
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.error import DomainErrorCode, MCRDomainError
+from app.core.config import settings
+from app.core.error import MCRDomainError
+from app.core.lobby_cache import lobby_cache
+from app.core.lobby_connection_manager import lobby_manager
+from app.core.outbound_queue import OutboundQueue, OverflowPolicy
+from app.core.room_coalescer import COALESCED_ACTIONS, RoomDelta, RoomUpdateCoalescer
+from app.core.room_pubsub import (
+    InProcessBackend,
+    RoomEvent,
+    RoomEventBackend,
+    RoomEventHandler,
+    RoomEventKind,
+)
+from app.core.room_replay import ReplayBuffer
 from app.core.security import get_user_id_from_token
+from app.core.timer_wheel import TimerHandle, TimerWheel
+from app.core.ws_codec import msgpack_frame
 from app.models.user import User
 from app.repositories.room_repository import RoomRepository
 from app.repositories.room_user_repository import RoomUserRepository
 from app.repositories.user_repository import UserRepository
-from app.schemas.ws import GameStartedData, WebSocketResponse, WSActionType
+from app.schemas.ws import (
+    DeliveryReport,
+    GameStartedData,
+    RoomProtocol,
+    WebSocketResponse,
+    WSActionType,
+)
+
+logger = logging.getLogger(__name__)
+
+GraceExpiry = Callable[[], Coroutine[Any, Any, None]]
+
+
+def encode_message(message: BaseModel | dict) -> str:
+    if isinstance(message, BaseModel):
+        return message.model_dump_json()
+    return to_json(message).decode()
+
+
+def _action_of(message: BaseModel | dict) -> str | None:
+    if isinstance(message, BaseModel):
+        return getattr(message, "action", None)
+    return message.get("action")
+
+
+HEARTBEAT_FRAME = encode_message({"status": "success", "action": WSActionType.PING})
 
 
 class RoomConnectionManager:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        send_timeout: float = settings.WS_SEND_TIMEOUT_SECONDS,
+        queue_size: int = settings.WS_OUTBOUND_QUEUE_SIZE,
+        overflow_policy: OverflowPolicy | str = settings.WS_OUTBOUND_OVERFLOW_POLICY,
+        backend: RoomEventBackend | None = None,
+    ) -> None:
         self.active_connections: dict[UUID, dict[UUID, WebSocket]] = {}
         self.user_rooms: dict[UUID, UUID] = {}
+        self.outbound: dict[UUID, OutboundQueue] = {}
+        self.send_timeout = send_timeout
+        self.queue_size = queue_size
+        self.overflow_policy = OverflowPolicy(overflow_policy)
+        self.sends_timed_out = 0
+        self.sends_failed = 0
+        self.overflow_disconnects = 0
+        self.backend = backend or InProcessBackend()
+        self.heartbeat_interval = settings.WS_HEARTBEAT_INTERVAL_SECONDS
+        self.heartbeat_deadline = settings.WS_HEARTBEAT_DEADLINE_SECONDS
+        self.wheel = TimerWheel(settings.WS_TIMER_TICK_SECONDS)
+        self.last_seen: dict[UUID, float] = {}
+        self.heartbeats_sent = 0
+        self.reaped = 0
+        self._heartbeats: dict[UUID, TimerHandle] = {}
+        self._reapers: dict[UUID, Callable[[], None]] = {}
+        self._wheel_task: asyncio.Task | None = None
+        self.protocols: dict[UUID, RoomProtocol] = {}
+        self.coalescer = RoomUpdateCoalescer(self._send_room_state)
+        self.replays: dict[UUID, ReplayBuffer] = {}
+        self.replay_ttl = settings.ROOM_REPLAY_TTL_SECONDS
+        self.grace_period = settings.ROOM_DISCONNECT_GRACE_SECONDS
+        self.graces: dict[UUID, tuple[UUID, TimerHandle]] = {}
+        self.graces_started = 0
+        self.graces_cancelled = 0
+        self.graces_expired = 0
+        self.started_rooms: set[UUID] = set()
+        self._expiring: set[asyncio.Task] = set()
+        self._closing: set[asyncio.Task] = set()
+        self._publishing: set[asyncio.Task] = set()
+        self._listeners: dict[RoomEventKind, RoomEventHandler] = {}
+
+    async def start(self, backend: RoomEventBackend | None = None) -> None:
+        if backend is not None:
+            self.backend = backend
+        await self.backend.start(self._deliver)
+        self._wheel_task = asyncio.create_task(self.wheel.run())
+
+    async def stop(self) -> None:
+        if self._wheel_task is not None:
+            self._wheel_task.cancel()
+            self._wheel_task = None
+        await self.backend.stop()
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        room_id: UUID,
+        user_id: UUID,
+        on_dead: Callable[[], None] | None = None,
+        protocol: RoomProtocol | None = None,
+    ) -> None:
+        """Register a socket; ``on_dead`` is called if it misses heartbeats.
 
-    async def connect(self, websocket: WebSocket, room_id: UUID, user_id: UUID) -> None:
-        await websocket.accept()
+        ``protocol`` is the negotiated subprotocol, echoed in the handshake;
+        None means the client offered none and speaks v1.
+        """
+        await websocket.accept(subprotocol=protocol.value if protocol else None)
 
         if room_id not in self.active_connections:
             self.active_connections[room_id] = {}
 
         self.active_connections[room_id][user_id] = websocket
         self.user_rooms[user_id] = room_id
+        self.cancel_grace(room_id, user_id)
+        self._queue(room_id, user_id, websocket)
+        buffer = self._replay_buffer(room_id)
+        if buffer.expiry is not None:
+            buffer.expiry.cancel()
+            buffer.expiry = None
+
+        if protocol is not None and protocol is not RoomProtocol.V1:
+            self.protocols[user_id] = protocol
+        else:
+            self.protocols.pop(user_id, None)
+
+        self.touch(user_id)
+        if on_dead is not None:
+            self._reapers[user_id] = on_dead
+        else:
+            self._reapers.pop(user_id, None)
+        self._schedule_heartbeat(room_id, user_id, websocket)
+
+    def touch(self, user_id: UUID) -> None:
+        self.last_seen[user_id] = time.monotonic()
+
+    def _schedule_heartbeat(
+        self, room_id: UUID, user_id: UUID, websocket: WebSocket
+    ) -> None:
+        previous = self._heartbeats.get(user_id)
+        if previous is not None:
+            previous.cancel()
+        self._heartbeats[user_id] = self.wheel.schedule(
+            self.heartbeat_interval, self._heartbeat, room_id, user_id, websocket
+        )
+
+    def _heartbeat(self, room_id: UUID, user_id: UUID, websocket: WebSocket) -> None:
+        if self.active_connections.get(room_id, {}).get(user_id) is not websocket:
+            return
+
+        silent = time.monotonic() - self.last_seen.get(user_id, 0.0)
+        if silent > self.heartbeat_deadline:
+            self._reap(room_id, user_id, websocket)
+            return
+
+        protocol = self.protocols.get(user_id)
+        if protocol is not None and protocol.server_pings:
+            self.heartbeats_sent += 1
+            if not self._enqueue(room_id, user_id, websocket, HEARTBEAT_FRAME, None):
+                return
+        self._schedule_heartbeat(room_id, user_id, websocket)
+
+    def _reap(self, room_id: UUID, user_id: UUID, websocket: WebSocket) -> None:
+        self.reaped += 1
+        self._heartbeats.pop(user_id, None)
+        reaper = self._reapers.pop(user_id, None)
+        if reaper is not None:
+            reaper()
+        else:
+            self._evict(room_id, user_id, websocket, status.WS_1001_GOING_AWAY)
+
+    def _forget(self, user_id: UUID) -> None:
+        self.last_seen.pop(user_id, None)
+        self.protocols.pop(user_id, None)
+        self._reapers.pop(user_id, None)
+        heartbeat = self._heartbeats.pop(user_id, None)
+        if heartbeat is not None:
+            heartbeat.cancel()
+
+    def _replay_buffer(self, room_id: UUID) -> ReplayBuffer:
+        buffer = self.replays.get(room_id)
+        if buffer is None:
+            buffer = self.replays[room_id] = ReplayBuffer()
+        return buffer
+
+    def _schedule_replay_expiry(self, room_id: UUID) -> None:
+        buffer = self.replays.get(room_id)
+        if buffer is not None and buffer.expiry is None:
+            buffer.expiry = self.wheel.schedule(
+                self.replay_ttl, self._expire_replay, room_id, buffer
+            )
+
+    def _expire_replay(self, room_id: UUID, buffer: ReplayBuffer) -> None:
+        if (
+            self.replays.get(room_id) is buffer
+            and room_id not in self.active_connections
+        ):
+            del self.replays[room_id]
+            self.started_rooms.discard(room_id)
+
+    def position(self, room_id: UUID) -> tuple[str, int]:
+        """The room's current (epoch, seq); broadcasts are numbered from here on.
+
+        Take it *before* reading a snapshot, then ``resume`` after it: events
+        racing the read are replayed rather than lost.
+        """
+        buffer = self._replay_buffer(room_id)
+        if room_id not in self.active_connections:
+            self._schedule_replay_expiry(room_id)
+        return buffer.epoch, buffer.seq
+
+    def can_resume(self, room_id: UUID, epoch: str | None, seq: int | None) -> bool:
+        buffer = self.replays.get(room_id)
+        return buffer is not None and buffer.covers(epoch, seq)
+
+    def resume(
+        self,
+        room_id: UUID,
+        user_id: UUID,
+        seq: int,
+        snapshot: str | None = None,
+        *,
+        announce: bool = True,
+    ) -> bool:
+        """Queue a resume frame, ``snapshot`` if any, then every event after seq.
+
+        Call it right after ``connect`` returns, before anything else awaits,
+        so nothing live is queued ahead of it. With ``announce`` off the
+        resume frame itself is left out, for clients that never asked to
+        resume. Returns False if events after ``seq`` had already left the
+        buffer; the rest are still replayed.
+        """
+        connection = self.active_connections.get(room_id, {}).get(user_id)
+        if connection is None:
+            return False
+        buffer = self._replay_buffer(room_id)
+        complete = buffer.covers(buffer.epoch, seq)
+        if announce:
+            self._enqueue(
+                room_id,
+                user_id,
+                connection,
+                encode_message(
+                    {
+                        "status": "success",
+                        "action": WSActionType.RESUME,
+                        "data": {
+                            "epoch": buffer.epoch,
+                            "seq": buffer.seq,
+                            "resumed": snapshot is None,
+                        },
+                    }
+                ),
+                WSActionType.RESUME,
+            )
+        if snapshot is not None:
+            self._enqueue(
+                room_id, user_id, connection, snapshot, WSActionType.ROOM_SNAPSHOT
+            )
+
+        delta = RoomDelta() if self._coalesces(user_id) else None
+        for _, action, frame in buffer.since(seq):
+            if delta is not None and action in COALESCED_ACTIONS:
+                delta.apply_frame(action, frame)
+                continue
+            if delta is not None and delta.events:
+                self._enqueue(
+                    room_id,
+                    user_id,
+                    connection,
+                    delta.encode(),
+                    WSActionType.ROOM_STATE,
+                )
+                delta = RoomDelta()
+            self._enqueue(room_id, user_id, connection, frame, action)
+        if delta is not None and delta.events:
+            self._enqueue(
+                room_id, user_id, connection, delta.encode(), WSActionType.ROOM_STATE
+            )
+        return complete
+
+    def has_started(self, room_id: UUID) -> bool:
+        """Whether a game_started frame went out to this room on this worker."""
+        return room_id in self.started_rooms
+
+    def start_grace(
+        self,
+        room_id: UUID,
+        user_id: UUID,
+        websocket: WebSocket,
+        on_expire: GraceExpiry,
+    ) -> None:
+        """Drop a lost socket but hold the seat for ``grace_period`` seconds.
+
+        The user keeps counting as present until the timer fires and runs
+        ``on_expire``; ``cancel_grace`` on reconnect stops it. Nothing is
+        done if a newer socket has already replaced ``websocket``.
+        """
+        current = self.active_connections.get(room_id, {}).get(user_id)
+        if current is not None and current is not websocket:
+            return
+        self._remove(room_id, user_id)
+        self.cancel_grace(room_id, user_id)
+        self.graces[user_id] = (
+            room_id,
+            self.wheel.schedule(
+                self.grace_period, self._grace_expired, room_id, user_id, on_expire
+            ),
+        )
+        self.graces_started += 1
+
+    def cancel_grace(self, room_id: UUID, user_id: UUID) -> bool:
+        """Stop the user's grace timer in ``room_id``; False if none was running."""
+        grace = self.graces.get(user_id)
+        if grace is None or grace[0] != room_id:
+            return False
+        del self.graces[user_id]
+        grace[1].cancel()
+        self.graces_cancelled += 1
+        return True
+
+    def _grace_expired(
+        self, room_id: UUID, user_id: UUID, on_expire: GraceExpiry
+    ) -> None:
+        grace = self.graces.get(user_id)
+        if grace is None or grace[0] != room_id:
+            return
+        del self.graces[user_id]
+        self.graces_expired += 1
+        task = asyncio.create_task(on_expire())
+        self._expiring.add(task)
+        task.add_done_callback(self._grace_done)
+
+    def _grace_done(self, task: asyncio.Task) -> None:
+        self._expiring.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Grace expiry failed", exc_info=task.exception())
+
+    def grace_user_ids(self) -> dict[UUID, UUID]:
+        """user id -> room id of every seat held for a lost socket."""
+        return {user_id: room_id for user_id, (room_id, _) in self.graces.items()}
 
     async def disconnect(
         self,
@@ -47,62 +381,339 @@ class RoomConnectionManager:
                 pass
 
         if should_remove:
-            if (
-                room_id in self.active_connections
-                and user_id in self.active_connections[room_id]
-            ):
-                del self.active_connections[room_id][user_id]
+            self._remove(room_id, user_id)
 
-                if not self.active_connections[room_id]:
-                    del self.active_connections[room_id]
+    def _remove(self, room_id: UUID, user_id: UUID) -> None:
+        if (
+            room_id in self.active_connections
+            and user_id in self.active_connections[room_id]
+        ):
+            del self.active_connections[room_id][user_id]
+
+            if not self.active_connections[room_id]:
+                del self.active_connections[room_id]
+                self._schedule_replay_expiry(room_id)
+
+        if user_id in self.user_rooms:
+            del self.user_rooms[user_id]
+
+        if user_id in self.outbound:
+            self.outbound.pop(user_id).close()
+
+        self._forget(user_id)
 
-            if user_id in self.user_rooms:
-                del self.user_rooms[user_id]
+    def _queue(
+        self, room_id: UUID, user_id: UUID, websocket: WebSocket
+    ) -> OutboundQueue:
+        queue = self.outbound.get(user_id)
+        if queue is not None and queue.websocket is websocket:
+            return queue
+        if queue is not None:
+            queue.close()
+
+        queue = OutboundQueue(
+            websocket,
+            maxsize=self.queue_size,
+            policy=self.overflow_policy,
+            send_timeout=self.send_timeout,
+            on_failure=lambda failed, error: self._on_send_failure(
+                room_id, user_id, failed, error
+            ),
+        )
+        self.outbound[user_id] = queue
+        return queue
+
+    def _on_send_failure(
+        self, room_id: UUID, user_id: UUID, queue: OutboundQueue, error: BaseException
+    ) -> None:
+        if isinstance(error, TimeoutError):
+            self.sends_timed_out += 1
+        else:
+            self.sends_failed += 1
+        self._evict(room_id, user_id, queue.websocket, status.WS_1011_INTERNAL_ERROR)
 
     async def send_personal_message(
-        self, message: dict, room_id: UUID, user_id: UUID
+        self, message: BaseModel | dict, room_id: UUID, user_id: UUID
     ) -> None:
         if (
             room_id in self.active_connections
             and user_id in self.active_connections[room_id]
         ):
-            json_message = jsonable_encoder(message)
-            await self.active_connections[room_id][user_id].send_json(json_message)
+            self._enqueue(
+                room_id,
+                user_id,
+                self.active_connections[room_id][user_id],
+                encode_message(message),
+                _action_of(message),
+            )
+            return
 
-    async def broadcast(
-        self, message: dict, room_id: UUID, exclude_user_id: UUID | None = None
-    ) -> None:
-        if room_id in self.active_connections:
-            json_message = jsonable_encoder(message)
-            for user_id, connection in self.active_connections[room_id].items():
-                if exclude_user_id is None or user_id != exclude_user_id:
-                    try:
-                        if connection.client_state == WebSocketState.CONNECTED:
-                            await connection.send_json(json_message)
-                    except Exception:
-                        pass
-
-    async def broadcast_game_started(self, room_id: UUID, ws_url: str) -> None:
-        if room_id not in self.active_connections:
-            raise MCRDomainError(
-                code=DomainErrorCode.ROOM_NOT_FOUND,
-                message="room not exist",
-                details={"room_id": room_id},
+        await self.backend.publish(
+            RoomEvent(
+                kind=RoomEventKind.PERSONAL,
+                room_id=room_id,
+                user_id=user_id,
+                action=_action_of(message),
+                frame=encode_message(message),
             )
+        )
+
+    def send_frame(
+        self, room_id: UUID, user_id: UUID, frame: str, action: str | None = None
+    ) -> bool:
+        """Queue a pre-encoded frame for one local socket."""
+        connection = self.active_connections.get(room_id, {}).get(user_id)
+        if connection is None:
+            return False
+        return self._enqueue(room_id, user_id, connection, frame, action)
+
+    async def broadcast(
+        self,
+        message: BaseModel | dict,
+        room_id: UUID,
+        exclude_user_id: UUID | None = None,
+    ) -> DeliveryReport:
+        return await self._publish(
+            encode_message(message), _action_of(message), room_id, exclude_user_id
+        )
+
+    async def broadcast_game_started(
+        self, room_id: UUID, ws_url: str
+    ) -> DeliveryReport:
         response = WebSocketResponse(
             status="success",
             action=WSActionType.GAME_STARTED,
             data=GameStartedData(game_url=ws_url).model_dump(),
         )
-        json_message = jsonable_encoder(response.model_dump())
-        for connection in self.active_connections[room_id].values():
-            await connection.send_json(json_message)
+        return await self._publish(encode_message(response), response.action, room_id)
+
+    async def _publish(
+        self,
+        frame: str,
+        action: str | None,
+        room_id: UUID,
+        exclude_user_id: UUID | None = None,
+    ) -> DeliveryReport:
+        """Fan out locally, then publish for the other workers.
+
+        The report covers local sockets only; see ``DeliveryReport``.
+        """
+        report = self._fan_out(frame, action, room_id, exclude_user_id)
+        await self.backend.publish(
+            RoomEvent(
+                room_id=room_id,
+                exclude_user_id=exclude_user_id,
+                action=action,
+                frame=frame,
+            )
+        )
+        return report
+
+    def publish_lobby_changed(self) -> None:
+        self.publish_event(RoomEvent(kind=RoomEventKind.LOBBY_CHANGED))
+
+    def publish_event(self, event: RoomEvent) -> None:
+        """Publish to the other workers without waiting for the backend."""
+        task = asyncio.create_task(self.backend.publish(event))
+        self._publishing.add(task)
+        task.add_done_callback(self._publishing.discard)
+
+    def listen(self, kind: RoomEventKind, handler: RoomEventHandler) -> None:
+        """Hand events of ``kind`` from other workers to ``handler``."""
+        self._listeners[kind] = handler
+
+    def _deliver(self, event: RoomEvent) -> None:
+        """Deliver an event published by another worker to local sockets."""
+        listener = self._listeners.get(event.kind)
+        if listener is not None:
+            listener(event)
+            return
+        if event.kind == RoomEventKind.LOBBY_CHANGED:
+            lobby_cache.invalidate()
+            lobby_manager.notify()
+            return
+        if event.room_id is None:
+            return
+
+        if event.kind == RoomEventKind.PERSONAL:
+            if event.user_id is None:
+                return
+            connection = self.active_connections.get(event.room_id, {}).get(
+                event.user_id
+            )
+            if connection is not None:
+                self._enqueue(
+                    event.room_id, event.user_id, connection, event.frame, event.action
+                )
+            return
+
+        self._fan_out(event.frame, event.action, event.room_id, event.exclude_user_id)
+
+    def _fan_out(
+        self,
+        frame: str,
+        action: str | None,
+        room_id: UUID,
+        exclude_user_id: UUID | None = None,
+    ) -> DeliveryReport:
+        """Queue one pre-encoded frame for every socket in the room.
+
+        Nothing here waits on a socket: each connection's writer task sends at
+        its own pace, bounded by send_timeout, so a slow client only delays
+        itself. Connections whose queue overflows under the disconnect policy
+        (or has nothing left to drop) are closed with 1013. Rooms with a
+        replay buffer have the frame numbered and kept for resuming clients.
+
+        v2 sockets get room changes through the coalescer instead; any other
+        frame first flushes the room's pending delta so it cannot overtake it.
+        """
+        buffer = self.replays.get(room_id)
+        if buffer is not None:
+            frame = buffer.append(action, frame)
+        if action == WSActionType.GAME_STARTED:
+            self.started_rooms.add(room_id)
+
+        coalesced = action in COALESCED_ACTIONS
+        if not coalesced and room_id in self.coalescer.pending:
+            self.coalescer.flush(room_id)
+
+        report = DeliveryReport()
+        deferred = False
+        for user_id, connection in list(
+            self.active_connections.get(room_id, {}).items()
+        ):
+            if user_id == exclude_user_id:
+                continue
+            if coalesced and self._coalesces(user_id):
+                deferred = True
+                report.queued.append(user_id)
+            elif self._enqueue(room_id, user_id, connection, frame, action):
+                report.queued.append(user_id)
+            else:
+                report.rejected.append(user_id)
+        if deferred and action is not None:
+            self.coalescer.add(room_id, action, frame)
+        return report
+
+    def _coalesces(self, user_id: UUID) -> bool:
+        protocol = self.protocols.get(user_id)
+        return protocol is not None and protocol.coalesced
+
+    def _send_room_state(self, room_id: UUID, frame: str) -> None:
+        for user_id, connection in list(
+            self.active_connections.get(room_id, {}).items()
+        ):
+            if self._coalesces(user_id):
+                self._enqueue(
+                    room_id, user_id, connection, frame, WSActionType.ROOM_STATE
+                )
+
+    def _enqueue(
+        self,
+        room_id: UUID,
+        user_id: UUID,
+        connection: WebSocket,
+        frame: str,
+        action: str | None,
+    ) -> bool:
+        queue = self._queue(room_id, user_id, connection)
+        if queue.closed:
+            return False
+        protocol = self.protocols.get(user_id)
+        payload = msgpack_frame(frame) if protocol and protocol.binary else frame
+        if queue.put(payload, action):
+            return True
+
+        self.overflow_disconnects += 1
+        self._evict(room_id, user_id, connection, status.WS_1013_TRY_AGAIN_LATER)
+        return False
+
+    async def drain(self, room_id: UUID) -> None:
+        # One at a time: idle queues return at once, and no task is created
+        # per socket.
+        queues = [
+            self.outbound[user_id]
+            for user_id in self.active_connections.get(room_id, {})
+            if user_id in self.outbound
+        ]
+        for queue in queues:
+            await queue.drain()
+
+    def _evict(
+        self, room_id: UUID, user_id: UUID, connection: WebSocket, code: int
+    ) -> None:
+        queue = self.outbound.get(user_id)
+        if queue is not None and queue.websocket is connection:
+            del self.outbound[user_id]
+            queue.close()
+
+        room_connections = self.active_connections.get(room_id, {})
+        if room_connections.get(user_id) is not connection:
+            return
+        del room_connections[user_id]
+        if not room_connections:
+            del self.active_connections[room_id]
+            self._schedule_replay_expiry(room_id)
+        if self.user_rooms.get(user_id) == room_id:
+            del self.user_rooms[user_id]
+        self._forget(user_id)
+        task = asyncio.create_task(self._close_quietly(connection, code))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close_quietly(self, connection: WebSocket, code: int) -> None:
+        with suppress(Exception):
+            await asyncio.wait_for(connection.close(code=code), self.send_timeout)
+
+    def room_stats(self, room_id: UUID) -> dict[str, int]:
+        queues = [
+            self.outbound[user_id]
+            for user_id in self.active_connections.get(room_id, {})
+            if user_id in self.outbound
+        ]
+        return {
+            "connections": len(self.active_connections.get(room_id, {})),
+            "queue_depth": sum(queue.depth for queue in queues),
+            "max_queue_depth": max((q.stats.max_depth for q in queues), default=0),
+            "sent": sum(queue.stats.sent for queue in queues),
+            "dropped": sum(queue.stats.dropped for queue in queues),
+            "coalesced": sum(queue.stats.coalesced for queue in queues),
+        }
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "rooms": len(self.active_connections),
+            "connections": len(self.user_rooms),
+            "sends_timed_out": self.sends_timed_out,
+            "sends_failed": self.sends_failed,
+            "overflow_disconnects": self.overflow_disconnects,
+            "heartbeats_sent": self.heartbeats_sent,
+            "reaped": self.reaped,
+            "coalescer": self.coalescer.stats(),
+            "replay_buffers": len(self.replays),
+            "graces": {
+                "pending": len(self.graces),
+                "started": self.graces_started,
+                "cancelled": self.graces_cancelled,
+                "expired": self.graces_expired,
+            },
+            "overflow_policy": self.overflow_policy.value,
+            "pubsub_backend": type(self.backend).__name__,
+            "pubsub_dropped": self.backend.dropped,
+            "by_room": {
+                str(room_id): self.room_stats(room_id)
+                for room_id in self.active_connections
+            },
+        }
 
     def get_room_users(self, room_id: UUID) -> set[UUID]:
         if room_id in self.active_connections:
             return set(self.active_connections[room_id].keys())
         return set()
 
+    def get_connected_user_ids(self) -> set[UUID]:
+        return set(self.user_rooms)
+
     def is_user_in_room(self, room_id: UUID, user_id: UUID) -> bool:
         return (
             room_id in self.active_connections
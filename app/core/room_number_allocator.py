@@ -0,0 +1,55 @@
+import asyncio
+import heapq
+from collections.abc import Iterable
+
+
+class RoomNumberAllocator:
+    """Hands out the smallest free room number without a query per room.
+
+    Numbers in use are loaded from the database once per process; after that
+    acquire and release only touch an in-memory min-heap. The unique index on
+    room.room_number stays the source of truth: when an insert collides (a
+    number taken by another worker), ``reset`` forces a reload on next use.
+    """
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.loaded = False
+        self._in_use: set[int] = set()
+        self._free: list[int] = []
+        self._next = 1
+
+    def load(self, used_numbers: Iterable[int]) -> None:
+        self._in_use = set(used_numbers)
+        highest = max(self._in_use, default=0)
+        self._free = [n for n in range(1, highest) if n not in self._in_use]
+        self._next = highest + 1
+        self.loaded = True
+
+    def reset(self) -> None:
+        self.loaded = False
+        self._in_use.clear()
+        self._free.clear()
+        self._next = 1
+
+    def acquire(self) -> int:
+        while self._free:
+            number = heapq.heappop(self._free)
+            if number not in self._in_use:
+                self._in_use.add(number)
+                return number
+
+        while self._next in self._in_use:
+            self._next += 1
+        number = self._next
+        self._next += 1
+        self._in_use.add(number)
+        return number
+
+    def release(self, number: int) -> None:
+        if number in self._in_use:
+            self._in_use.remove(number)
+            heapq.heappush(self._free, number)
+
+
+room_number_allocator = RoomNumberAllocator()
@@ -0,0 +1,202 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from contextlib import suppress
+from enum import Enum
+from typing import Any
+from uuid import UUID, uuid4
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+NOTIFY_PAYLOAD_LIMIT = 7999
+
+
+class RoomEventKind(str, Enum):
+    BROADCAST = "broadcast"
+    PERSONAL = "personal"
+    LOBBY_CHANGED = "lobby_changed"
+    READY_CHANGED = "ready_changed"
+
+
+class RoomEvent(BaseModel):
+    kind: RoomEventKind = RoomEventKind.BROADCAST
+    origin: UUID | None = None
+    room_id: UUID | None = None
+    user_id: UUID | None = None
+    exclude_user_id: UUID | None = None
+    action: str | None = None
+    frame: str = ""
+    room_user_id: UUID | None = None
+    is_ready: bool | None = None
+
+
+RoomEventHandler = Callable[[RoomEvent], None]
+
+
+class RoomEventBackend(ABC):
+    """Carries room events between workers.
+
+    Each worker delivers to its own sockets first and then publishes the
+    event; backends hand it to every *other* worker's handler, never back to
+    the publisher.
+    """
+
+    def __init__(self) -> None:
+        self.origin = uuid4()
+        self.handler: RoomEventHandler | None = None
+        self.dropped = 0
+
+    async def start(self, handler: RoomEventHandler) -> None:
+        self.handler = handler
+
+    async def stop(self) -> None:
+        self.handler = None
+
+    @abstractmethod
+    async def publish(self, event: RoomEvent) -> None: ...
+
+    def _receive(self, event: RoomEvent) -> None:
+        if event.origin == self.origin or self.handler is None:
+            return
+        try:
+            self.handler(event)
+        except Exception:
+            logger.exception("Room event delivery failed")
+
+
+class InProcessBus:
+    def __init__(self) -> None:
+        self.backends: set[InProcessBackend] = set()
+
+
+class InProcessBackend(RoomEventBackend):
+    """Single-process backend; backends sharing a bus act as separate workers."""
+
+    def __init__(self, bus: InProcessBus | None = None) -> None:
+        super().__init__()
+        self.bus = bus or InProcessBus()
+
+    async def start(self, handler: RoomEventHandler) -> None:
+        await super().start(handler)
+        self.bus.backends.add(self)
+
+    async def stop(self) -> None:
+        self.bus.backends.discard(self)
+        await super().stop()
+
+    async def publish(self, event: RoomEvent) -> None:
+        event = event.model_copy(update={"origin": self.origin})
+        for backend in list(self.bus.backends):
+            backend._receive(event)
+
+
+class PostgresNotifyBackend(RoomEventBackend):
+    """LISTEN/NOTIFY over one dedicated asyncpg connection from the engine.
+
+    The connection is held for the worker's lifetime and re-established with
+    backoff if Postgres drops it; events published while it is down only
+    reach local sockets.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        channel: str = settings.ROOM_PUBSUB_CHANNEL,
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        super().__init__()
+        self.engine = engine
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._connection: AsyncConnection | None = None
+        self._driver: Any = None
+        self._lock = asyncio.Lock()
+        self._reconnect: asyncio.Task | None = None
+
+    async def start(self, handler: RoomEventHandler) -> None:
+        await super().start(handler)
+        await self._listen()
+
+    async def _listen(self) -> None:
+        self._connection = await self.engine.connect()
+        raw = await self._connection.get_raw_connection()
+        driver: Any = raw.driver_connection
+        await driver.add_listener(self.channel, self._on_notify)
+        driver.add_termination_listener(self._on_terminated)
+        self._driver = driver
+
+    async def stop(self) -> None:
+        if self._reconnect is not None:
+            self._reconnect.cancel()
+            self._reconnect = None
+        await super().stop()
+        await self._release()
+
+    async def _release(self) -> None:
+        driver, connection = self._driver, self._connection
+        self._driver = self._connection = None
+        if driver is not None and not driver.is_closed():
+            driver.remove_termination_listener(self._on_terminated)
+            with suppress(Exception):
+                await driver.remove_listener(self.channel, self._on_notify)
+        if connection is not None:
+            with suppress(Exception):
+                await connection.close()
+
+    async def publish(self, event: RoomEvent) -> None:
+        if self._driver is None:
+            self.dropped += 1
+            return
+
+        payload = event.model_copy(update={"origin": self.origin}).model_dump_json(
+            exclude_none=True
+        )
+        if len(payload.encode()) > NOTIFY_PAYLOAD_LIMIT:
+            self.dropped += 1
+            logger.warning(
+                "Room event %s too large for NOTIFY (%d bytes)",
+                event.action,
+                len(payload),
+            )
+            return
+
+        try:
+            async with self._lock:
+                await self._driver.execute(
+                    "SELECT pg_notify($1, $2)", self.channel, payload
+                )
+        except Exception:
+            self.dropped += 1
+            logger.exception("Room event publish failed")
+
+    def _on_notify(
+        self, _connection: Any, _pid: int, _channel: str, payload: str
+    ) -> None:
+        self._receive(RoomEvent.model_validate_json(payload))
+
+    def _on_terminated(self, _connection: Any) -> None:
+        logger.warning("Room event listener connection lost")
+        self._driver = None
+        if self.handler is not None and self._reconnect is None:
+            self._reconnect = asyncio.create_task(self._relisten())
+
+    async def _relisten(self) -> None:
+        delay = self.reconnect_delay
+        while self.handler is not None:
+            await asyncio.sleep(delay)
+            await self._release()
+            try:
+                await self._listen()
+            except Exception:
+                logger.exception("Room event listener reconnect failed")
+                delay = min(delay * 2, 30.0)
+                continue
+            break
+        self._reconnect = None
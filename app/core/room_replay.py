@@ -0,0 +1,43 @@
+from collections import deque
+from uuid import uuid4
+
+from app.core.config import settings
+from app.core.timer_wheel import TimerHandle
+
+
+def stamp(frame: str, seq: int) -> str:
+    """Add ``"seq"`` to an encoded JSON object frame without re-encoding it."""
+    return f'{frame[:-1]},"seq":{seq}}}'
+
+
+class ReplayBuffer:
+    """Sequence numbers and the last few broadcasts of one room on this worker.
+
+    ``epoch`` identifies the buffer: sequence numbers are only comparable
+    within one epoch, so a resume token from another worker, or from before
+    the buffer expired, never matches and the client gets a snapshot instead.
+    """
+
+    __slots__ = ("epoch", "events", "expiry", "seq")
+
+    def __init__(self, size: int = settings.ROOM_REPLAY_BUFFER_SIZE) -> None:
+        self.epoch = uuid4().hex
+        self.seq = 0
+        self.events: deque[tuple[int, str | None, str]] = deque(maxlen=size)
+        self.expiry: TimerHandle | None = None
+
+    def append(self, action: str | None, frame: str) -> str:
+        self.seq += 1
+        frame = stamp(frame, self.seq)
+        self.events.append((self.seq, action, frame))
+        return frame
+
+    def covers(self, epoch: str | None, seq: int | None) -> bool:
+        """Whether every event after ``seq`` in ``epoch`` is still buffered."""
+        if epoch != self.epoch or seq is None or seq < 0 or seq > self.seq:
+            return False
+        oldest = self.events[0][0] if self.events else self.seq + 1
+        return seq >= oldest - 1
+
+    def since(self, seq: int) -> list[tuple[int, str | None, str]]:
+        return [event for event in self.events if event[0] > seq]
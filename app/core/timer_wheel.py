@@ -0,0 +1,80 @@
+import asyncio
+import logging
+import math
+import time
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class TimerHandle:
+    __slots__ = ("args", "callback", "cancelled", "rounds")
+
+    def __init__(
+        self, rounds: int, callback: Callable[..., None], args: tuple[Any, ...]
+    ) -> None:
+        self.rounds = rounds
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class TimerWheel:
+    """Hashed timer wheel: O(1) schedule/cancel, one task for every timer.
+
+    Timers are rounded up to whole ticks, so a callback fires no earlier than
+    ``delay`` and at most about two ticks later. Callbacks run synchronously
+    on the wheel task and must not block.
+    """
+
+    def __init__(self, tick: float, slots: int = 512) -> None:
+        self.tick = tick
+        self.slots: list[list[TimerHandle]] = [[] for _ in range(slots)]
+        self.cursor = 0
+        self.fired = 0
+
+    def __len__(self) -> int:
+        return sum(1 for slot in self.slots for handle in slot if not handle.cancelled)
+
+    def schedule(
+        self, delay: float, callback: Callable[..., None], *args: Any
+    ) -> TimerHandle:
+        # The current slot is only reached on the next advance, which may be
+        # almost immediate, so count whole ticks from the one after it.
+        ticks = max(1, math.ceil(delay / self.tick))
+        rounds, offset = divmod(ticks, len(self.slots))
+        handle = TimerHandle(rounds, callback, args)
+        self.slots[(self.cursor + offset) % len(self.slots)].append(handle)
+        return handle
+
+    def advance(self) -> None:
+        """Fire the timers due on the current tick and move to the next."""
+        slot = self.slots[self.cursor]
+        self.slots[self.cursor] = pending = []
+        self.cursor = (self.cursor + 1) % len(self.slots)
+
+        for handle in slot:
+            if handle.cancelled:
+                continue
+            if handle.rounds:
+                handle.rounds -= 1
+                pending.append(handle)
+                continue
+            self.fired += 1
+            try:
+                handle.callback(*handle.args)
+            except Exception:
+                logger.exception("Timer callback failed")
+
+    async def run(self) -> None:
+        next_tick = time.monotonic() + self.tick
+        while True:
+            await asyncio.sleep(max(0.0, next_tick - time.monotonic()))
+            # Catch up on ticks missed while the loop was busy.
+            while next_tick <= time.monotonic():
+                self.advance()
+                next_tick += self.tick
@@ -0,0 +1,65 @@
+from functools import lru_cache
+from typing import Any
+
+import msgpack
+from pydantic_core import from_json
+
+# Field names shortened on msgpack sockets. Keys not listed (user uids keying
+# room_state's ready map, for instance) are sent as they are.
+TAGS = {
+    "status": "s",
+    "action": "a",
+    "data": "d",
+    "error": "e",
+    "timestamp": "t",
+    "message": "M",
+    "users": "U",
+    "user_uid": "u",
+    "nickname": "n",
+    "is_ready": "r",
+    "slot_index": "i",
+    "current_character": "c",
+    "code": "k",
+    "name": "m",
+    "game_url": "g",
+    "host_uid": "h",
+    "joined": "J",
+    "left": "L",
+    "ready": "R",
+    "seq": "q",
+    "epoch": "p",
+    "resumed": "z",
+}
+UNTAGS = {tag: key for key, tag in TAGS.items()}
+
+
+def _retag(value: Any, tags: dict[str, str]) -> Any:
+    if isinstance(value, dict):
+        return {tags.get(key, key): _retag(item, tags) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_retag(item, tags) for item in value]
+    return value
+
+
+def pack(message: dict[str, Any]) -> bytes:
+    packed: bytes = msgpack.packb(_retag(message, TAGS), use_bin_type=True)
+    return packed
+
+
+def unpack(frame: bytes) -> Any:
+    """Decode a client frame; raises ValueError if it is not valid msgpack."""
+    try:
+        raw = msgpack.unpackb(frame, raw=False)
+    except (msgpack.UnpackException, TypeError) as e:
+        raise ValueError(str(e)) from e
+    return _retag(raw, UNTAGS)
+
+
+@lru_cache(maxsize=512)
+def msgpack_frame(frame: str) -> bytes:
+    """Re-encode a JSON frame for msgpack sockets.
+
+    Broadcasts are encoded to JSON once per room; the cache makes the binary
+    copy once per frame too, however many msgpack sockets receive it.
+    """
+    return pack(from_json(frame))
@@ -10,15 +10,20 @@ from app.api.internal.endpoints import internal_router
 from app.api.v1.endpoints import api_router
 from app.core.config import settings
 from app.core.error import DomainErrorCode, MCRDomainError
+from app.core.lobby_connection_manager import lobby_manager
+from app.core.room_connection_manager import room_manager
+from app.core.room_pubsub import PostgresNotifyBackend
+from app.db.session import engine
 from app.schemas.common import BaseResponse
+from app.services.presence_registry import presence_registry
+from app.services.room_service import load_lobby_snapshot
+from app.services.room_state import room_state_store
+from app.services.room_sweeper import room_sweeper
 
 
 async def cleanup_task() -> None:
-    try:
-        while True:
-            await asyncio.sleep(60)
-    except asyncio.CancelledError:
-        pass
+    with suppress(asyncio.CancelledError):
+        await room_sweeper.run()
 
 
 app = FastAPI(
@@ -43,8 +48,15 @@ app.include_router(internal_router, prefix="/internal")
 
 @app.on_event("startup")
 async def on_startup() -> None:
+    lobby_manager.snapshot_loader = load_lobby_snapshot
+    if settings.ROOM_PUBSUB_BACKEND == "postgres":
+        await room_manager.start(PostgresNotifyBackend(engine))
+    else:
+        await room_manager.start()
     cleanup = asyncio.create_task(cleanup_task())
     app.state.cleanup_task = cleanup
+    app.state.presence_task = asyncio.create_task(presence_registry.run())
+    app.state.room_state_task = asyncio.create_task(room_state_store.run())
 
 
 @app.on_event("shutdown")
@@ -52,6 +64,17 @@ async def on_shutdown() -> None:
     app.state.cleanup_task.cancel()
     with suppress(asyncio.CancelledError):
         await app.state.cleanup_task
+    app.state.presence_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await app.state.presence_task
+    with suppress(Exception):
+        await presence_registry.clear()
+    app.state.room_state_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await app.state.room_state_task
+    with suppress(Exception):
+        await room_state_store.flush()
+    await room_manager.stop()
 
 
 @app.get("/health", status_code=status.HTTP_200_OK)
@@ -0,0 +1,26 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import Column, DateTime, func
+from sqlmodel import Field, SQLModel
+
+
+class RoomPresence(SQLModel, table=True):  # type: ignore[call-arg]
+    """Which worker holds a live socket for a room user.
+
+    UNLOGGED: rows are rewritten every heartbeat and are worthless after a
+    crash, so they skip the WAL.
+    """
+
+    room_id: UUID = Field(primary_key=True)
+    user_id: UUID = Field(primary_key=True)
+    worker_id: UUID
+    last_seen_at: datetime = Field(
+        sa_column=Column(
+            DateTime(timezone=True),
+            server_default=func.now(),
+            nullable=False,
+        )
+    )
+
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
@@ -30,4 +30,9 @@ class RoomUser(TimeStampMixin, SQLModel, table=True):  # type: ignore[call-arg]
 
     character: Character = Relationship()
 
-    __table_args__ = (UniqueConstraint("user_id"),)
+    __table_args__ = (
+        UniqueConstraint("user_id"),
+        UniqueConstraint(
+            "room_id", "slot_index", name="uq_roomuser_room_id_slot_index"
+        ),
+    )
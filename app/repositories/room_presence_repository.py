@@ -0,0 +1,79 @@
+from collections.abc import Collection
+from datetime import timedelta
+from typing import cast
+from uuid import UUID
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import CursorResult
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.error import DomainErrorCode
+from app.models.room_presence import RoomPresence
+from app.repositories.base_repository import BaseRepository
+
+
+class RoomPresenceRepository(BaseRepository[RoomPresence]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, RoomPresence, DomainErrorCode.USER_NOT_IN_ROOM)
+
+    async def refresh(
+        self, worker_id: UUID, entries: Collection[tuple[UUID, UUID]]
+    ) -> None:
+        """Upsert this worker's connections and drop the ones it no longer has.
+
+        now() is fixed for the transaction, so rows not touched by the upsert
+        are exactly those with an older last_seen_at.
+        """
+        if entries:
+            stmt = insert(RoomPresence).values(
+                [
+                    {"room_id": room_id, "user_id": user_id, "worker_id": worker_id}
+                    for room_id, user_id in entries
+                ]
+            )
+            await self.session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[RoomPresence.room_id, RoomPresence.user_id],
+                    set_={
+                        "worker_id": stmt.excluded.worker_id,
+                        "last_seen_at": func.now(),
+                    },
+                )
+            )
+        await self.session.execute(
+            delete(RoomPresence)
+            .where(RoomPresence.worker_id == worker_id)
+            .where(RoomPresence.last_seen_at < func.now())
+        )
+
+    async def remove_worker(self, worker_id: UUID) -> None:
+        await self.session.execute(
+            delete(RoomPresence).where(RoomPresence.worker_id == worker_id)
+        )
+
+    async def live_user_ids(self, ttl: timedelta) -> set[UUID]:
+        result = await self.session.execute(
+            select(RoomPresence.user_id)
+            .where(RoomPresence.last_seen_at >= func.now() - ttl)
+            .distinct()
+        )
+        return set(result.scalars().all())
+
+    async def is_live_elsewhere(
+        self, room_id: UUID, user_id: UUID, worker_id: UUID, ttl: timedelta
+    ) -> bool:
+        result = await self.session.execute(
+            select(RoomPresence.worker_id)
+            .where(RoomPresence.room_id == room_id)
+            .where(RoomPresence.user_id == user_id)
+            .where(RoomPresence.worker_id != worker_id)
+            .where(RoomPresence.last_seen_at >= func.now() - ttl)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def delete_expired(self, ttl: timedelta) -> int:
+        result = await self.session.execute(
+            delete(RoomPresence).where(RoomPresence.last_seen_at < func.now() - ttl)
+        )
+        return cast(CursorResult, result).rowcount
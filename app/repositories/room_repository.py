@@ -1,36 +1,113 @@
-from sqlalchemy import func, select
+from uuid import UUID
+
+from sqlalchemy import delete, exists, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
-from app.core.error import DomainErrorCode
+from app.core.error import DomainErrorCode, MCRDomainError
+from app.core.room_number_allocator import room_number_allocator
 from app.models.room import Room
 from app.models.room_user import RoomUser
+from app.models.user import User
 from app.repositories.base_repository import BaseRepository
 
+UNIQUE_VIOLATION = "23505"
+ROOM_NUMBER_INDEX = "ix_room_room_number"
+
 
 class RoomRepository(BaseRepository[Room]):
     def __init__(self, session: AsyncSession):
         super().__init__(session, Room, DomainErrorCode.ROOM_NOT_FOUND)
 
     async def _generate_room_number(self) -> int:
-        result = await self.session.execute(select(func.max(Room.room_number)))
-        max_room_number = result.scalar() or 0
-        return max_room_number + 1
+        if not room_number_allocator.loaded:
+            async with room_number_allocator.lock:
+                if not room_number_allocator.loaded:
+                    result = await self.session.execute(select(Room.room_number))
+                    room_number_allocator.load(result.scalars().all())
+        return room_number_allocator.acquire()
 
     async def create_with_room_number(self, room: Room) -> Room:
         room.room_number = await self._generate_room_number()
         return await self.create(room)
 
-    async def get_available_rooms_with_users(self) -> list[tuple[Room, list[RoomUser]]]:
+    async def get_for_update(self, room_id: UUID) -> Room:
         result = await self.session.execute(
-            select(Room).where(Room.is_playing == False)  # noqa: E712
+            select(Room)
+            .where(Room.id == room_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
         )
-        rooms = result.scalars().all()
+        room = result.scalar_one_or_none()
+        if room is None:
+            raise MCRDomainError(
+                code=self.not_found_error_code,
+                message="Room not found",
+                details={"model": "Room", "conditions": {"id": str(room_id)}},
+            )
+        return room
+
+    async def reassign_host(
+        self, room_id: UUID, from_user_id: UUID, to_user_id: UUID
+    ) -> UUID | None:
+        result = await self.session.execute(
+            update(Room)
+            .where(Room.id == room_id)
+            .where(Room.host_id == from_user_id)
+            .values(host_id=to_user_id)
+            .returning(Room.host_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def delete_by_id(self, room_id: UUID) -> None:
+        await self.session.execute(delete(Room).where(Room.id == room_id))
 
-        room_with_users = []
-        for room in rooms:
-            room_users = await self.session.execute(
-                select(RoomUser).where(RoomUser.room_id == room.id)
+    @staticmethod
+    def is_room_number_conflict(error: IntegrityError) -> bool:
+        """Whether the insert hit the unique index on room.room_number.
+
+        The asyncpg adapter error carries the SQLSTATE; the constraint name is
+        on the asyncpg exception it was raised from.
+        """
+        if getattr(error.orig, "sqlstate", None) != UNIQUE_VIOLATION:
+            return False
+        cause = getattr(error.orig, "__cause__", None)
+        return getattr(cause, "constraint_name", None) == ROOM_NUMBER_INDEX
+
+    async def get_available_rooms_with_users(
+        self,
+    ) -> list[tuple[Room, User, list[RoomUser]]]:
+        room_rows = (
+            await self.session.execute(
+                select(Room, User)
+                .join(User, User.id == Room.host_id)
+                .where(Room.is_playing == False)  # noqa: E712
+                .order_by(Room.room_number)
             )
-            room_with_users.append((room, room_users.scalars().all()))
+        ).all()
+        if not room_rows:
+            return []
+
+        users_by_room: dict[UUID, list[RoomUser]] = {
+            room.id: [] for room, _ in room_rows
+        }
+        room_users = await self.session.execute(
+            select(RoomUser)
+            .options(joinedload(RoomUser.character))
+            .where(RoomUser.room_id.in_(users_by_room.keys()))
+            .order_by(RoomUser.slot_index)
+        )
+        for room_user in room_users.scalars():
+            users_by_room[room_user.room_id].append(room_user)
 
-        return room_with_users
+        return [(room, host, users_by_room[room.id]) for room, host in room_rows]
+
+    async def delete_empty(self) -> list[int]:
+        result = await self.session.execute(
+            delete(Room)
+            .where(~exists().where(RoomUser.room_id == Room.id))
+            .returning(Room.room_number)
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.scalars().all())
@@ -1,10 +1,31 @@
-from uuid import UUID
+from collections.abc import Collection
+from typing import cast
+from uuid import UUID, uuid4
 
+from sqlalchemy import (
+    ARRAY,
+    Uuid,
+    all_,
+    bindparam,
+    case,
+    delete,
+    exists,
+    false,
+    func,
+    insert,
+    literal,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.engine import CursorResult
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
 from app.core.error import DomainErrorCode, MCRDomainError
+from app.models.room import Room
 from app.models.room_user import RoomUser
+from app.models.user import User
 from app.repositories.base_repository import BaseRepository
 
 
@@ -24,3 +45,143 @@ class RoomUserRepository(BaseRepository[RoomUser]):
                 details={"uuid": str(room_user_id)},
             )
         return room_user
+
+    async def insert_into_free_slot(self, room: Room, user_id: UUID) -> RoomUser | None:
+        """Seat a user in the lowest free slot with a single INSERT ... SELECT.
+
+        Returns None without writing anything when the user does not exist, is
+        already in a room, or every slot is taken. Callers must hold the room
+        row lock so the free-slot lookup cannot race another join.
+        """
+        slots = (
+            func.generate_series(0, room.max_users - 1)
+            .table_valued("slot")
+            .render_derived()
+        )
+        free_slot = (
+            select(func.min(slots.c.slot).label("slot_index"))
+            .where(
+                slots.c.slot.not_in(
+                    select(RoomUser.slot_index).where(RoomUser.room_id == room.id)
+                )
+            )
+            .subquery()
+        )
+        source = (
+            select(
+                literal(uuid4(), Uuid()),
+                literal(room.id, Uuid()),
+                User.id,
+                User.uid,
+                User.nickname,
+                false(),
+                false(),
+                free_slot.c.slot_index,
+                User.character_code,
+                func.now(),
+            )
+            .join(free_slot, true())
+            .where(User.id == user_id)
+            .where(free_slot.c.slot_index.is_not(None))
+            .where(~exists().where(RoomUser.user_id == user_id))
+        )
+        result = await self.session.scalars(
+            insert(RoomUser)
+            .from_select(
+                [
+                    "id",
+                    "room_id",
+                    "user_id",
+                    "user_uid",
+                    "user_nickname",
+                    "is_ready",
+                    "is_bot",
+                    "slot_index",
+                    "character_code",
+                    "created_at",
+                ],
+                source,
+            )
+            .returning(RoomUser)
+        )
+        return result.one_or_none()
+
+    async def list_members(
+        self, room_id: UUID, user_id: UUID, *, remove: bool
+    ) -> tuple[bool, list[RoomUser]]:
+        """Optionally delete ``user_id`` from the room and list who is left.
+
+        Returns whether the user was seated in the room and the room's members
+        with characters loaded. With ``remove`` the delete runs as a CTE of the
+        same statement; the outer SELECT still sees the pre-delete snapshot,
+        so the departed row is filtered out here instead of re-read.
+        """
+        stmt = (
+            select(RoomUser)
+            .options(joinedload(RoomUser.character))
+            .where(RoomUser.room_id == room_id)
+            .order_by(RoomUser.slot_index)
+            .execution_options(populate_existing=True)
+        )
+        if remove:
+            stmt = stmt.add_cte(
+                delete(RoomUser)
+                .where(RoomUser.room_id == room_id)
+                .where(RoomUser.user_id == user_id)
+                .returning(RoomUser.id)
+                .cte("removed")
+            )
+
+        members = list((await self.session.scalars(stmt)).unique())
+        seated = any(member.user_id == user_id for member in members)
+        if remove:
+            members = [member for member in members if member.user_id != user_id]
+        return seated, members
+
+    async def list_seats(self, room_id: UUID) -> list[RoomUser]:
+        """The room's members in slot order, characters joined in one SELECT."""
+        stmt = (
+            select(RoomUser)
+            .options(joinedload(RoomUser.character))
+            .where(RoomUser.room_id == room_id)
+            .order_by(RoomUser.slot_index)
+        )
+        return list((await self.session.scalars(stmt)).unique())
+
+    async def update_ready_flags(self, flags: dict[UUID, bool]) -> int:
+        """Set is_ready for many room users, keyed by roomuser id, in one UPDATE.
+
+        Returns the rows actually updated; seats deleted since are skipped.
+        """
+        result = await self.session.execute(
+            update(RoomUser)
+            .where(RoomUser.id.in_(flags.keys()))
+            .values(is_ready=case(flags, value=RoomUser.id))
+        )
+        return cast(CursorResult, result).rowcount
+
+    async def delete_by_room(self, room_id: UUID) -> None:
+        await self.session.execute(delete(RoomUser).where(RoomUser.room_id == room_id))
+
+    async def delete_orphaned(self) -> int:
+        result = await self.session.execute(
+            delete(RoomUser)
+            .where(~exists().where(Room.id == RoomUser.room_id))
+            .execution_options(synchronize_session=False)
+        )
+        return cast(CursorResult, result).rowcount
+
+    async def delete_disconnected(self, connected_user_ids: Collection[UUID]) -> int:
+        connected = bindparam(
+            "connected_user_ids",
+            list(connected_user_ids),
+            type_=ARRAY(Uuid()),
+        )
+        result = await self.session.execute(
+            delete(RoomUser)
+            .where(RoomUser.room_id == Room.id)
+            .where(Room.is_playing == False)  # noqa: E712
+            .where(RoomUser.user_id != all_(connected))
+            .execution_options(synchronize_session=False)
+        )
+        return cast(CursorResult, result).rowcount
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.schemas.character import CharacterResponse
 
@@ -38,3 +38,22 @@ class RoomDetailResponse(BaseModel):
     is_playing: bool
     game_id: str
     users: list[RoomUserResponse]
+
+
+class RoomCleanupResponse(BaseModel):
+    orphaned_room_users: int = 0
+    disconnected_room_users: int = 0
+    empty_rooms: int = 0
+
+    @property
+    def total(self) -> int:
+        return (
+            self.orphaned_room_users + self.disconnected_room_users + self.empty_rooms
+        )
+
+
+class LobbyQuery(BaseModel):
+    limit: int | None = Field(default=None, ge=1, le=100)
+    cursor: int | None = None
+    has_free_slot: bool | None = None
+    exclude_full: bool = False
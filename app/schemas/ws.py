@@ -1,6 +1,7 @@
 from datetime import UTC, datetime
 from enum import Enum
 from typing import Any, Literal
+from uuid import UUID
 
 from pydantic import BaseModel, Field
 
@@ -22,6 +23,44 @@ class WSActionType(str, Enum):
     ERROR = "error"
     USER_LIST = "user_list"
     ADD_BOT = "add_bot"
+    ROOM_STATE = "room_state"
+    RESUME = "resume"
+    ROOM_SNAPSHOT = "room_snapshot"
+
+    LOBBY_SNAPSHOT = "lobby_snapshot"
+    ROOM_CREATED = "room_created"
+    ROOM_UPDATED = "room_updated"
+    ROOM_REMOVED = "room_removed"
+
+
+class RoomProtocol(str, Enum):
+    """Room WebSocket subprotocols, offered via Sec-WebSocket-Protocol.
+
+    v1 is what clients that offer nothing get. v2 replaces user_joined,
+    user_left, user_ready_changed and user_list with coalesced room_state
+    deltas, which may echo the receiving client's own changes, and receives
+    a server-sent ``ping`` heartbeat frame. v1 clients keep driving the
+    heartbeat with their own pings; the server only watches them for
+    silence. The .msgpack variants carry the same frames as binary
+    MessagePack with short keys.
+    """
+
+    V1 = "mcr.room.v1"
+    V2 = "mcr.room.v2"
+    V1_MSGPACK = "mcr.room.v1.msgpack"
+    V2_MSGPACK = "mcr.room.v2.msgpack"
+
+    @property
+    def coalesced(self) -> bool:
+        return self in (RoomProtocol.V2, RoomProtocol.V2_MSGPACK)
+
+    @property
+    def server_pings(self) -> bool:
+        return self.coalesced
+
+    @property
+    def binary(self) -> bool:
+        return self in (RoomProtocol.V1_MSGPACK, RoomProtocol.V2_MSGPACK)
 
 
 class WebSocketMessage(BaseModel):
@@ -60,3 +99,17 @@ class GameStartedData(BaseModel):
 
 class UserListData(BaseModel):
     users: list[RoomUserResponse]
+
+
+class DeliveryReport(BaseModel):
+    """What happened to a broadcast on this worker's own sockets.
+
+    ``queued``: the frame is in the socket's outbound queue (or held for its
+    next ``room_state`` frame); actual sending happens in the writer task.
+    ``rejected``: the socket could not take it and is evicted (closed with
+    1013, or already closing). Sockets on other workers appear in neither:
+    the pub/sub publish is fire-and-forget.
+    """
+
+    queued: list[UUID] = Field(default_factory=list)
+    rejected: list[UUID] = Field(default_factory=list)
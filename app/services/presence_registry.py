@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager, suppress
+from datetime import timedelta
+from typing import Any
+from uuid import UUID, uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import DurationStats
+from app.core.room_connection_manager import RoomConnectionManager, room_manager
+from app.db.session import async_session
+from app.repositories.room_presence_repository import RoomPresenceRepository
+
+logger = logging.getLogger(__name__)
+
+
+class PresenceRegistry:
+    """Publishes this worker's room sockets to the shared roompresence table.
+
+    Every heartbeat the whole local connection set is written in one upsert,
+    and rows this worker no longer holds are removed in the same transaction.
+    Seats held through a disconnect grace period are published as well, so
+    the cleanup sweep does not free them before the timer runs out.
+    ``touch`` brings the next flush forward so a new socket is visible to the
+    other workers without waiting a full interval.
+    """
+
+    def __init__(
+        self,
+        connections: RoomConnectionManager = room_manager,
+        session_factory: Callable[
+            [], AbstractAsyncContextManager[AsyncSession]
+        ] = async_session,
+        interval: float = settings.PRESENCE_HEARTBEAT_SECONDS,
+        ttl: float = settings.PRESENCE_TTL_SECONDS,
+    ) -> None:
+        self.connections = connections
+        self.session_factory = session_factory
+        self.interval = interval
+        self.ttl = timedelta(seconds=ttl)
+        self.worker_id = uuid4()
+        self.durations = DurationStats()
+        self.last_entries = 0
+        self._dirty = asyncio.Event()
+        self._lock = asyncio.Lock()
+
+    def touch(self) -> None:
+        self._dirty.set()
+
+    async def flush(self) -> None:
+        async with self._lock:
+            self._dirty.clear()
+            entries = [
+                (room_id, user_id)
+                for room_id, users in self.connections.active_connections.items()
+                for user_id in users
+            ]
+            entries.extend(
+                (room_id, user_id)
+                for user_id, room_id in self.connections.grace_user_ids().items()
+            )
+            started = time.perf_counter()
+            async with self.session_factory() as session:
+                await RoomPresenceRepository(session).refresh(self.worker_id, entries)
+                await session.commit()
+            self.durations.record(time.perf_counter() - started)
+            self.last_entries = len(entries)
+
+    async def run(self) -> None:
+        while True:
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._dirty.wait(), self.interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("presence heartbeat failed")
+                await asyncio.sleep(self.interval)
+
+    async def clear(self) -> None:
+        async with self.session_factory() as session:
+            await RoomPresenceRepository(session).remove_worker(self.worker_id)
+            await session.commit()
+
+    async def live_user_ids(self, session: AsyncSession) -> set[UUID]:
+        """Users with a fresh heartbeat on any worker, plus this worker's own."""
+        live = await RoomPresenceRepository(session).live_user_ids(self.ttl)
+        return (
+            live
+            | self.connections.get_connected_user_ids()
+            | self.connections.grace_user_ids().keys()
+        )
+
+    async def is_live_elsewhere(
+        self, session: AsyncSession, room_id: UUID, user_id: UUID
+    ) -> bool:
+        return await RoomPresenceRepository(session).is_live_elsewhere(
+            room_id, user_id, self.worker_id, self.ttl
+        )
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "worker_id": str(self.worker_id),
+            "interval_seconds": self.interval,
+            "ttl_seconds": self.ttl.total_seconds(),
+            "entries": self.last_entries,
+            "durations": self.durations.as_dict(),
+        }
+
+
+presence_registry = PresenceRegistry()
@@ -1,25 +1,53 @@
 import random
+import time
+from collections.abc import AsyncIterator, Collection
+from contextlib import asynccontextmanager
 from uuid import UUID
 
 import httpx
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.config import settings
 from app.core.error import DomainErrorCode, MCRDomainError
+from app.core.lobby_cache import LobbySnapshot, OpenRoom, OpenRoomIndex, lobby_cache
+from app.core.lobby_connection_manager import lobby_manager
+from app.core.metrics import quick_match_stats
 from app.core.room_connection_manager import room_manager
+from app.core.room_number_allocator import room_number_allocator
+from app.db.session import async_session
 from app.models.room import Room
 from app.models.room_user import RoomUser
 from app.models.user import User
+from app.repositories.room_presence_repository import RoomPresenceRepository
 from app.repositories.room_repository import RoomRepository
 from app.repositories.room_user_repository import RoomUserRepository
 from app.repositories.user_repository import UserRepository
 from app.schemas.character import CharacterResponse
-from app.schemas.room import AvailableRoomResponse, RoomUserResponse, RoomUsersResponse
+from app.schemas.room import (
+    AvailableRoomResponse,
+    RoomCleanupResponse,
+    RoomResponse,
+    RoomUserResponse,
+    RoomUsersResponse,
+)
 from app.services.auth.user_service import UserService
+from app.services.presence_registry import presence_registry
+from app.services.room_state import RoomState, SeatState, room_state_store
 
 
 class RoomService:
+    ROOM_NUMBER_ATTEMPTS = 3
+    QUICK_MATCH_ATTEMPTS = 3
+    QUICK_MATCH_STALE_ROOM_ERRORS = frozenset(
+        {
+            DomainErrorCode.ROOM_IS_FULL,
+            DomainErrorCode.ROOM_ALREADY_PLAYING,
+            DomainErrorCode.ROOM_NOT_FOUND,
+        }
+    )
+
     def __init__(
         self,
         session: AsyncSession,
@@ -33,6 +61,7 @@ class RoomService:
         self.room_repository = room_repository or RoomRepository(session)
         self.user_repository = user_repository or UserRepository(session)
         self.room_user_repository = room_user_repository or RoomUserRepository(session)
+        self.room_presence_repository = RoomPresenceRepository(session)
 
     def _generate_random_room_name(self) -> str:
         adjectives = ["엄숙한", "치열한", "고요한", "은은한", "화려한"]
@@ -43,11 +72,28 @@ class RoomService:
 
         return f"{adj} {noun}"
 
+    @staticmethod
+    def _lobby_changed() -> None:
+        lobby_cache.invalidate()
+        lobby_manager.notify()
+        room_manager.publish_lobby_changed()
+
+    @staticmethod
+    def _to_room_user_response(room_user: RoomUser) -> RoomUserResponse:
+        return RoomUserResponse(
+            nickname=room_user.user_nickname,
+            user_uid=room_user.user_uid,
+            is_ready=room_state_store.is_ready(room_user),
+            slot_index=room_user.slot_index,
+            current_character=CharacterResponse(
+                code=room_user.character.code,
+                name=room_user.character.name,
+            ),
+        )
+
     async def create_room(self, current_user_id: UUID) -> Room:
         user: User = await self.user_repository.filter_one_or_raise(id=current_user_id)
 
-        await self.user_repository.filter_one_or_raise(id=current_user_id)
-
         existing_room_user = await self.room_user_repository.filter_one(
             user_id=current_user_id
         )
@@ -61,66 +107,91 @@ class RoomService:
                 },
             )
 
-        created_room = await self._create_room_internal(current_user_id)
-        await self._join_room_internal(user=user, room_id=created_room.id)
-        await self.session.commit()
-        return created_room
-
-    async def _create_room_internal(self, user_id: UUID) -> Room:
-        room = Room(
+        attempt = 1
+        while True:
+            room = self._new_room(current_user_id)
+            try:
+                created_room = await self.room_repository.create_with_room_number(room)
+                await self._join_room_internal(user=user, room_id=created_room.id)
+                await self.session.commit()
+            except IntegrityError as e:
+                room_number = room.room_number
+                await self.session.rollback()
+                if not self.room_repository.is_room_number_conflict(e):
+                    self._release_room_number(room_number)
+                    raise
+                # Another worker holds the number: reload what is in use.
+                room_number_allocator.reset()
+                if attempt >= self.ROOM_NUMBER_ATTEMPTS:
+                    raise
+                attempt += 1
+                user = await self.user_repository.filter_one_or_raise(
+                    id=current_user_id
+                )
+            except Exception:
+                self._release_room_number(room.room_number)
+                raise
+            else:
+                self._lobby_changed()
+                return created_room
+
+    def _new_room(self, user_id: UUID) -> Room:
+        return Room(
             name=self._generate_random_room_name(),
             max_users=4,
             is_playing=False,
             host_id=user_id,
         )
 
-        created_room = await self.room_repository.create_with_room_number(room)
-        return created_room
+    @staticmethod
+    def _release_room_number(room_number: int | None) -> None:
+        if room_number is not None:
+            room_number_allocator.release(room_number)
 
     async def join_room(self, user_id: UUID, room_id: UUID) -> RoomUser:
-        user: User = await self.user_repository.filter_one_or_raise(id=user_id)
-
-        room = await self.room_repository.filter_one_or_raise(id=room_id)
+        room = await self.room_repository.get_for_update(room_id)
 
         if room.is_playing:
+            await self.session.rollback()
             raise MCRDomainError(
                 code=DomainErrorCode.ROOM_ALREADY_PLAYING,
                 message=f"Room with ID {room_id} is already playing",
                 details={"room_id": str(room_id)},
             )
 
-        room_users = await self.room_user_repository.filter(room_id=room_id)
-        if len(room_users) >= room.max_users:
-            raise MCRDomainError(
+        room_user = await self.room_user_repository.insert_into_free_slot(room, user_id)
+        if room_user is None:
+            try:
+                raise await self._join_rejection(room, user_id)
+            finally:
+                await self.session.rollback()
+
+        await self.session.commit()
+        room_state_store.invalidate(room_id)
+        self._lobby_changed()
+        return room_user
+
+    async def _join_rejection(self, room: Room, user_id: UUID) -> MCRDomainError:
+        await self.user_repository.filter_one_or_raise(id=user_id)
+
+        if await self.room_user_repository.count(room_id=room.id) >= room.max_users:
+            return MCRDomainError(
                 code=DomainErrorCode.ROOM_IS_FULL,
-                message=f"Room with ID {room_id} is full",
-                details={"room_id": str(room_id), "max_users": room.max_users},
+                message=f"Room with ID {room.id} is full",
+                details={"room_id": str(room.id), "max_users": room.max_users},
             )
 
         existing_room_user = await self.room_user_repository.filter_one(user_id=user_id)
-        if existing_room_user:
-            raise MCRDomainError(
-                code=DomainErrorCode.USER_ALREADY_IN_ROOM,
-                message=f"User with ID {user_id} is already in a room",
-                details={
-                    "user_id": str(user_id),
-                    "current_room_id": str(existing_room_user.room_id),
-                },
-            )
-
-        used_slot_indexes: set[int] = set()
-        new_slot_index: int = 0
-        for room_user in room_users:
-            used_slot_indexes.add(room_user.slot_index)
-        for index in range(room.max_users):
-            if index not in used_slot_indexes:
-                new_slot_index = index
-                break
-        room_user = await self._join_room_internal(
-            user=user, room_id=room_id, slot_index=new_slot_index
+        return MCRDomainError(
+            code=DomainErrorCode.USER_ALREADY_IN_ROOM,
+            message=f"User with ID {user_id} is already in a room",
+            details={
+                "user_id": str(user_id),
+                "current_room_id": str(existing_room_user.room_id)
+                if existing_room_user
+                else None,
+            },
         )
-        await self.session.commit()
-        return room_user
 
     async def _join_room_internal(
         self, user: User, room_id: UUID, slot_index: int = 0
@@ -141,122 +212,171 @@ class RoomService:
     async def leave_room(
         self, user_id: UUID, room_id: UUID, *, disconnect_only: bool = False
     ) -> list[RoomUserResponse]:
-        room: Room = await self.room_repository.filter_one_or_raise(id=room_id)
-        room_user: RoomUser = await self.room_user_repository.filter_one_or_raise(
-            user_id=user_id
-        )
+        room = await self.room_repository.get_for_update(room_id)
+        remove = not room.is_playing and not disconnect_only
 
-        if room_user.room_id != room.id:
-            raise MCRDomainError(
-                code=DomainErrorCode.USER_NOT_FOUND,
-                message="user not found in room",
-                details={"user_id": str(user_id), "room_id": str(room_id)},
-            )
-        if not room.is_playing and not disconnect_only:
-            await self.room_user_repository.delete(uuid=room_user.id)
-            await self.session.commit()
-        remaining: list[RoomUser] = await self.room_user_repository.filter_with_options(
-            room_id=room_id,
-            load_options=[selectinload(RoomUser.character)],
+        seated, remaining = await self.room_user_repository.list_members(
+            room_id, user_id, remove=remove
         )
+        if not seated:
+            try:
+                await self.room_user_repository.filter_one_or_raise(user_id=user_id)
+                raise MCRDomainError(
+                    code=DomainErrorCode.USER_NOT_FOUND,
+                    message="user not found in room",
+                    details={"user_id": str(user_id), "room_id": str(room_id)},
+                )
+            finally:
+                await self.session.rollback()
 
-        if remaining and all(ru.is_bot for ru in remaining):
-            for ru in remaining:
-                await self.room_user_repository.delete(uuid=ru.id)
-            await self.session.commit()
-
-            await self.room_repository.delete(room.id)
-            await self.session.commit()
-            return []
-        if (
-            not room.is_playing
-            and not disconnect_only
-            and remaining
-            and room.host_id == user_id
-        ):
-            new_host_ru = min(remaining, key=lambda ru: ru.slot_index)
-            room.host_id = new_host_ru.user_id
-            await self.room_repository.update(room)
-            await self.session.commit()
-
-        if not remaining:
-            await self.room_repository.delete(room.id)
+        if not remaining or all(ru.is_bot for ru in remaining):
+            if remaining:
+                await self.room_user_repository.delete_by_room(room_id)
+            await self.room_repository.delete_by_id(room_id)
             await self.session.commit()
+            room_state_store.discard(room_id)
+            room_number_allocator.release(room.room_number)
+            self._lobby_changed()
             return []
 
-        return [
-            RoomUserResponse(
-                nickname=ru.user_nickname,
-                user_uid=ru.user_uid,
-                is_ready=ru.is_ready,
-                slot_index=ru.slot_index,
-                current_character=CharacterResponse(
-                    code=ru.character.code,
-                    name=ru.character.name,
-                ),
+        if remove and room.host_id == user_id:
+            await self.room_repository.reassign_host(
+                room_id, user_id, remaining[0].user_id
             )
-            for ru in remaining
-        ]
 
-    async def cleanup_rooms(self) -> None:
-        room_users = await self.room_user_repository.filter()
-        rooms = await self.room_repository.filter()
-        room_ids = {room.id for room in rooms}
+        await self.session.commit()
+        if remove:
+            room_state_store.invalidate(room_id)
+            self._lobby_changed()
+        return [self._to_room_user_response(ru) for ru in remaining]
+
+    async def cleanup_rooms(
+        self, connected_user_ids: Collection[UUID] | None = None
+    ) -> RoomCleanupResponse:
+        if connected_user_ids is None:
+            await self.room_presence_repository.delete_expired(presence_registry.ttl)
+            connected_user_ids = await presence_registry.live_user_ids(self.session)
+
+        orphaned = await self.room_user_repository.delete_orphaned()
+        disconnected = await self.room_user_repository.delete_disconnected(
+            connected_user_ids
+        )
+        deleted_room_numbers = await self.room_repository.delete_empty()
+        await self.session.commit()
 
-        for ru in room_users:
-            if ru.room_id not in room_ids:
-                await self.room_user_repository.delete(uuid=ru.id)
-
-        for room in rooms:
-            active_user_ids = room_manager.get_room_users(room.id)
-            current_room_users = await self.room_user_repository.filter(room_id=room.id)
-            for ru in current_room_users:
-                if ru.user_id not in active_user_ids and not room.is_playing:
-                    await self.room_user_repository.delete(uuid=ru.id)
-            remaining = await self.room_user_repository.filter(room_id=room.id)
-            if not remaining:
-                await self.room_repository.delete(room.id)
+        for room_number in deleted_room_numbers:
+            room_number_allocator.release(room_number)
+        result = RoomCleanupResponse(
+            orphaned_room_users=orphaned,
+            disconnected_room_users=disconnected,
+            empty_rooms=len(deleted_room_numbers),
+        )
 
-        await self.session.commit()
+        if result.total:
+            self._lobby_changed()
+        return result
+
+    async def get_lobby_snapshot(self) -> LobbySnapshot:
+        snapshot = lobby_cache.get()
+        if snapshot is not None:
+            return snapshot
+
+        async with lobby_cache.lock:
+            snapshot = lobby_cache.get()
+            if snapshot is None:
+                version = lobby_cache.version
+                rooms_with_users = (
+                    await self.room_repository.get_available_rooms_with_users()
+                )
+                snapshot = lobby_cache.store(
+                    version,
+                    [
+                        self._to_available_room_response(room, host, room_users)
+                        for room, host, room_users in rooms_with_users
+                    ],
+                    {room.room_number: room.id for room, _, _ in rooms_with_users},
+                )
+        return snapshot
 
     async def get_available_rooms(self) -> list[AvailableRoomResponse]:
-        rooms_with_users = await self.room_repository.get_available_rooms_with_users()
-        result = []
+        snapshot = await self.get_lobby_snapshot()
+        return snapshot.rooms
+
+    @classmethod
+    def _to_available_room_response(
+        cls, room: Room, host: User, room_users: list[RoomUser]
+    ) -> AvailableRoomResponse:
+        return AvailableRoomResponse(
+            name=room.name,
+            room_number=room.room_number,
+            max_users=room.max_users,
+            current_users=len(room_users),
+            host_uid=host.uid,
+            host_nickname=host.nickname,
+            users=[cls._to_room_user_response(ru) for ru in room_users],
+        )
 
-        for room, _ in rooms_with_users:
-            room_users = await self.room_user_repository.filter_with_options(
-                room_id=room.id,
-                load_options=[selectinload(RoomUser.character)],
-            )
+    async def _open_room_index(self) -> OpenRoomIndex:
+        index = lobby_cache.open_room_index(settings.QUICK_MATCH_INDEX_MAX_AGE_SECONDS)
+        if index is not None:
+            quick_match_stats.index_reused += 1
+            return index
+
+        started = time.perf_counter()
+        snapshot = await self.get_lobby_snapshot()
+        quick_match_stats.snapshot_load.record(time.perf_counter() - started)
+        lobby_cache.open_rooms = snapshot.open_rooms
+        return snapshot.open_rooms
+
+    async def quick_match(self, user_id: UUID) -> RoomResponse:
+        """Seat the user in the fullest open room, or create one.
+
+        Candidates come from a shared index that this worker's quick matches
+        update in place; rooms that turn out to be full or gone are dropped
+        from it, and it is only rebuilt from the lobby once it is older than
+        QUICK_MATCH_INDEX_MAX_AGE_SECONDS.
+        """
+        index = await self._open_room_index()
+
+        placed = time.perf_counter()
+        try:
+            for attempt, room in enumerate(index.candidates()):
+                if attempt >= self.QUICK_MATCH_ATTEMPTS:
+                    break
+                if attempt:
+                    quick_match_stats.retries += 1
+                try:
+                    room_user = await self.join_room(user_id, room.room_id)
+                except MCRDomainError as e:
+                    if e.code not in self.QUICK_MATCH_STALE_ROOM_ERRORS:
+                        raise
+                    index.remove(room.room_number)
+                    continue
+                index.take_seat(room.room_number)
+                quick_match_stats.joined += 1
+                return RoomResponse(
+                    name=room.name,
+                    room_number=room.room_number,
+                    slot_index=room_user.slot_index,
+                )
 
-            host_user = await self.user_repository.filter_one_or_raise(id=room.host_id)
-
-            users = [
-                RoomUserResponse(
-                    nickname=ru.user_nickname,
-                    user_uid=ru.user_uid,
-                    is_ready=ru.is_ready,
-                    slot_index=ru.slot_index,
-                    current_character=CharacterResponse(
-                        code=ru.character.code,
-                        name=ru.character.name,
-                    ),
+            created_room = await self.create_room(user_id)
+            index.add(
+                OpenRoom(
+                    created_room.room_number,
+                    created_room.name,
+                    created_room.id,
+                    created_room.max_users - 1,
                 )
-                for ru in room_users
-            ]
-
-            room_data = AvailableRoomResponse(
-                name=room.name,
-                room_number=room.room_number,
-                max_users=room.max_users,
-                current_users=len(room_users),
-                host_uid=host_user.uid,
-                host_nickname=host_user.nickname,
-                users=users,
             )
-            result.append(room_data)
-
-        return result
+            quick_match_stats.created += 1
+            return RoomResponse(
+                name=created_room.name,
+                room_number=created_room.room_number,
+                slot_index=0,
+            )
+        finally:
+            quick_match_stats.placement.record(time.perf_counter() - placed)
 
     async def validate_room_user_connection(
         self, user_id: UUID, room_number: int
@@ -282,48 +402,44 @@ class RoomService:
 
     async def update_user_ready_status(
         self, user_id: UUID, room_id: UUID, is_ready: bool
-    ) -> RoomUser:
-        room_user = await self.room_user_repository.filter_one(user_id=user_id)
-        if not room_user or room_user.room_id != room_id:
-            raise MCRDomainError(
-                code=DomainErrorCode.USER_NOT_FOUND,
-                message="User not found in the specified room",
-                details={
-                    "user_id": str(user_id),
-                    "room_id": str(room_id),
-                },
-            )
+    ) -> SeatState:
+        """Set the flag in the room state store; the row is written behind.
+
+        Returns the in-memory seat rather than a refreshed RoomUser, which
+        would cost the read the store exists to avoid.
+        """
+        seat = await room_state_store.set_ready(
+            room_id, user_id, is_ready, self._load_room_state
+        )
+        self._lobby_changed()
+        return seat
 
-        room_user.is_ready = is_ready
-        updated_room_user = await self.room_user_repository.update(room_user)
-        await self.session.commit()
-        return updated_room_user
+    async def _load_room_state(self, room_id: UUID) -> RoomState:
+        room = await self.room_repository.filter_one_or_raise(id=room_id)
+        room_users = await self.room_user_repository.filter(room_id=room_id)
+        return RoomState(room.id, room.host_id, map(SeatState, room_users))
 
     async def get_room_users(self, room_id: UUID) -> RoomUsersResponse:
         room: Room = await self.room_repository.filter_one_or_raise(id=room_id)
-        room_users = await self.room_user_repository.filter_with_options(
-            room_id=room_id,
-            load_options=[selectinload(RoomUser.character)],
-        )
+        return await self.get_room_snapshot(room)
 
-        host_user = await self.user_repository.filter_one_or_raise(id=room.host_id)
-
-        users = [
-            RoomUserResponse(
-                nickname=ru.user_nickname,
-                user_uid=ru.user_uid,
-                is_ready=ru.is_ready,
-                slot_index=ru.slot_index,
-                current_character=(
-                    CharacterResponse(code=ru.character.code, name=ru.character.name)
-                ),
-            )
-            for ru in room_users
-        ]
+    async def get_room_snapshot(self, room: Room) -> RoomUsersResponse:
+        """Members of an already loaded room, with characters, in one query.
+
+        The host's uid is read from their own seat; the users table is only
+        queried if the host is somehow not seated.
+        """
+        room_users = await self.room_user_repository.list_seats(room.id)
+        host_uid = next(
+            (ru.user_uid for ru in room_users if ru.user_id == room.host_id), None
+        )
+        if host_uid is None:
+            host = await self.user_repository.filter_one_or_raise(id=room.host_id)
+            host_uid = host.uid
 
         return RoomUsersResponse(
-            host_uid=host_user.uid,
-            users=users,
+            host_uid=host_uid,
+            users=[self._to_room_user_response(ru) for ru in room_users],
         )
 
     # TODO should change when users come back to room scene after end game
@@ -345,8 +461,12 @@ class RoomService:
         await self.room_repository.delete(room.id)
 
         await self.session.commit()
+        room_state_store.discard(room_id)
+        room_number_allocator.release(room.room_number)
+        self._lobby_changed()
 
     async def start_game(self, room_id: UUID) -> Room:
+        await room_state_store.flush_room(self.session, room_id)
         room = await self.room_repository.filter_one_or_raise(id=room_id)
 
         if room.is_playing:
@@ -364,7 +484,8 @@ class RoomService:
                 details={"room_id": str(room_id), "current_players": len(room_users)},
             )
 
-        not_ready_users = [ru for ru in room_users if not ru.is_ready]
+        # Flags toggled on other workers may not have been written yet.
+        not_ready_users = [ru for ru in room_users if not room_state_store.is_ready(ru)]
         if not_ready_users:
             raise MCRDomainError(
                 code=DomainErrorCode.PLAYERS_NOT_READY,
@@ -409,6 +530,8 @@ class RoomService:
         room.game_id = game_id
         updated_room = await self.room_repository.update(room)
         await self.session.commit()
+        room_state_store.discard(room_id)
+        self._lobby_changed()
 
         await room_manager.broadcast_game_started(room_id, game_websocket_url)
         return updated_room
@@ -476,5 +599,21 @@ class RoomService:
         created.is_bot = True
         await self.room_user_repository.update(created)
         await self.session.commit()
+        room_state_store.invalidate(room_id)
+        self._lobby_changed()
 
         return created
+
+
+@asynccontextmanager
+async def room_service_scope() -> AsyncIterator[RoomService]:
+    async with async_session() as session:
+        yield RoomService(session=session, user_service=UserService(session))
+
+
+async def load_lobby_snapshot() -> LobbySnapshot:
+    snapshot = lobby_cache.get()
+    if snapshot is not None:
+        return snapshot
+    async with room_service_scope() as room_service:
+        return await room_service.get_lobby_snapshot()
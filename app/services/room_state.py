@@ -0,0 +1,311 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from contextlib import AbstractAsyncContextManager, AsyncExitStack
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.error import DomainErrorCode, MCRDomainError
+from app.core.metrics import DurationStats
+from app.core.room_connection_manager import RoomConnectionManager, room_manager
+from app.core.room_pubsub import RoomEvent, RoomEventKind
+from app.db.session import async_session
+from app.models.room_user import RoomUser
+from app.repositories.room_user_repository import RoomUserRepository
+
+logger = logging.getLogger(__name__)
+
+
+class SeatState:
+    __slots__ = ("is_bot", "is_ready", "room_user_id", "slot_index", "user_id")
+
+    def __init__(self, room_user: RoomUser) -> None:
+        self.room_user_id = room_user.id
+        self.user_id = room_user.user_id
+        self.slot_index = room_user.slot_index
+        self.is_ready = room_user.is_ready
+        self.is_bot = room_user.is_bot
+
+
+class RemoteFlag:
+    """A ready flag set on another worker and not yet known to be written."""
+
+    __slots__ = ("is_ready", "received", "room_user_id")
+
+    def __init__(self, room_user_id: UUID, is_ready: bool) -> None:
+        self.room_user_id = room_user_id
+        self.is_ready = is_ready
+        self.received = time.monotonic()
+
+
+class RoomState:
+    """A pre-game room as this worker last loaded it, plus unsaved ready flags.
+
+    ``lock`` serializes mutations; ``flush_lock`` keeps writes for the room in
+    order so an older snapshot can never be committed over a newer one.
+    """
+
+    def __init__(self, room_id: UUID, host_id: UUID, seats: Iterable[SeatState]):
+        self.room_id = room_id
+        self.host_id = host_id
+        self.seats = {seat.user_id: seat for seat in seats}
+        self.dirty: set[UUID] = set()
+        self.stale = False
+        self.lock = asyncio.Lock()
+        self.flush_lock = asyncio.Lock()
+
+    def pending(self) -> dict[UUID, bool]:
+        return {
+            self.seats[user_id].room_user_id: self.seats[user_id].is_ready
+            for user_id in self.dirty
+            if user_id in self.seats
+        }
+
+
+RoomStateLoader = Callable[[UUID], Awaitable[RoomState]]
+
+
+class RoomStateStore:
+    """Authoritative ready flags for the rooms this worker serves.
+
+    READY toggles are applied here and broadcast at once; the roomuser rows
+    are written behind in one batch every ``interval`` seconds, and
+    synchronously through ``flush_room`` before a game starts. Membership
+    changes still go straight to the database and only ``invalidate`` the
+    cached seats, which are reloaded on next use with unsaved flags kept.
+
+    Each toggle is also published to the other workers, which keep it in
+    ``remote`` until the owning worker has had ``remote_ttl`` seconds to
+    write it, so a readiness check anywhere sees flags still pending
+    elsewhere.
+    """
+
+    def __init__(
+        self,
+        connections: RoomConnectionManager = room_manager,
+        session_factory: Callable[
+            [], AbstractAsyncContextManager[AsyncSession]
+        ] = async_session,
+        interval: float = settings.ROOM_STATE_FLUSH_SECONDS,
+    ) -> None:
+        self.connections = connections
+        self.session_factory = session_factory
+        self.interval = interval
+        self.rooms: dict[UUID, RoomState] = {}
+        self.durations = DurationStats()
+        self.toggles = 0
+        self.rows_written = 0
+        self.loads = 0
+        self.remote: dict[UUID, dict[UUID, RemoteFlag]] = {}
+        # Two write-behind rounds: long enough for the owner to have flushed.
+        self.remote_ttl = 2 * interval
+        self._loading: dict[UUID, asyncio.Lock] = {}
+        connections.listen(RoomEventKind.READY_CHANGED, self.apply_remote)
+
+    async def load(
+        self, room_id: UUID, loader: RoomStateLoader, *, reload: bool = False
+    ) -> RoomState:
+        state = self.rooms.get(room_id)
+        if state is not None and not state.stale and not reload:
+            return state
+
+        lock = self._loading.setdefault(room_id, asyncio.Lock())
+        async with lock:
+            current = self.rooms.get(room_id)
+            if current is not None and current is not state and not current.stale:
+                return current
+            try:
+                fresh = await loader(room_id)
+            except MCRDomainError as e:
+                if e.code == DomainErrorCode.ROOM_NOT_FOUND:
+                    self.discard(room_id)
+                raise
+            finally:
+                self._loading.pop(room_id, None)
+            self.loads += 1
+            if current is not None:
+                fresh.flush_lock = current.flush_lock
+                async with current.lock:
+                    self._carry_over(current, fresh)
+            for user_id, flag in self.remote.get(room_id, {}).items():
+                seat = fresh.seats.get(user_id)
+                if seat is not None and seat.room_user_id == flag.room_user_id:
+                    seat.is_ready = flag.is_ready
+            self.rooms[room_id] = fresh
+            return fresh
+
+    @staticmethod
+    def _carry_over(old: RoomState, new: RoomState) -> None:
+        """Keep unsaved flags of seats that survived the reload.
+
+        A user who left and rejoined in between has a new roomuser row that
+        starts unready; the old seat's flag is dropped with the old row.
+        """
+        for user_id in old.dirty:
+            seat = new.seats.get(user_id)
+            previous = old.seats[user_id]
+            if seat is not None and seat.room_user_id == previous.room_user_id:
+                seat.is_ready = previous.is_ready
+                new.dirty.add(user_id)
+
+    async def set_ready(
+        self, room_id: UUID, user_id: UUID, is_ready: bool, loader: RoomStateLoader
+    ) -> SeatState:
+        state = await self.load(room_id, loader)
+        if user_id not in state.seats:
+            # Seated after this worker cached the room, perhaps via another worker.
+            state = await self.load(room_id, loader, reload=True)
+
+        async with state.lock:
+            seat = state.seats.get(user_id)
+            if seat is None:
+                raise MCRDomainError(
+                    code=DomainErrorCode.USER_NOT_FOUND,
+                    message="User not found in the specified room",
+                    details={"user_id": str(user_id), "room_id": str(room_id)},
+                )
+            self.toggles += 1
+            if seat.is_ready != is_ready:
+                seat.is_ready = is_ready
+                state.dirty.add(user_id)
+                self.remote.get(room_id, {}).pop(user_id, None)
+                self.connections.publish_event(
+                    RoomEvent(
+                        kind=RoomEventKind.READY_CHANGED,
+                        room_id=room_id,
+                        user_id=user_id,
+                        room_user_id=seat.room_user_id,
+                        is_ready=is_ready,
+                    )
+                )
+            return seat
+
+    def apply_remote(self, event: RoomEvent) -> None:
+        """Take a toggle made on another worker; that worker writes the row."""
+        if (
+            event.room_id is None
+            or event.user_id is None
+            or event.room_user_id is None
+            or event.is_ready is None
+        ):
+            return
+        self.remote.setdefault(event.room_id, {})[event.user_id] = RemoteFlag(
+            event.room_user_id, event.is_ready
+        )
+        state = self.rooms.get(event.room_id)
+        if state is None:
+            return
+        seat = state.seats.get(event.user_id)
+        if seat is not None and seat.room_user_id == event.room_user_id:
+            seat.is_ready = event.is_ready
+            state.dirty.discard(event.user_id)
+
+    def is_ready(self, room_user: RoomUser) -> bool:
+        """The seat's unsaved ready flag from any worker, else the row's."""
+        state = self.rooms.get(room_user.room_id)
+        if state is not None and room_user.user_id in state.dirty:
+            return state.seats[room_user.user_id].is_ready
+        flag = self.remote.get(room_user.room_id, {}).get(room_user.user_id)
+        if flag is not None and flag.room_user_id == room_user.id:
+            return flag.is_ready
+        return room_user.is_ready
+
+    def invalidate(self, room_id: UUID) -> None:
+        state = self.rooms.get(room_id)
+        if state is not None:
+            state.stale = True
+
+    def discard(self, room_id: UUID) -> None:
+        self.rooms.pop(room_id, None)
+        self.remote.pop(room_id, None)
+
+    async def flush_room(self, session: AsyncSession, room_id: UUID) -> int:
+        """Write and commit the room's unsaved flags before reading them back."""
+        state = self.rooms.get(room_id)
+        if state is None:
+            return 0
+        async with state.flush_lock:
+            return await self._write(session, [state])
+
+    async def flush(self) -> int:
+        """Write every room's unsaved flags in one batch and transaction."""
+        states = sorted(
+            (state for state in self.rooms.values() if state.dirty),
+            key=lambda state: state.room_id,
+        )
+        if not states:
+            self._evict_idle()
+            return 0
+
+        async with AsyncExitStack() as stack:
+            for state in states:
+                await stack.enter_async_context(state.flush_lock)
+            async with self.session_factory() as session:
+                written = await self._write(session, states)
+        if written:
+            self.connections.publish_lobby_changed()
+        self._evict_idle()
+        return written
+
+    async def _write(self, session: AsyncSession, states: list[RoomState]) -> int:
+        taken: list[tuple[RoomState, set[UUID]]] = []
+        flags: dict[UUID, bool] = {}
+        for state in states:
+            async with state.lock:
+                flags.update(state.pending())
+                taken.append((state, state.dirty))
+                state.dirty = set()
+        if not flags:
+            return 0
+
+        started = time.perf_counter()
+        try:
+            written = await RoomUserRepository(session).update_ready_flags(flags)
+            await session.commit()
+        except BaseException:
+            for state, user_ids in taken:
+                state.dirty |= user_ids
+            raise
+        self.durations.record(time.perf_counter() - started)
+        self.rows_written += written
+        return written
+
+    def _evict_idle(self) -> None:
+        for room_id, state in list(self.rooms.items()):
+            if not state.dirty and not self.connections.active_connections.get(room_id):
+                del self.rooms[room_id]
+
+        expired = time.monotonic() - self.remote_ttl
+        for room_id, flags in list(self.remote.items()):
+            for user_id, flag in list(flags.items()):
+                if flag.received < expired:
+                    del flags[user_id]
+            if not flags:
+                del self.remote[room_id]
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("room state flush failed")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "interval_seconds": self.interval,
+            "rooms": len(self.rooms),
+            "pending": sum(len(state.dirty) for state in self.rooms.values()),
+            "remote": sum(len(flags) for flags in self.remote.values()),
+            "toggles": self.toggles,
+            "rows_written": self.rows_written,
+            "loads": self.loads,
+            "flushes": self.durations.as_dict(),
+        }
+
+
+room_state_store = RoomStateStore()
@@ -0,0 +1,62 @@
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from typing import Any
+
+from app.core.config import settings
+from app.core.metrics import DurationStats
+from app.schemas.room import RoomCleanupResponse
+from app.services.room_service import RoomService, room_service_scope
+
+logger = logging.getLogger(__name__)
+
+
+class RoomSweeper:
+    def __init__(
+        self,
+        service_scope: Callable[
+            [], AbstractAsyncContextManager[RoomService]
+        ] = room_service_scope,
+        interval: float = settings.ROOM_CLEANUP_INTERVAL_SECONDS,
+        jitter: float = settings.ROOM_CLEANUP_JITTER_SECONDS,
+    ) -> None:
+        self.service_scope = service_scope
+        self.interval = interval
+        self.jitter = jitter
+        self.durations = DurationStats()
+        self.last_result: RoomCleanupResponse | None = None
+        self._lock = asyncio.Lock()
+
+    def next_delay(self) -> float:
+        return self.interval + random.uniform(0, self.jitter)
+
+    async def sweep(self) -> RoomCleanupResponse:
+        async with self._lock:
+            started = time.perf_counter()
+            async with self.service_scope() as room_service:
+                result = await room_service.cleanup_rooms()
+            self.durations.record(time.perf_counter() - started)
+            self.last_result = result
+        return result
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.next_delay())
+            try:
+                await self.sweep()
+            except Exception:
+                logger.exception("room cleanup sweep failed")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "interval_seconds": self.interval,
+            "jitter_seconds": self.jitter,
+            "durations": self.durations.as_dict(),
+            "last_result": self.last_result.model_dump() if self.last_result else None,
+        }
+
+
+room_sweeper = RoomSweeper()
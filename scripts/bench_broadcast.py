@@ -0,0 +1,100 @@
+"""Micro-benchmark: room broadcast serialization, legacy path vs encode-once.
+
+Legacy: jsonable_encoder twice (handler + broadcast), then ``send_json`` per
+socket, which json.dumps the same dict again for every recipient.
+Current: ``RoomConnectionManager.broadcast`` with the pydantic model, encoded
+once and queued as the same text frame for every socket's writer (the timing
+includes draining those queues).
+
+Sockets are real starlette WebSockets whose ASGI ``send`` is a no-op, so only
+serialization and fan-out overhead is measured.
+
+    poetry run python -m scripts.bench_broadcast
+"""
+
+import asyncio
+import time
+import uuid
+
+from fastapi import WebSocket
+from fastapi.encoders import jsonable_encoder
+from fastapi.websockets import WebSocketState
+
+from app.core.room_connection_manager import RoomConnectionManager
+from app.schemas.character import CharacterResponse
+from app.schemas.room import RoomUserResponse
+from app.schemas.ws import UserListData, WebSocketResponse, WSActionType
+
+
+async def _receive() -> dict:
+    return {"type": "websocket.disconnect"}
+
+
+async def _send(_message: dict) -> None:
+    return None
+
+
+def _websocket() -> WebSocket:
+    websocket = WebSocket({"type": "websocket"}, _receive, _send)
+    websocket.client_state = WebSocketState.CONNECTED
+    websocket.application_state = WebSocketState.CONNECTED
+    return websocket
+
+
+def _message() -> WebSocketResponse:
+    users = [
+        RoomUserResponse(
+            nickname=f"Player{slot}",
+            user_uid=f"{100000000 + slot}",
+            is_ready=slot % 2 == 0,
+            slot_index=slot,
+            current_character=CharacterResponse(code="c0", name="기본 캐릭터"),
+        )
+        for slot in range(4)
+    ]
+    return WebSocketResponse(
+        status="success",
+        action=WSActionType.USER_LIST,
+        data=UserListData(users=users).model_dump(),
+    )
+
+
+async def _legacy(sockets: list[WebSocket], message: WebSocketResponse) -> None:
+    json_message = jsonable_encoder(jsonable_encoder(message))
+    for websocket in sockets:
+        await websocket.send_json(json_message)
+
+
+async def _bench(name: str, subscribers: int, iterations: int) -> None:
+    manager = RoomConnectionManager()
+    room_id = uuid.uuid4()
+    sockets = [_websocket() for _ in range(subscribers)]
+    manager.active_connections[room_id] = {uuid.uuid4(): ws for ws in sockets}
+    message = _message()
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await _legacy(sockets, message)
+    legacy = (time.perf_counter() - started) / iterations
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await manager.broadcast(message, room_id)
+        await manager.drain(room_id)
+    current = (time.perf_counter() - started) / iterations
+    for queue in manager.outbound.values():
+        queue.close()
+
+    print(
+        f"{name:<22} legacy {legacy * 1e6:9.1f} us   "
+        f"queued {current * 1e6:9.1f} us   x{legacy / current:.2f}"
+    )
+
+
+async def main() -> None:
+    await _bench("4-player room", 4, 5000)
+    await _bench("1000-subscriber fanout", 1000, 50)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
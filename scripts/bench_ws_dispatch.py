@@ -0,0 +1,165 @@
+"""Micro-benchmark: room WebSocket message dispatch, legacy path vs lean path.
+
+Legacy: the previous ``handle_messages`` body -- json decode, a pydantic
+``WebSocketMessage`` per frame, the handler dict rebuilt per frame, pong as a
+``WebSocketResponse`` and errors through ``jsonable_encoder`` + ``send_json``.
+Current: ``RoomWebSocketHandler.dispatch``.
+
+Frames go through the real handler and ``room_manager`` queues with no-op
+sockets; ``ready`` uses a stub service so only dispatch cost is measured.
+The rate limiter is still consulted per frame, but with a budget no loop
+here can spend, so it never kicks the benchmark socket.
+Single process, single core.
+
+    poetry run python -m scripts.bench_ws_dispatch
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from fastapi import WebSocket
+from fastapi.encoders import jsonable_encoder
+from fastapi.websockets import WebSocketState
+from pydantic import ValidationError
+
+from app.api.v1.endpoints.ws_room import RoomWebSocketHandler
+from app.core.rate_limit import DEFAULT_ACTION, ActionRateLimiter
+from app.core.room_connection_manager import room_manager
+from app.schemas.ws import WebSocketMessage, WebSocketResponse, WSActionType
+
+FRAMES = {
+    "ping": '{"action": "ping"}',
+    "ready": '{"action": "ready", "data": {"is_ready": true}}',
+    "unknown action": '{"action": "dance"}',
+}
+
+
+async def _receive() -> dict:
+    return {"type": "websocket.disconnect"}
+
+
+async def _send(_message: dict) -> None:
+    return None
+
+
+def _websocket() -> WebSocket:
+    websocket = WebSocket({"type": "websocket"}, _receive, _send)
+    websocket.client_state = WebSocketState.CONNECTED
+    websocket.application_state = WebSocketState.CONNECTED
+    return websocket
+
+
+class LegacyHandler(RoomWebSocketHandler):
+    async def handle_ping(self, _: WebSocketMessage):
+        await room_manager.send_personal_message(
+            WebSocketResponse(
+                status="success",
+                action=WSActionType.PONG,
+                data={"message": "pong"},
+            ),
+            self.room_id,
+            self.user_id,
+        )
+
+    async def legacy_dispatch(self, text: str) -> None:
+        data = json.loads(text)
+        try:
+            message = WebSocketMessage(
+                action=data.get("action", ""), data=data.get("data")
+            )
+        except ValidationError as e:
+            await self.websocket.send_json(
+                jsonable_encoder(
+                    WebSocketResponse(
+                        status="error",
+                        action=WSActionType.ERROR,
+                        error=f"Invalid message format: {e!s}",
+                    )
+                )
+            )
+            return
+
+        message_handlers = {
+            WSActionType.PING: self.handle_ping,
+            WSActionType.PONG: self.handle_pong,
+            WSActionType.READY: self.handle_ready,
+            WSActionType.LEAVE: self.handle_leave,
+            WSActionType.ADD_BOT: self.handle_add_bot,
+        }
+
+        handler = message_handlers.get(message.action)
+        if handler and self.user_id and self.room_id and self.room_user:
+            await handler(message)
+        else:
+            await self.websocket.send_json(
+                jsonable_encoder(
+                    WebSocketResponse(
+                        status="error",
+                        action=WSActionType.ERROR,
+                        error=f"Unknown action: {message.action}",
+                    )
+                )
+            )
+
+
+def _register(room_id: uuid.UUID, user_id: uuid.UUID, websocket: WebSocket) -> None:
+    room_manager.active_connections.setdefault(room_id, {})[user_id] = websocket
+    room_manager.user_rooms[user_id] = room_id
+    room_manager._queue(room_id, user_id, websocket)
+
+
+class StubRoomService:
+    async def update_user_ready_status(self, _user_id, _room_id, is_ready):
+        return SimpleNamespace(is_ready=is_ready)
+
+
+@asynccontextmanager
+async def _stub_scope() -> AsyncIterator[StubRoomService]:
+    yield StubRoomService()
+
+
+async def _handler() -> LegacyHandler:
+    room_id = uuid.uuid4()
+    for _ in range(3):
+        _register(room_id, uuid.uuid4(), _websocket())
+    handler = LegacyHandler(_websocket(), 1, _stub_scope)
+    handler.rate_limiter = ActionRateLimiter({DEFAULT_ACTION: (1e9, 10**9)})
+    handler.room_id, handler.user_id = room_id, uuid.uuid4()
+    handler.room_user = SimpleNamespace()
+    handler.user = SimpleNamespace(uid="123456789")
+    _register(room_id, handler.user_id, handler.websocket)
+    return handler
+
+
+async def _rate(dispatch, frame: str, handler: LegacyHandler, n: int) -> float:
+    started = time.perf_counter()
+    for i in range(n):
+        await dispatch(frame)
+        if i % 32 == 0:
+            await room_manager.drain(handler.room_id)
+    await room_manager.drain(handler.room_id)
+    return n / (time.perf_counter() - started)
+
+
+async def main() -> None:
+    handler = await _handler()
+    n = 20000
+    async with handler.session():
+        for name, frame in FRAMES.items():
+            legacy = await _rate(handler.legacy_dispatch, frame, handler, n)
+            current = await _rate(handler.dispatch, frame, handler, n)
+            print(
+                f"{name:<15} legacy {legacy:10,.0f} msg/s   "
+                f"lean {current:10,.0f} msg/s   x{current / legacy:.2f}"
+            )
+    for queue in room_manager.outbound.values():
+        queue.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+"""Micro-benchmark: room frames as JSON text vs MessagePack with short keys.
+
+Payloads are built the way the server builds them: a full four-seat
+``user_list`` (as sent after a leave), a ``user_joined`` and a
+``user_ready_changed``. For each frame it reports bytes on the wire and
+encode time per frame:
+
+- json: ``WebSocketResponse.model_dump_json()``, the text every socket gets.
+- msgpack: ``msgpack_frame`` re-encoding that JSON, which is what msgpack
+  sockets cost the server (uncached here; a room broadcast pays it once).
+- msgpack direct: packing the response dict without the JSON step.
+
+    poetry run python -m scripts.bench_ws_encoding
+"""
+
+import time
+from collections.abc import Callable
+
+from app.core.ws_codec import msgpack_frame, pack
+from app.schemas.character import CharacterResponse
+from app.schemas.room import RoomUserResponse
+from app.schemas.ws import (
+    UserJoinedData,
+    UserListData,
+    UserReadyData,
+    WebSocketResponse,
+    WSActionType,
+)
+
+NICKNAMES = ["청룡", "MahjongKing", "백호의후예", "bot-7f3a"]
+
+
+def _users() -> list[RoomUserResponse]:
+    return [
+        RoomUserResponse(
+            nickname=nickname,
+            user_uid=f"{123456789 + slot * 1111}",
+            is_ready=slot % 2 == 0,
+            slot_index=slot,
+            current_character=CharacterResponse(code="c_default", name="기본 캐릭터"),
+        )
+        for slot, nickname in enumerate(NICKNAMES)
+    ]
+
+
+def _frames() -> dict[str, WebSocketResponse]:
+    users = _users()
+    return {
+        "user_list": WebSocketResponse(
+            status="success",
+            action=WSActionType.USER_LIST,
+            data=UserListData(users=users).model_dump(),
+        ),
+        "user_joined": WebSocketResponse(
+            status="success",
+            action=WSActionType.USER_JOINED,
+            data=UserJoinedData(
+                user_uid=users[1].user_uid,
+                nickname=users[1].nickname,
+                slot_index=1,
+                current_character=users[1].current_character,
+            ).model_dump(),
+        ),
+        "user_ready_changed": WebSocketResponse(
+            status="success",
+            action=WSActionType.USER_READY_CHANGED,
+            data=UserReadyData(user_uid=users[0].user_uid, is_ready=True).model_dump(),
+        ),
+    }
+
+
+def _per_frame_us(encode: Callable[[], object], n: int) -> float:
+    started = time.perf_counter()
+    for _ in range(n):
+        encode()
+    return (time.perf_counter() - started) / n * 1e6
+
+
+def main() -> None:
+    n = 20000
+    reencode = msgpack_frame.__wrapped__
+    print(f"{'frame':<20}{'encoding':<16}{'bytes':>7}{'us/frame':>10}")
+    for name, response in _frames().items():
+        text = response.model_dump_json()
+        message = response.model_dump()
+        rows = [
+            ("json", len(text.encode()), _per_frame_us(response.model_dump_json, n)),
+            ("msgpack", len(reencode(text)), _per_frame_us(lambda: reencode(text), n)),
+            (
+                "msgpack direct",
+                len(pack(message)),
+                _per_frame_us(lambda: pack(message), n),
+            ),
+        ]
+        for encoding, size, micros in rows:
+            print(f"{name:<20}{encoding:<16}{size:>7}{micros:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,12 @@ import pytest
 from fastapi import status
 
 from app.core.error import DomainErrorCode, MCRDomainError
+from app.core.lobby_cache import LobbySnapshot
 from app.dependencies.repositories import get_room_by_number
 from app.main import app
 from app.models.room import Room
 from app.models.room_user import RoomUser
+from app.schemas.character import CharacterResponse
 from app.schemas.room import AvailableRoomResponse, RoomUserResponse
 
 
@@ -171,6 +173,7 @@ async def test_join_room_user_already_in_room(login_client, mock_user):
 @pytest.mark.asyncio
 async def test_get_available_rooms_success(login_client, mock_user):
     client, mocks = login_client
+    character = CharacterResponse(code="c0", name="기본 캐릭터")
     mock_response = [
         AvailableRoomResponse(
             name="Test Room 1",
@@ -185,12 +188,14 @@ async def test_get_available_rooms_success(login_client, mock_user):
                     nickname="HostUser",
                     is_ready=True,
                     slot_index=0,
+                    current_character=character,
                 ),
                 RoomUserResponse(
                     user_uid="GuestUserUid",
                     nickname="GuestUser",
                     is_ready=False,
                     slot_index=1,
+                    current_character=character,
                 ),
             ],
         ),
@@ -207,11 +212,15 @@ async def test_get_available_rooms_success(login_client, mock_user):
                     nickname="AnotherHost",
                     is_ready=False,
                     slot_index=0,
+                    current_character=character,
                 )
             ],
         ),
     ]
-    mocks["services"]["room_service"].get_available_rooms.return_value = mock_response
+    room_service = mocks["services"]["room_service"]
+    room_service.get_lobby_snapshot.return_value = LobbySnapshot(
+        epoch="abcd1234", version=1, rooms=mock_response
+    )
     response = await client.get("/api/v1/room")
     assert response.status_code == status.HTTP_200_OK
     data = response.json()
@@ -228,8 +237,9 @@ async def test_get_available_rooms_success(login_client, mock_user):
     assert data[1]["current_users"] == 1
     assert data[1]["host_nickname"] == "AnotherHost"
     assert len(data[1]["users"]) == 1
-    mocks["services"]["room_service"].cleanup_rooms.assert_called_once()
-    mocks["services"]["room_service"].get_available_rooms.assert_called_once()
+    room_service.get_lobby_snapshot.assert_awaited_once()
+    room_service.get_available_rooms.assert_not_called()
+    room_service.cleanup_rooms.assert_not_called()
 
 
 @pytest.mark.asyncio
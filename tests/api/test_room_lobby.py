@@ -0,0 +1,136 @@
+import uuid
+
+import pytest
+from fastapi import status
+
+from app.core.lobby_cache import LobbySnapshot
+from app.models.room_user import RoomUser
+from app.schemas.room import AvailableRoomResponse, RoomResponse
+
+
+@pytest.fixture
+def lobby_snapshot():
+    return LobbySnapshot(
+        epoch="abcd1234",
+        version=7,
+        rooms=[
+            AvailableRoomResponse(
+                name="Test Room 1",
+                room_number=123,
+                max_users=4,
+                current_users=0,
+                host_uid="HostUserUid",
+                host_nickname="HostUser",
+                users=[],
+            ),
+        ],
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_available_rooms_returns_snapshot(login_client, lobby_snapshot):
+    client, mocks = login_client
+    room_service = mocks["services"]["room_service"]
+    room_service.get_lobby_snapshot.return_value = lobby_snapshot
+
+    response = await client.get("/api/v1/room")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["X-Lobby-Version"] == "7"
+    assert response.headers["ETag"] == '"abcd1234-7"'
+    data = response.json()
+    assert len(data) == 1
+    assert data[0]["room_number"] == 123
+    assert data[0]["host_nickname"] == "HostUser"
+    room_service.cleanup_rooms.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_available_rooms_not_modified(login_client, lobby_snapshot):
+    client, mocks = login_client
+    room_service = mocks["services"]["room_service"]
+    room_service.get_lobby_snapshot.return_value = lobby_snapshot
+
+    response = await client.get(
+        "/api/v1/room", headers={"If-None-Match": lobby_snapshot.etag}
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["X-Lobby-Version"] == "7"
+
+
+@pytest.mark.asyncio
+async def test_get_available_rooms_paginated(login_client):
+    client, mocks = login_client
+    room_service = mocks["services"]["room_service"]
+    room_service.get_lobby_snapshot.return_value = LobbySnapshot(
+        epoch="abcd1234",
+        version=3,
+        rooms=[
+            AvailableRoomResponse(
+                name=f"Room {room_number}",
+                room_number=room_number,
+                max_users=4,
+                current_users=4 if room_number == 2 else 1,
+                host_uid="HostUserUid",
+                host_nickname="HostUser",
+                users=[],
+            )
+            for room_number in range(1, 6)
+        ],
+    )
+
+    response = await client.get(
+        "/api/v1/room", params={"limit": 2, "cursor": 1, "exclude_full": True}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [room["room_number"] for room in response.json()] == [3, 4]
+    assert response.headers["X-Next-Cursor"] == "4"
+    page_etag = response.headers["ETag"]
+    assert page_etag.startswith('"abcd1234-3-')
+
+    response = await client.get(
+        "/api/v1/room",
+        params={"limit": 2, "cursor": 4, "exclude_full": True},
+        headers={"If-None-Match": page_etag},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [room["room_number"] for room in response.json()] == [5]
+    assert response.headers["ETag"] != page_etag
+
+    response = await client.get(
+        "/api/v1/room",
+        params={"exclude_full": True, "cursor": 1, "limit": 2},
+        headers={"If-None-Match": page_etag},
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    response = await client.get("/api/v1/room", params={"limit": 0})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_quick_match_leaves_current_room_first(login_client):
+    client, mocks = login_client
+    room_service = mocks["services"]["room_service"]
+    current_room_id = uuid.uuid4()
+    room_service.room_user_repository.filter_one.return_value = RoomUser(
+        room_id=current_room_id, user_id=uuid.uuid4()
+    )
+    room_service.quick_match.return_value = RoomResponse(
+        name="Test Room 1", room_number=123, slot_index=2
+    )
+
+    response = await client.post("/api/v1/room/quick-match")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "name": "Test Room 1",
+        "room_number": 123,
+        "slot_index": 2,
+    }
+    room_service.leave_room.assert_awaited_once()
+    assert room_service.leave_room.await_args.kwargs["room_id"] == current_room_id
+    room_service.quick_match.assert_awaited_once()
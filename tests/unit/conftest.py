@@ -2,12 +2,13 @@ import uuid
 
 import pytest
 import pytest_asyncio
-from sqlalchemy import text
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import NullPool
 from sqlmodel import SQLModel
 
 from app.core.config import get_test_settings
+from app.models.character import Character
 from app.models.room import Room
 from app.models.room_user import RoomUser
 from app.models.user import User
@@ -60,6 +61,39 @@ async def test_db_session(test_engine) -> AsyncSession:
             await session.close()
 
 
+@pytest_asyncio.fixture
+async def test_character(test_db_session) -> Character:
+    character = Character(code=Character.DEFAULT_CHARACTER_CODE, name="기본 캐릭터")
+    test_db_session.add(character)
+    await test_db_session.commit()
+    await test_db_session.refresh(character)
+    return character
+
+
+@pytest.fixture
+def statement_counter(test_db_session):
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sync_engine = test_db_session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _count)
+    yield statements
+    event.remove(sync_engine, "before_cursor_execute", _count)
+
+
+@pytest_asyncio.fixture
+async def session_factory(test_db_session):
+    engine = create_async_engine(
+        get_test_settings().database_uri,
+        pool_size=20,
+        max_overflow=0,
+    )
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
 @pytest_asyncio.fixture
 async def test_user(test_db_session) -> User:
     user = User(
@@ -0,0 +1,187 @@
+import uuid
+
+import pytest
+
+from app.core.lobby_cache import LobbyCache, LobbySnapshot, lobby_cache
+from app.models.character import Character
+from app.models.room import Room
+from app.models.room_user import RoomUser
+from app.models.user import User
+from app.schemas.room import AvailableRoomResponse
+from app.services.room_service import RoomService
+from app.services.room_state import room_state_store
+
+
+@pytest.fixture
+def room_response():
+    return AvailableRoomResponse(
+        name="테스트 방",
+        room_number=1,
+        max_users=4,
+        current_users=0,
+        host_uid="123456789",
+        host_nickname="HostUser",
+        users=[],
+    )
+
+
+@pytest.fixture
+def room_service(mocker):
+    lobby_cache.invalidate()
+    service = RoomService(
+        session=mocker.AsyncMock(),
+        user_service=mocker.AsyncMock(),
+        room_repository=mocker.AsyncMock(),
+        room_user_repository=mocker.AsyncMock(),
+        user_repository=mocker.AsyncMock(),
+    )
+    yield service
+    lobby_cache.invalidate()
+
+
+def test_store_and_invalidate(room_response):
+    cache = LobbyCache()
+    assert cache.get() is None
+
+    snapshot = cache.store(cache.version, [room_response])
+    assert cache.get() is snapshot
+    assert snapshot.etag == f'"{cache.epoch}-0"'
+    assert b'"room_number":1' in snapshot.payload
+
+    cache.invalidate()
+    assert cache.get() is None
+    assert cache.version == 1
+
+
+def test_stale_snapshot_is_not_stored(room_response):
+    cache = LobbyCache()
+    version = cache.version
+    cache.invalidate()
+
+    snapshot = cache.store(version, [room_response])
+
+    assert snapshot.rooms == [room_response]
+    assert cache.get() is None
+
+
+@pytest.mark.asyncio
+async def test_lobby_snapshot_is_served_from_memory(room_service):
+    host = User(id=uuid.uuid4(), uid="123456789", nickname="HostUser")
+    room = Room(
+        id=uuid.uuid4(),
+        name="테스트 방",
+        room_number=1,
+        max_users=4,
+        is_playing=False,
+        host_id=host.id,
+    )
+    room_user = RoomUser(
+        room_id=room.id,
+        user_id=host.id,
+        user_uid=host.uid,
+        user_nickname=host.nickname,
+        character=Character(code="c0", name="기본 캐릭터"),
+    )
+    repository = room_service.room_repository
+    repository.get_available_rooms_with_users.return_value = [(room, host, [room_user])]
+
+    first = await room_service.get_lobby_snapshot()
+    second = await room_service.get_lobby_snapshot()
+
+    assert first is second
+    assert first.rooms[0].host_uid == host.uid
+    assert first.rooms[0].current_users == 1
+    repository.get_available_rooms_with_users.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_ready_change_invalidates_lobby_snapshot(room_service, room_id):
+    repository = room_service.room_repository
+    repository.get_available_rooms_with_users.return_value = []
+    first = await room_service.get_lobby_snapshot()
+
+    room_user = RoomUser(room_id=room_id, user_id=uuid.uuid4())
+    room_service.room_repository.filter_one_or_raise.return_value = Room(
+        id=room_id, name="Room", room_number=1, host_id=room_user.user_id
+    )
+    room_service.room_user_repository.filter.return_value = [room_user]
+    await room_service.update_user_ready_status(room_user.user_id, room_id, True)
+    room_state_store.discard(room_id)
+
+    second = await room_service.get_lobby_snapshot()
+
+    assert second.version == first.version + 1
+    assert repository.get_available_rooms_with_users.await_count == 2
+
+
+def _lobby_snapshot(occupancy: dict[int, int]) -> LobbySnapshot:
+    return LobbySnapshot(
+        epoch="test",
+        version=0,
+        rooms=[
+            AvailableRoomResponse(
+                name=f"Room {room_number}",
+                room_number=room_number,
+                max_users=4,
+                current_users=current_users,
+                host_uid="123456789",
+                host_nickname="HostUser",
+                users=[],
+            )
+            for room_number, current_users in sorted(occupancy.items())
+        ],
+        room_ids={room_number: uuid.uuid4() for room_number in occupancy},
+    )
+
+
+def test_page_is_keyed_on_room_number():
+    snapshot = _lobby_snapshot({1: 1, 2: 4, 5: 2, 8: 3, 9: 1})
+
+    first, cursor = snapshot.page(limit=2)
+    second, cursor_2 = snapshot.page(cursor=cursor, limit=2)
+    last, cursor_3 = snapshot.page(cursor=cursor_2, limit=2)
+
+    assert [r.room_number for r in first] == [1, 2]
+    assert [r.room_number for r in second] == [5, 8]
+    assert [r.room_number for r in last] == [9]
+    assert (cursor, cursor_2, cursor_3) == (2, 8, None)
+
+
+def test_page_cursor_between_room_numbers():
+    snapshot = _lobby_snapshot({1: 1, 5: 2, 9: 1})
+
+    rooms, cursor = snapshot.page(cursor=3, limit=5)
+
+    assert [r.room_number for r in rooms] == [5, 9]
+    assert cursor is None
+
+
+def test_page_filters_on_free_slots():
+    snapshot = _lobby_snapshot({1: 4, 2: 1, 3: 4, 4: 3})
+
+    open_rooms, _ = snapshot.page(has_free_slot=True)
+    also_open, _ = snapshot.page(exclude_full=True, cursor=2)
+    full_rooms, cursor = snapshot.page(has_free_slot=False, limit=1)
+
+    assert [r.room_number for r in open_rooms] == [2, 4]
+    assert [r.room_number for r in also_open] == [4]
+    assert [r.room_number for r in full_rooms] == [1]
+    assert cursor == 1
+
+
+def test_open_rooms_are_offered_fullest_first():
+    snapshot = _lobby_snapshot({1: 1, 2: 4, 3: 3, 4: 2, 5: 3})
+
+    candidates = [r.room_number for r in snapshot.open_rooms.candidates()]
+
+    assert candidates == [3, 5, 4, 1]
+
+
+def test_open_room_index_tracks_placements():
+    index = _lobby_snapshot({1: 1, 2: 3, 3: 2}).open_rooms
+
+    index.take_seat(3)
+    index.take_seat(2)
+    index.remove(1)
+
+    assert [(r.room_number, r.free_slots) for r in index.candidates()] == [(3, 1)]
@@ -0,0 +1,177 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import WebSocket
+
+from app.core.lobby_cache import LobbySnapshot
+from app.core.lobby_connection_manager import LobbyConnectionManager
+from app.schemas.room import AvailableRoomResponse
+
+
+def _room(room_number: int, current_users: int = 1) -> AvailableRoomResponse:
+    return AvailableRoomResponse(
+        name=f"Room {room_number}",
+        room_number=room_number,
+        max_users=4,
+        current_users=current_users,
+        host_uid="123456789",
+        host_nickname="HostUser",
+        users=[],
+    )
+
+
+def _frames(websocket) -> list[dict]:
+    return [json.loads(call.args[0]) for call in websocket.send_text.await_args_list]
+
+
+@pytest.fixture
+def lobby():
+    snapshots = [LobbySnapshot("test", 0, [_room(1), _room(2)])]
+    manager = LobbyConnectionManager(window=0)
+    manager.snapshot_loader = AsyncMock(side_effect=lambda: snapshots[-1])
+    return manager, snapshots
+
+
+@pytest.mark.asyncio
+async def test_connect_sends_full_snapshot(lobby):
+    manager, _ = lobby
+    websocket = AsyncMock(spec=WebSocket)
+
+    await manager.connect(websocket)
+
+    websocket.accept.assert_awaited_once()
+    (frame,) = _frames(websocket)
+    assert frame["action"] == "lobby_snapshot"
+    assert [room["room_number"] for room in frame["data"]["rooms"]] == [1, 2]
+    assert websocket in manager.connections
+
+
+@pytest.mark.asyncio
+async def test_flush_sends_deltas(lobby):
+    manager, snapshots = lobby
+    websocket = AsyncMock(spec=WebSocket)
+    await manager.connect(websocket)
+    websocket.send_text.reset_mock()
+
+    snapshots.append(LobbySnapshot("test", 1, [_room(2, current_users=2), _room(3)]))
+    await manager.flush()
+
+    frames = _frames(websocket)
+    assert [(f["action"], f["data"]["version"]) for f in frames] == [
+        ("room_updated", 1),
+        ("room_created", 1),
+        ("room_removed", 1),
+    ]
+    assert frames[0]["data"]["room"]["current_users"] == 2
+    assert frames[1]["data"]["room"]["room_number"] == 3
+    assert frames[2]["data"]["room_number"] == 1
+
+
+@pytest.mark.asyncio
+async def test_notify_coalesces_bursts(lobby):
+    manager, snapshots = lobby
+    websocket = AsyncMock(spec=WebSocket)
+    await manager.connect(websocket)
+    websocket.send_text.reset_mock()
+    manager.snapshot_loader.reset_mock()
+
+    for current_users in (2, 3, 2):
+        snapshots.append(
+            LobbySnapshot("test", len(snapshots), [_room(1, current_users), _room(2)])
+        )
+        manager.notify()
+    await manager._flush_task
+
+    manager.snapshot_loader.assert_awaited_once()
+    (frame,) = _frames(websocket)
+    assert frame["action"] == "room_updated"
+    assert frame["data"]["room"]["current_users"] == 2
+
+
+@pytest.mark.asyncio
+async def test_notify_without_subscribers_is_noop(lobby):
+    manager, _ = lobby
+
+    manager.notify()
+
+    assert manager._flush_task is None
+    manager.snapshot_loader.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_failed_send_drops_subscriber(lobby):
+    manager, snapshots = lobby
+    healthy = AsyncMock(spec=WebSocket)
+    broken = AsyncMock(spec=WebSocket)
+    await manager.connect(healthy)
+    await manager.connect(broken)
+    broken.send_text.side_effect = RuntimeError("closed")
+
+    snapshots.append(LobbySnapshot("test", 1, [_room(1)]))
+    await manager.flush()
+
+    assert manager.connections == {healthy}
+    assert _frames(healthy)[-1]["action"] == "room_removed"
+
+
+@pytest.mark.asyncio
+async def test_flush_during_connect_still_reaches_new_subscriber(lobby):
+    manager, snapshots = lobby
+    gate = asyncio.Event()
+    loads = 0
+
+    async def load():
+        nonlocal loads
+        snapshot = snapshots[-1]
+        loads += 1
+        if loads == 2:
+            await gate.wait()
+        return snapshot
+
+    manager.snapshot_loader = load
+    first = AsyncMock(spec=WebSocket)
+    await manager.connect(first)
+    second = AsyncMock(spec=WebSocket)
+    connecting = asyncio.create_task(manager.connect(second))
+    await asyncio.sleep(0)
+
+    snapshots.append(LobbySnapshot("test", 1, [_room(2, current_users=2)]))
+    flushing = asyncio.create_task(manager.flush())
+    await asyncio.sleep(0)
+    gate.set()
+    await asyncio.gather(connecting, flushing)
+
+    snapshot, *deltas = _frames(second)
+    assert snapshot["action"] == "lobby_snapshot"
+    assert snapshot["data"]["version"] == 0
+    assert [(f["action"], f["data"]["version"]) for f in deltas] == [
+        ("room_updated", 1),
+        ("room_removed", 1),
+    ]
+    assert _frames(first)[-2:] == deltas
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_does_not_hold_up_flushes(lobby):
+    manager, snapshots = lobby
+    first = AsyncMock(spec=WebSocket)
+    await manager.connect(first)
+    gate = asyncio.Event()
+
+    async def send_text(_message: str) -> None:
+        await gate.wait()
+
+    slow = AsyncMock(spec=WebSocket)
+    slow.send_text.side_effect = send_text
+    connecting = asyncio.create_task(manager.connect(slow))
+    await asyncio.sleep(0)
+
+    snapshots.append(LobbySnapshot("test", 1, [_room(1), _room(2, current_users=3)]))
+    await asyncio.wait_for(manager.flush(), timeout=1)
+
+    assert [f["action"] for f in _frames(first)] == ["lobby_snapshot", "room_updated"]
+    gate.set()
+    await connecting
+    assert [f["action"] for f in _frames(slow)] == ["lobby_snapshot", "room_updated"]
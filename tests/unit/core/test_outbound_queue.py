@@ -0,0 +1,119 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import WebSocket
+
+from app.core.outbound_queue import OutboundQueue, OverflowPolicy
+
+
+async def _blocked_queue(policy: OverflowPolicy, maxsize: int = 3) -> OutboundQueue:
+    websocket = AsyncMock(spec=WebSocket)
+    release = asyncio.Event()
+
+    async def _send(_frame):
+        await release.wait()
+
+    websocket.send_text.side_effect = _send
+    queue = OutboundQueue(
+        websocket,
+        maxsize=maxsize,
+        policy=policy,
+        send_timeout=10,
+        on_failure=lambda *_: None,
+    )
+    queue.put("in-flight", "ping")
+    await asyncio.sleep(0)
+    queue.release = release
+    return queue
+
+
+def _queued(queue: OutboundQueue) -> list[str]:
+    return [frame for _, frame in queue._frames]
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_skips_undroppable_frames():
+    queue = await _blocked_queue(OverflowPolicy.DROP_OLDEST)
+    queue.put("list-1", "user_list")
+    queue.put("ready-1", "user_ready_changed")
+    queue.put("ready-2", "user_ready_changed")
+
+    assert queue.put("ready-3", "user_ready_changed")
+
+    assert _queued(queue) == ["list-1", "ready-2", "ready-3"]
+    assert queue.stats.dropped == 1
+    queue.close()
+
+
+@pytest.mark.asyncio
+async def test_coalesce_replaces_queued_user_list():
+    queue = await _blocked_queue(OverflowPolicy.COALESCE)
+    queue.put("list-1", "user_list")
+    queue.put("ready-1", "user_ready_changed")
+    queue.put("joined-1", "user_joined")
+
+    assert queue.put("list-2", "user_list")
+
+    assert _queued(queue) == ["ready-1", "joined-1", "list-2"]
+    assert queue.stats.coalesced == 1
+    assert queue.stats.dropped == 0
+    queue.close()
+
+
+@pytest.mark.asyncio
+async def test_full_of_undroppable_frames_rejects():
+    queue = await _blocked_queue(OverflowPolicy.DROP_OLDEST, maxsize=2)
+    queue.put("list-1", "user_list")
+    queue.put("started", "game_started")
+
+    assert not queue.put("ready-1", "user_ready_changed")
+    queue.close()
+
+
+@pytest.mark.asyncio
+async def test_writer_drains_in_order():
+    queue = await _blocked_queue(OverflowPolicy.DROP_OLDEST)
+    queue.put("a", "ping")
+    queue.put("b", "ping")
+
+    queue.release.set()
+    await queue.drain()
+
+    sent = [call.args[0] for call in queue.websocket.send_text.await_args_list]
+    assert sent == ["in-flight", "a", "b"]
+    assert queue.stats.sent == 3
+    queue.close()
+
+
+@pytest.mark.asyncio
+async def test_watchdog_times_out_a_hung_send_after_a_busy_period():
+    websocket = AsyncMock(spec=WebSocket)
+    hang = asyncio.Event()
+
+    async def _send(frame):
+        if frame == "hang":
+            await hang.wait()
+
+    websocket.send_text.side_effect = _send
+    failures = []
+    queue = OutboundQueue(
+        websocket,
+        maxsize=64,
+        policy=OverflowPolicy.DROP_OLDEST,
+        send_timeout=0.05,
+        on_failure=lambda _, error: failures.append(error),
+    )
+    for _ in range(3):
+        for _ in range(10):
+            queue.put("fast", "ping")
+        await queue.drain()
+        await asyncio.sleep(0.03)
+    assert failures == []
+    assert queue.stats.sent == 30
+
+    queue.put("hang", "ping")
+    await asyncio.sleep(0.12)
+
+    assert queue.closed
+    assert [type(error) for error in failures] == [TimeoutError]
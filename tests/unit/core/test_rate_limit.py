@@ -0,0 +1,32 @@
+from app.core.rate_limit import ActionRateLimiter, TokenBucket
+
+
+def test_bucket_spends_burst_then_refills_at_rate():
+    bucket = TokenBucket(rate=2.0, capacity=3)
+    now = bucket.updated
+
+    assert [bucket.take(now) for _ in range(4)] == [True, True, True, False]
+    assert not bucket.take(now + 0.25)
+    assert bucket.take(now + 0.5)
+    assert [bucket.take(now + 60) for _ in range(4)] == [True, True, True, False]
+
+
+def test_limiter_budgets_each_action_separately():
+    limiter = ActionRateLimiter({"ready": (0.001, 2), "*": (0.001, 1)}, strikes=5)
+
+    assert [limiter.allow("ready") for _ in range(3)] == [True, True, False]
+    assert limiter.allow("ping")
+    assert not limiter.allow("dance")
+    assert limiter.rejected == 2
+    assert not limiter.exhausted
+
+
+def test_repeat_offenders_exhaust_their_strikes():
+    limiter = ActionRateLimiter({"*": (0.001, 1)}, strikes=3, strike_window=60)
+    limiter.allow("ready")
+
+    for _ in range(2):
+        assert not limiter.allow("ready")
+        assert not limiter.exhausted
+    assert not limiter.allow("ready")
+    assert limiter.exhausted
@@ -0,0 +1,167 @@
+import asyncio
+import json
+import time
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import WebSocket, status
+
+from app.core.room_connection_manager import RoomConnectionManager
+from app.schemas.ws import WebSocketResponse, WSActionType
+
+SEND_TIMEOUT = 0.05
+
+
+def _websocket(send_text=None) -> AsyncMock:
+    websocket = AsyncMock(spec=WebSocket)
+    if send_text is not None:
+        websocket.send_text.side_effect = send_text
+    return websocket
+
+
+async def _hang(_frame):
+    await asyncio.sleep(10)
+
+
+async def _fail(_frame):
+    raise RuntimeError("connection reset")
+
+
+@pytest.fixture
+async def room():
+    manager = RoomConnectionManager(send_timeout=SEND_TIMEOUT)
+    room_id = uuid.uuid4()
+    sockets = {
+        "fast": _websocket(),
+        "slow": _websocket(_hang),
+        "broken": _websocket(_fail),
+    }
+    user_ids = {name: uuid.uuid4() for name in sockets}
+    for name, websocket in sockets.items():
+        await manager.connect(websocket, room_id, user_ids[name])
+    yield manager, room_id, sockets, user_ids
+    for queue in list(manager.outbound.values()):
+        queue.close()
+
+
+@pytest.mark.asyncio
+async def test_broadcast_does_not_wait_for_slow_sockets(room):
+    manager, room_id, sockets, user_ids = room
+
+    started = time.perf_counter()
+    report = await manager.broadcast({"action": "ping"}, room_id)
+
+    assert time.perf_counter() - started < SEND_TIMEOUT
+    assert set(report.queued) == set(user_ids.values())
+    assert report.rejected == []
+
+    await asyncio.sleep(SEND_TIMEOUT * 2)
+
+    assert manager.get_room_users(room_id) == {user_ids["fast"]}
+    assert manager.get_connected_user_ids() == {user_ids["fast"]}
+    assert set(manager.outbound) == {user_ids["fast"]}
+    assert manager.stats()["sends_timed_out"] == 1
+    assert manager.stats()["sends_failed"] == 1
+    sockets["slow"].close.assert_awaited_once_with(code=status.WS_1011_INTERNAL_ERROR)
+
+
+@pytest.mark.asyncio
+async def test_broadcast_encodes_once(room):
+    manager, room_id, sockets, user_ids = room
+    second = _websocket()
+    await manager.connect(second, room_id, uuid.uuid4())
+    message = WebSocketResponse(
+        status="success",
+        action=WSActionType.USER_LEFT,
+        data={"user_uid": "123456789", "room_id": room_id},
+    )
+
+    await manager.broadcast(message, room_id, exclude_user_id=user_ids["slow"])
+    await manager.drain(room_id)
+
+    frame = sockets["fast"].send_text.await_args.args[0]
+    assert second.send_text.await_args.args[0] is frame
+    assert json.loads(frame)["data"] == {
+        "user_uid": "123456789",
+        "room_id": str(room_id),
+    }
+    sockets["slow"].send_text.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_messages_keep_order_per_connection(room):
+    manager, room_id, sockets, user_ids = room
+
+    await manager.broadcast({"action": "user_ready_changed"}, room_id)
+    await manager.send_personal_message({"action": "pong"}, room_id, user_ids["fast"])
+    await manager.broadcast_game_started(room_id, "ws://game/1")
+    await manager.drain(room_id)
+
+    actions = [
+        json.loads(call.args[0])["action"]
+        for call in sockets["fast"].send_text.await_args_list
+    ]
+    assert actions == ["user_ready_changed", "pong", "game_started"]
+
+
+@pytest.mark.asyncio
+async def test_overflow_disconnects_with_1013():
+    manager = RoomConnectionManager(
+        send_timeout=10, queue_size=2, overflow_policy="disconnect"
+    )
+    room_id, user_id = uuid.uuid4(), uuid.uuid4()
+    websocket = _websocket(_hang)
+    await manager.connect(websocket, room_id, user_id)
+
+    # The first frame is in flight on the stuck socket, the next two fill the queue.
+    await manager.broadcast({"action": "user_ready_changed"}, room_id)
+    await asyncio.sleep(0)
+    reports = [
+        await manager.broadcast({"action": "user_ready_changed"}, room_id)
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+
+    assert [bool(r.queued) for r in reports] == [True, True, False]
+    assert [r.rejected for r in reports] == [[], [], [user_id]]
+    assert manager.stats()["overflow_disconnects"] == 1
+    assert not manager.is_user_in_room(room_id, user_id)
+    websocket.close.assert_awaited_once_with(code=status.WS_1013_TRY_AGAIN_LATER)
+
+
+@pytest.mark.asyncio
+async def test_room_stats_report_queue_depth_and_drops():
+    manager = RoomConnectionManager(send_timeout=10, queue_size=2)
+    room_id = uuid.uuid4()
+    await manager.connect(_websocket(_hang), room_id, uuid.uuid4())
+    await manager.connect(_websocket(), room_id, uuid.uuid4())
+
+    for _ in range(4):
+        await manager.broadcast({"action": "user_ready_changed"}, room_id)
+        await asyncio.sleep(0)
+
+    stats = manager.stats()["by_room"][str(room_id)]
+    assert stats["connections"] == 2
+    assert stats["queue_depth"] == 2
+    assert stats["dropped"] == 1
+    for queue in list(manager.outbound.values()):
+        queue.close()
+
+
+@pytest.mark.asyncio
+async def test_reconnected_socket_is_not_evicted(room):
+    manager, room_id, sockets, user_ids = room
+    replacement = _websocket()
+
+    async def _reconnect_then_fail(_frame):
+        await manager.connect(replacement, room_id, user_ids["broken"])
+        raise RuntimeError("connection reset")
+
+    sockets["broken"].send_text.side_effect = _reconnect_then_fail
+    await manager.broadcast({"action": "ping"}, room_id, exclude_user_id=None)
+    await asyncio.sleep(0)
+    await manager.drain(room_id)
+
+    assert manager.active_connections[room_id][user_ids["broken"]] is replacement
+    assert manager.outbound[user_ids["broken"]].websocket is replacement
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import WebSocket
+
+from app.core.room_coalescer import RoomDelta
+from app.core.room_connection_manager import RoomConnectionManager
+from app.schemas.ws import RoomProtocol, WSActionType
+
+WINDOW = 0.02
+
+
+def _frames(websocket) -> list[dict]:
+    return [json.loads(call.args[0]) for call in websocket.send_text.await_args_list]
+
+
+@pytest.fixture
+async def room():
+    manager = RoomConnectionManager()
+    manager.coalescer.window = WINDOW
+    room_id = uuid.uuid4()
+    legacy, modern = AsyncMock(spec=WebSocket), AsyncMock(spec=WebSocket)
+    await manager.connect(legacy, room_id, uuid.uuid4())
+    await manager.connect(modern, room_id, uuid.uuid4(), protocol=RoomProtocol.V2)
+    yield manager, room_id, legacy, modern
+    for queue in list(manager.outbound.values()):
+        queue.close()
+
+
+def test_delta_keeps_last_ready_and_resets_on_user_list():
+    delta = RoomDelta()
+    delta.apply(WSActionType.USER_READY_CHANGED, {"user_uid": "a", "is_ready": True})
+    delta.apply(WSActionType.USER_JOINED, {"user_uid": "b", "is_ready": False})
+    delta.apply(WSActionType.USER_READY_CHANGED, {"user_uid": "a", "is_ready": False})
+    delta.apply(WSActionType.USER_READY_CHANGED, {"user_uid": "b", "is_ready": True})
+
+    assert json.loads(delta.encode())["data"] == {
+        "joined": [{"user_uid": "b", "is_ready": True}],
+        "ready": {"a": False},
+    }
+
+    delta.apply(WSActionType.USER_LEFT, {"user_uid": "b"})
+    delta.apply(WSActionType.USER_LIST, {"users": [{"user_uid": "a"}]})
+    delta.apply(WSActionType.USER_LEFT, {"user_uid": "a"})
+
+    assert json.loads(delta.encode())["data"] == {
+        "users": [{"user_uid": "a"}],
+        "left": ["a"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_v2_sockets_get_one_room_state_per_window(room):
+    manager, room_id, legacy, modern = room
+    modern.accept.assert_awaited_once_with(subprotocol="mcr.room.v2")
+    legacy.accept.assert_awaited_once_with(subprotocol=None)
+
+    for is_ready in (True, False, True):
+        await manager.broadcast(
+            {
+                "action": WSActionType.USER_READY_CHANGED,
+                "data": {"user_uid": "123", "is_ready": is_ready},
+            },
+            room_id,
+        )
+    await manager.broadcast(
+        {"action": WSActionType.USER_LEFT, "data": {"user_uid": "456"}}, room_id
+    )
+    await asyncio.sleep(WINDOW * 3)
+    await manager.drain(room_id)
+
+    assert [f["action"] for f in _frames(legacy)] == [
+        "user_ready_changed",
+        "user_ready_changed",
+        "user_ready_changed",
+        "user_left",
+    ]
+    (frame,) = _frames(modern)
+    assert frame["action"] == WSActionType.ROOM_STATE
+    assert frame["data"] == {"left": ["456"], "ready": {"123": True}}
+    assert manager.stats()["coalescer"] == {
+        "events": 4,
+        "frames": 1,
+        "pending_rooms": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_other_frames_flush_pending_room_state_first(room):
+    manager, room_id, _, modern = room
+
+    await manager.broadcast(
+        {
+            "action": WSActionType.USER_READY_CHANGED,
+            "data": {"user_uid": "123", "is_ready": True},
+        },
+        room_id,
+    )
+    await manager.broadcast_game_started(room_id, "ws://game/1")
+    await manager.drain(room_id)
+
+    assert [f["action"] for f in _frames(modern)] == ["room_state", "game_started"]
+    assert room_id not in manager.coalescer.pending
@@ -0,0 +1,189 @@
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import WebSocket, WebSocketDisconnect
+
+from app.api.v1.endpoints.ws_room import RoomWebSocketHandler
+from app.core.rate_limit import ActionRateLimiter
+from app.core.room_connection_manager import RoomConnectionManager
+from app.core.timer_wheel import TimerWheel
+from app.schemas.room import RoomUsersResponse
+
+
+@pytest.fixture
+async def manager():
+    manager = RoomConnectionManager()
+    manager.wheel = TimerWheel(tick=1.0, slots=16)
+    manager.grace_period = 3.0
+    yield manager
+    for queue in list(manager.outbound.values()):
+        queue.close()
+
+
+def _advance(manager: RoomConnectionManager, seconds: int) -> None:
+    for _ in range(seconds):
+        manager.wheel.advance()
+
+
+@pytest.mark.asyncio
+async def test_seat_is_held_until_the_grace_timer_fires(manager):
+    room_id, user_id = uuid.uuid4(), uuid.uuid4()
+    websocket = AsyncMock(spec=WebSocket)
+    await manager.connect(websocket, room_id, user_id)
+    on_expire = AsyncMock()
+
+    manager.start_grace(room_id, user_id, websocket, on_expire)
+
+    assert not manager.is_user_in_room(room_id, user_id)
+    assert manager.grace_user_ids() == {user_id: room_id}
+    _advance(manager, 2)
+    await asyncio.sleep(0)
+    on_expire.assert_not_awaited()
+
+    _advance(manager, 2)
+    await asyncio.sleep(0)
+    on_expire.assert_awaited_once_with()
+    assert manager.grace_user_ids() == {}
+    assert manager.stats()["graces"]["expired"] == 1
+
+
+@pytest.mark.asyncio
+async def test_reconnect_within_grace_cancels_the_timer(manager):
+    room_id, user_id = uuid.uuid4(), uuid.uuid4()
+    websocket = AsyncMock(spec=WebSocket)
+    await manager.connect(websocket, room_id, user_id)
+    on_expire = AsyncMock()
+    manager.start_grace(room_id, user_id, websocket, on_expire)
+
+    await manager.connect(AsyncMock(spec=WebSocket), room_id, user_id)
+    _advance(manager, 5)
+    await asyncio.sleep(0)
+
+    on_expire.assert_not_awaited()
+    assert manager.is_user_in_room(room_id, user_id)
+    assert manager.stats()["graces"] == {
+        "pending": 0,
+        "started": 1,
+        "cancelled": 1,
+        "expired": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_superseded_socket_starts_no_grace(manager):
+    room_id, user_id = uuid.uuid4(), uuid.uuid4()
+    old = AsyncMock(spec=WebSocket)
+    await manager.connect(old, room_id, user_id)
+    new = AsyncMock(spec=WebSocket)
+    await manager.connect(new, room_id, user_id)
+
+    manager.start_grace(room_id, user_id, old, AsyncMock())
+
+    assert manager.active_connections[room_id][user_id] is new
+    assert manager.grace_user_ids() == {}
+
+
+def _handler(manager, mocker, room_service, *, is_playing=False):
+    mocker.patch("app.api.v1.endpoints.ws_room.room_manager", manager)
+    mocker.patch(
+        "app.api.v1.endpoints.ws_room.presence_registry.is_live_elsewhere",
+        new=AsyncMock(return_value=False),
+    )
+    websocket = AsyncMock(spec=WebSocket)
+    websocket.query_params = {}
+    websocket.headers = {}
+    user = MagicMock(id=uuid.uuid4(), uid="123456789")
+    room = MagicMock(id=uuid.uuid4(), is_playing=is_playing)
+    room_service.validate_room_user_connection.return_value = (
+        user,
+        room,
+        MagicMock(),
+    )
+    room_service.get_room_snapshot.return_value = RoomUsersResponse(
+        host_uid=user.uid, users=[]
+    )
+    scopes = MagicMock()
+
+    @asynccontextmanager
+    async def scope():
+        scopes()
+        yield room_service
+
+    return RoomWebSocketHandler(websocket, 1, scope), scopes
+
+
+@pytest.mark.asyncio
+async def test_lobby_disconnect_leaves_only_when_grace_expires(manager, mocker):
+    room_service = AsyncMock()
+    room_service.leave_room.return_value = []
+    handler, scopes = _handler(manager, mocker, room_service)
+    await handler.open(uuid.uuid4())
+    scopes.reset_mock()
+
+    await handler.handle_disconnection()
+
+    scopes.assert_not_called()
+    room_service.leave_room.assert_not_awaited()
+    assert manager.grace_user_ids() == {handler.user_id: handler.room_id}
+
+    _advance(manager, 4)
+    await asyncio.gather(*manager._expiring)
+    room_service.leave_room.assert_awaited_once_with(
+        user_id=handler.user_id, room_id=handler.room_id, disconnect_only=False
+    )
+
+
+@pytest.mark.asyncio
+async def test_returning_user_is_not_announced_again(manager, mocker):
+    room_service = AsyncMock()
+    handler, _ = _handler(manager, mocker, room_service)
+    await handler.open(uuid.uuid4())
+    await handler.handle_disconnection()
+
+    returning = RoomWebSocketHandler(
+        AsyncMock(spec=WebSocket), 1, handler.service_scope
+    )
+    returning.websocket.query_params = {}
+    returning.websocket.headers = {}
+    await returning.open(handler.user_id)
+
+    assert returning.returning
+    assert manager.grace_user_ids() == {}
+    assert manager.is_user_in_room(handler.room_id, handler.user_id)
+
+
+@pytest.mark.asyncio
+async def test_disconnect_during_a_game_skips_the_grace_period(manager, mocker):
+    room_service = AsyncMock()
+    room_service.leave_room.return_value = []
+    handler, _ = _handler(manager, mocker, room_service, is_playing=True)
+    await handler.open(uuid.uuid4())
+
+    await handler.handle_disconnection()
+
+    assert manager.grace_user_ids() == {}
+    room_service.leave_room.assert_awaited_once_with(
+        user_id=handler.user_id, room_id=handler.room_id, disconnect_only=True
+    )
+
+
+@pytest.mark.asyncio
+async def test_client_kicked_for_flooding_gets_no_grace(manager, mocker):
+    room_service = AsyncMock()
+    room_service.leave_room.return_value = []
+    handler, _ = _handler(manager, mocker, room_service)
+    await handler.open(uuid.uuid4())
+    handler.rate_limiter = ActionRateLimiter({"*": (0.001, 1)}, strikes=1)
+
+    await handler.dispatch('{"action": "ping"}')
+    with pytest.raises(WebSocketDisconnect):
+        await handler.dispatch('{"action": "ping"}')
+    await handler.handle_disconnection()
+
+    assert manager.grace_user_ids() == {}
+    room_service.leave_room.assert_awaited_once_with(
+        user_id=handler.user_id, room_id=handler.room_id, disconnect_only=False
+    )
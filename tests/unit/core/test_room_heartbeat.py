@@ -0,0 +1,146 @@
+import asyncio
+import json
+import uuid
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import WebSocket, status
+
+from app.api.v1.endpoints.ws_room import RoomWebSocketHandler
+from app.core.room_connection_manager import RoomConnectionManager
+from app.core.timer_wheel import TimerWheel
+from app.schemas.room import RoomUsersResponse
+from app.schemas.ws import RoomProtocol
+
+
+def _scope(room_service):
+    @asynccontextmanager
+    async def scope():
+        yield room_service
+
+    return scope
+
+
+@pytest.fixture
+async def manager():
+    manager = RoomConnectionManager()
+    manager.wheel = TimerWheel(tick=1.0, slots=16)
+    manager.heartbeat_interval = 1.0
+    manager.heartbeat_deadline = 2.5
+    yield manager
+    for queue in list(manager.outbound.values()):
+        queue.close()
+
+
+@pytest.fixture
+def clock(manager, mocker):
+    """Advance the wheel one tick per second of fake monotonic time."""
+    now = [1000.0]
+    mocker.patch(
+        "app.core.room_connection_manager.time.monotonic", side_effect=lambda: now[0]
+    )
+
+    def _advance(seconds: int) -> None:
+        for _ in range(seconds):
+            now[0] += 1
+            manager.wheel.advance()
+
+    return _advance
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_frames_keep_responsive_socket(manager, clock):
+    room_id, user_id = uuid.uuid4(), uuid.uuid4()
+    websocket = AsyncMock(spec=WebSocket)
+    await manager.connect(websocket, room_id, user_id, protocol=RoomProtocol.V2)
+
+    for _ in range(5):
+        clock(2)
+        manager.touch(user_id)
+    await manager.drain(room_id)
+
+    frames = [json.loads(c.args[0]) for c in websocket.send_text.await_args_list]
+    assert frames and all(frame["action"] == "ping" for frame in frames)
+    assert manager.is_user_in_room(room_id, user_id)
+    assert manager.stats()["reaped"] == 0
+
+
+@pytest.mark.asyncio
+async def test_v1_clients_get_no_server_pings(manager, clock):
+    room_id, user_id = uuid.uuid4(), uuid.uuid4()
+    websocket = AsyncMock(spec=WebSocket)
+    await manager.connect(websocket, room_id, user_id)
+
+    for _ in range(5):
+        clock(2)
+        manager.touch(user_id)
+    await manager.drain(room_id)
+
+    websocket.send_text.assert_not_awaited()
+    assert manager.is_user_in_room(room_id, user_id)
+    assert manager.stats()["heartbeats_sent"] == 0
+
+
+@pytest.mark.asyncio
+async def test_silent_socket_is_reaped_through_callback(manager, clock):
+    room_id = uuid.uuid4()
+    silent, alive = uuid.uuid4(), uuid.uuid4()
+    on_dead = MagicMock()
+    await manager.connect(AsyncMock(spec=WebSocket), room_id, silent, on_dead=on_dead)
+    await manager.connect(AsyncMock(spec=WebSocket), room_id, alive)
+
+    for _ in range(6):
+        clock(1)
+        manager.touch(alive)
+
+    on_dead.assert_called_once_with()
+    assert manager.stats()["reaped"] == 1
+    assert manager.is_user_in_room(room_id, alive)
+
+
+@pytest.mark.asyncio
+async def test_silent_socket_without_callback_is_evicted(manager, clock):
+    room_id, user_id = uuid.uuid4(), uuid.uuid4()
+    websocket = AsyncMock(spec=WebSocket)
+    await manager.connect(websocket, room_id, user_id)
+
+    clock(4)
+    await asyncio.sleep(0)
+
+    assert not manager.is_user_in_room(room_id, user_id)
+    assert user_id not in manager.last_seen
+    websocket.close.assert_awaited_once_with(code=status.WS_1001_GOING_AWAY)
+
+
+@pytest.mark.asyncio
+async def test_reap_runs_handle_disconnection(manager, mocker):
+    mocker.patch("app.api.v1.endpoints.ws_room.room_manager", manager)
+    mocker.patch("app.api.v1.endpoints.ws_room.presence_registry")
+    websocket = AsyncMock(spec=WebSocket)
+    websocket.query_params = {"authorization": "token"}
+    websocket.headers = {}
+    websocket.receive_text.side_effect = asyncio.Event().wait
+    mocker.patch(
+        "app.api.v1.endpoints.ws_room.get_user_id_from_token",
+        return_value=uuid.uuid4(),
+    )
+    room_service = AsyncMock()
+    user, room = MagicMock(id=uuid.uuid4()), MagicMock(id=uuid.uuid4())
+    room_user = MagicMock(is_ready=False, slot_index=0)
+    room_user.character.code, room_user.character.name = "c0", "기본 캐릭터"
+    user.uid, user.nickname = "123456789", "Player"
+    room_service.validate_room_user_connection.return_value = (user, room, room_user)
+    room_service.get_room_snapshot.return_value = RoomUsersResponse(
+        host_uid=user.uid, users=[]
+    )
+    handler = RoomWebSocketHandler(websocket, 1, _scope(room_service))
+    handle_disconnection = mocker.patch.object(handler, "handle_disconnection")
+
+    task = asyncio.create_task(handler.handle_connection())
+    await asyncio.sleep(0.01)
+    manager._reap(room.id, user.id, websocket)
+
+    assert await task is False
+    handle_disconnection.assert_awaited_once_with()
+    websocket.close.assert_awaited_once_with(code=status.WS_1001_GOING_AWAY)
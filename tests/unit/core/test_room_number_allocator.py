@@ -0,0 +1,38 @@
+from app.core.room_number_allocator import RoomNumberAllocator
+
+
+def test_acquire_hands_out_small_numbers():
+    allocator = RoomNumberAllocator()
+    allocator.load([])
+
+    assert [allocator.acquire() for _ in range(3)] == [1, 2, 3]
+
+
+def test_load_fills_gaps_first():
+    allocator = RoomNumberAllocator()
+    allocator.load([1, 3, 6])
+
+    assert [allocator.acquire() for _ in range(4)] == [2, 4, 5, 7]
+
+
+def test_released_numbers_are_reused_smallest_first():
+    allocator = RoomNumberAllocator()
+    allocator.load([])
+    for _ in range(5):
+        allocator.acquire()
+
+    allocator.release(4)
+    allocator.release(2)
+    allocator.release(2)
+
+    assert [allocator.acquire() for _ in range(3)] == [2, 4, 6]
+
+
+def test_reset_requires_reload():
+    allocator = RoomNumberAllocator()
+    allocator.load([1, 2])
+    allocator.reset()
+
+    assert not allocator.loaded
+    allocator.load([1, 2, 3])
+    assert allocator.acquire() == 4
@@ -0,0 +1,90 @@
+import asyncio
+import json
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import WebSocket
+
+from app.core.lobby_cache import lobby_cache
+from app.core.room_connection_manager import RoomConnectionManager
+from app.core.room_pubsub import InProcessBackend, InProcessBus
+
+
+@pytest.fixture
+async def workers():
+    bus = InProcessBus()
+    managers = [RoomConnectionManager(backend=InProcessBackend(bus)) for _ in range(2)]
+    for manager in managers:
+        await manager.start()
+    yield managers
+    for manager in managers:
+        await manager.stop()
+        for queue in list(manager.outbound.values()):
+            queue.close()
+
+
+def _frames(websocket: AsyncMock) -> list[dict]:
+    return [json.loads(call.args[0]) for call in websocket.send_text.await_args_list]
+
+
+@pytest.mark.asyncio
+async def test_broadcast_reaches_sockets_on_other_workers(workers):
+    first, second = workers
+    room_id = uuid.uuid4()
+    sender, local, remote = (AsyncMock(spec=WebSocket) for _ in range(3))
+    sender_id, local_id, remote_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    await first.connect(sender, room_id, sender_id)
+    await first.connect(local, room_id, local_id)
+    await second.connect(remote, room_id, remote_id)
+
+    report = await first.broadcast(
+        {"action": "user_ready_changed"}, room_id, exclude_user_id=sender_id
+    )
+    await first.drain(room_id)
+    await second.drain(room_id)
+
+    assert report.queued == [local_id]
+    # Each worker numbers the room's broadcasts in its own replay buffer.
+    assert _frames(local) == [{"action": "user_ready_changed", "seq": 1}]
+    assert _frames(remote) == [{"action": "user_ready_changed", "seq": 1}]
+    sender.send_text.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_personal_message_routes_to_owning_worker(workers):
+    first, second = workers
+    room_id, user_id = uuid.uuid4(), uuid.uuid4()
+    websocket = AsyncMock(spec=WebSocket)
+    await second.connect(websocket, room_id, user_id)
+
+    await first.send_personal_message({"action": "pong"}, room_id, user_id)
+    await second.drain(room_id)
+
+    assert _frames(websocket) == [{"action": "pong"}]
+
+
+@pytest.mark.asyncio
+async def test_lobby_change_invalidates_other_workers(workers):
+    first, _ = workers
+    version = lobby_cache.version
+
+    first.publish_lobby_changed()
+    await asyncio.sleep(0)
+
+    assert lobby_cache.version == version + 1
+
+
+@pytest.mark.asyncio
+async def test_game_start_from_a_worker_without_the_room_reaches_players(workers):
+    first, second = workers
+    room_id, user_id = uuid.uuid4(), uuid.uuid4()
+    websocket = AsyncMock(spec=WebSocket)
+    await second.connect(websocket, room_id, user_id)
+
+    report = await first.broadcast_game_started(room_id, "ws://game/1")
+    await second.drain(room_id)
+
+    assert report.queued == []
+    assert [frame["action"] for frame in _frames(websocket)] == ["game_started"]
+    assert second.has_started(room_id)
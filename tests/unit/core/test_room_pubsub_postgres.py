@@ -0,0 +1,57 @@
+import asyncio
+import json
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import WebSocket
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import get_test_settings
+from app.core.room_connection_manager import RoomConnectionManager
+from app.core.room_pubsub import PostgresNotifyBackend
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine(get_test_settings().database_uri)
+    yield engine
+    await engine.dispose()
+
+
+async def _until(predicate, timeout: float = 2.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_broadcast_crosses_workers_over_listen_notify(engine):
+    channel = f"test_room_events_{uuid.uuid4().hex}"
+    first = RoomConnectionManager(backend=PostgresNotifyBackend(engine, channel))
+    second = RoomConnectionManager(backend=PostgresNotifyBackend(engine, channel))
+    await first.start()
+    await second.start()
+
+    room_id = uuid.uuid4()
+    local, remote = AsyncMock(spec=WebSocket), AsyncMock(spec=WebSocket)
+    await first.connect(local, room_id, uuid.uuid4())
+    await second.connect(remote, room_id, uuid.uuid4())
+
+    try:
+        await first.broadcast({"action": "user_ready_changed"}, room_id)
+        await _until(lambda: remote.send_text.await_count == 1)
+        await first.drain(room_id)
+
+        assert json.loads(remote.send_text.await_args.args[0]) == {
+            "action": "user_ready_changed",
+            "seq": 1,
+        }
+        # The publishing worker ignores its own notification.
+        await asyncio.sleep(0.05)
+        assert local.send_text.await_count == 1
+    finally:
+        for manager in (first, second):
+            await manager.stop()
+            for queue in list(manager.outbound.values()):
+                queue.close()
@@ -0,0 +1,128 @@
+import json
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import WebSocket
+
+from app.core.room_connection_manager import RoomConnectionManager
+from app.core.room_replay import ReplayBuffer
+from app.schemas.ws import RoomProtocol, WSActionType
+
+
+def _frames(websocket) -> list[dict]:
+    return [json.loads(call.args[0]) for call in websocket.send_text.await_args_list]
+
+
+def _ready(user_uid: str, is_ready: bool) -> dict:
+    return {
+        "action": WSActionType.USER_READY_CHANGED,
+        "data": {"user_uid": user_uid, "is_ready": is_ready},
+    }
+
+
+@pytest.fixture
+async def manager():
+    manager = RoomConnectionManager()
+    yield manager
+    for queue in list(manager.outbound.values()):
+        queue.close()
+
+
+def test_buffer_covers_only_its_epoch_and_retained_events():
+    buffer = ReplayBuffer(size=3)
+    frames = [buffer.append("user_left", '{"action":"user_left"}') for _ in range(5)]
+
+    assert json.loads(frames[-1]) == {"action": "user_left", "seq": 5}
+    assert buffer.covers(buffer.epoch, 5)
+    assert buffer.covers(buffer.epoch, 2)
+    assert not buffer.covers(buffer.epoch, 1)
+    assert not buffer.covers(buffer.epoch, 6)
+    assert not buffer.covers("other-worker", 4)
+    assert [seq for seq, _, _ in buffer.since(3)] == [4, 5]
+
+
+@pytest.mark.asyncio
+async def test_reconnecting_client_receives_only_missed_events(manager):
+    room_id, stayer_id, flapper_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    await manager.connect(AsyncMock(spec=WebSocket), room_id, stayer_id)
+    flapper = AsyncMock(spec=WebSocket)
+    await manager.connect(flapper, room_id, flapper_id)
+    await manager.broadcast(_ready("1", True), room_id)
+    await manager.drain(room_id)
+    epoch, seq = manager.position(room_id)
+    assert (_frames(flapper)[-1]["seq"], seq) == (1, 1)
+
+    await manager.disconnect(room_id, flapper_id)
+    await manager.broadcast(_ready("1", False), room_id)
+    await manager.broadcast(_ready("2", True), room_id)
+
+    assert manager.can_resume(room_id, epoch, seq)
+    returning = AsyncMock(spec=WebSocket)
+    await manager.connect(returning, room_id, flapper_id)
+    assert manager.resume(room_id, flapper_id, seq)
+    await manager.drain(room_id)
+
+    resume, *missed = _frames(returning)
+    assert resume["action"] == WSActionType.RESUME
+    assert resume["data"] == {"epoch": epoch, "seq": 3, "resumed": True}
+    assert [(f["data"]["user_uid"], f["seq"]) for f in missed] == [("1", 2), ("2", 3)]
+
+
+@pytest.mark.asyncio
+async def test_v2_clients_get_missed_events_as_one_room_state(manager):
+    room_id, user_id = uuid.uuid4(), uuid.uuid4()
+    await manager.connect(AsyncMock(spec=WebSocket), room_id, uuid.uuid4())
+    _, seq = manager.position(room_id)
+    for is_ready in (True, False, True):
+        await manager.broadcast(_ready("1", is_ready), room_id)
+
+    websocket = AsyncMock(spec=WebSocket)
+    await manager.connect(websocket, room_id, user_id, protocol=RoomProtocol.V2)
+    manager.resume(room_id, user_id, seq)
+    await manager.drain(room_id)
+
+    _, room_state = _frames(websocket)
+    assert room_state["action"] == WSActionType.ROOM_STATE
+    assert room_state["data"] == {"ready": {"1": True}}
+    assert room_state["seq"] == 3
+
+
+@pytest.mark.asyncio
+async def test_too_large_gap_gets_a_snapshot_first(manager):
+    room_id, user_id = uuid.uuid4(), uuid.uuid4()
+    await manager.connect(AsyncMock(spec=WebSocket), room_id, uuid.uuid4())
+    epoch, _ = manager.position(room_id)
+    for _ in range(manager.replays[room_id].events.maxlen + 1):
+        await manager.broadcast(_ready("1", True), room_id)
+    assert not manager.can_resume(room_id, epoch, 0)
+
+    _, after = manager.position(room_id)
+    snapshot = json.dumps(
+        {"action": WSActionType.ROOM_SNAPSHOT, "data": {"host_uid": "1", "users": []}}
+    )
+    await manager.broadcast(_ready("2", True), room_id)
+    websocket = AsyncMock(spec=WebSocket)
+    await manager.connect(websocket, room_id, user_id)
+    manager.resume(room_id, user_id, after, snapshot)
+    await manager.drain(room_id)
+
+    assert [f["action"] for f in _frames(websocket)] == [
+        WSActionType.RESUME,
+        WSActionType.ROOM_SNAPSHOT,
+        WSActionType.USER_READY_CHANGED,
+    ]
+    assert _frames(websocket)[0]["data"]["resumed"] is False
+
+
+@pytest.mark.asyncio
+async def test_buffer_expires_once_the_room_is_empty(manager):
+    room_id, user_id = uuid.uuid4(), uuid.uuid4()
+    manager.replay_ttl = 0
+    await manager.connect(AsyncMock(spec=WebSocket), room_id, user_id)
+    await manager.disconnect(room_id, user_id)
+
+    assert room_id in manager.replays
+    for _ in range(2):
+        manager.wheel.advance()
+    assert room_id not in manager.replays
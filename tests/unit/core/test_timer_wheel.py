@@ -0,0 +1,57 @@
+from app.core.timer_wheel import TimerWheel
+
+
+def _advance(wheel: TimerWheel, ticks: int) -> None:
+    for _ in range(ticks):
+        wheel.advance()
+
+
+def test_timer_never_fires_early():
+    wheel = TimerWheel(tick=1.0, slots=8)
+    fired: list[str] = []
+    wheel.schedule(3.0, fired.append, "a")
+    wheel.schedule(0.2, fired.append, "b")
+
+    _advance(wheel, 1)
+    assert fired == []
+    _advance(wheel, 1)
+    assert fired == ["b"]
+    _advance(wheel, 2)
+    assert fired == ["b", "a"]
+
+
+def test_timer_longer_than_one_revolution():
+    wheel = TimerWheel(tick=1.0, slots=4)
+    fired: list[int] = []
+    wheel.schedule(10.0, fired.append, 10)
+
+    _advance(wheel, 10)
+    assert fired == []
+    _advance(wheel, 1)
+    assert fired == [10]
+    assert len(wheel) == 0
+
+
+def test_cancelled_timer_does_not_fire():
+    wheel = TimerWheel(tick=1.0, slots=4)
+    fired: list[int] = []
+    handle = wheel.schedule(1.0, fired.append, 1)
+    handle.cancel()
+
+    _advance(wheel, 4)
+    assert fired == []
+    assert wheel.fired == 0
+
+
+def test_callback_can_reschedule_itself():
+    wheel = TimerWheel(tick=1.0, slots=4)
+    fired: list[int] = []
+
+    def _tick(n: int) -> None:
+        fired.append(n)
+        if n < 3:
+            wheel.schedule(1.0, _tick, n + 1)
+
+    wheel.schedule(1.0, _tick, 1)
+    _advance(wheel, 6)
+    assert fired == [1, 2, 3]
@@ -0,0 +1,72 @@
+import json
+import uuid
+from unittest.mock import AsyncMock
+
+import msgpack
+import pytest
+from fastapi import WebSocket
+
+from app.core.room_connection_manager import RoomConnectionManager
+from app.core.ws_codec import msgpack_frame, pack, unpack
+from app.schemas.ws import RoomProtocol, WebSocketResponse, WSActionType
+
+USER_LIST = WebSocketResponse(
+    status="success",
+    action=WSActionType.USER_LIST,
+    data={
+        "users": [
+            {
+                "user_uid": "123456789",
+                "nickname": "Host",
+                "is_ready": True,
+                "slot_index": 0,
+                "current_character": {"code": "c1", "name": "기본 캐릭터"},
+            }
+        ]
+    },
+).model_dump_json()
+
+
+def test_msgpack_frame_uses_short_keys_and_round_trips():
+    frame = msgpack_frame(USER_LIST)
+
+    raw = msgpack.unpackb(frame)
+    assert set(raw) == {"s", "a", "d", "e", "t"}
+    assert set(raw["d"]["U"][0]) == {"u", "n", "r", "i", "c"}
+    assert unpack(frame) == json.loads(USER_LIST)
+    assert len(frame) < len(USER_LIST.encode())
+    assert msgpack_frame(USER_LIST) is frame
+
+
+def test_unpack_rejects_garbage_with_value_error():
+    with pytest.raises(ValueError):
+        unpack(b"\xc1")
+    assert unpack(pack({"action": "ready", "data": {"is_ready": True}})) == {
+        "action": "ready",
+        "data": {"is_ready": True},
+    }
+
+
+@pytest.mark.asyncio
+async def test_broadcast_sends_binary_to_msgpack_sockets_only():
+    manager = RoomConnectionManager()
+    room_id = uuid.uuid4()
+    text, binary = AsyncMock(spec=WebSocket), AsyncMock(spec=WebSocket)
+    await manager.connect(text, room_id, uuid.uuid4())
+    await manager.connect(
+        binary, room_id, uuid.uuid4(), protocol=RoomProtocol.V1_MSGPACK
+    )
+
+    await manager.broadcast({"action": "user_left", "data": {"user_uid": "1"}}, room_id)
+    await manager.drain(room_id)
+
+    binary.accept.assert_awaited_once_with(subprotocol="mcr.room.v1.msgpack")
+    assert json.loads(text.send_text.await_args.args[0])["action"] == "user_left"
+    binary.send_text.assert_not_awaited()
+    assert unpack(binary.send_bytes.await_args.args[0]) == {
+        "action": "user_left",
+        "data": {"user_uid": "1"},
+        "seq": 1,
+    }
+    for queue in list(manager.outbound.values()):
+        queue.close()
@@ -1,41 +0,0 @@
-import pytest_asyncio
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.pool import NullPool
-from sqlmodel import SQLModel
-
-from app.core.config import get_test_settings
-
-
-@pytest_asyncio.fixture
-async def test_db_session() -> AsyncSession:
-    test_settings = get_test_settings()
-    engine = create_async_engine(
-        test_settings.database_uri,
-        echo=False,
-        poolclass=NullPool,
-    )
-
-    async with engine.begin() as conn:
-        await conn.execute(text("DROP SCHEMA public CASCADE"))
-        await conn.execute(text("CREATE SCHEMA public"))
-        await conn.run_sync(SQLModel.metadata.create_all)
-
-    async_session = async_sessionmaker(
-        bind=engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-        autoflush=False,
-    )
-
-    async with async_session() as session:
-        try:
-            yield session
-        finally:
-            await session.rollback()
-
-    async with engine.begin() as conn:
-        await conn.execute(text("DROP SCHEMA public CASCADE"))
-        await conn.execute(text("CREATE SCHEMA public"))
-
-    await engine.dispose()
@@ -0,0 +1,75 @@
+import pytest
+
+from app.models.room import Room
+from app.models.room_user import RoomUser
+from app.models.user import User
+from app.repositories.room_repository import RoomRepository
+
+
+async def _create_rooms(session, count: int, users_per_room: int = 3) -> None:
+    for room_index in range(count):
+        users = [
+            User(
+                uid=f"{room_index:04d}{slot:05d}",
+                nickname=f"User{room_index}_{slot}",
+            )
+            for slot in range(users_per_room)
+        ]
+        session.add_all(users)
+        await session.flush()
+
+        room = Room(
+            name=f"Room {room_index}",
+            room_number=room_index + 1,
+            max_users=4,
+            is_playing=room_index % 5 == 4,
+            host_id=users[0].id,
+        )
+        session.add(room)
+        await session.flush()
+
+        session.add_all(
+            [
+                RoomUser(
+                    room_id=room.id,
+                    user_id=user.id,
+                    user_uid=user.uid,
+                    user_nickname=user.nickname,
+                    slot_index=slot,
+                )
+                for slot, user in enumerate(users)
+            ]
+        )
+    await session.commit()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("room_count", [1, 10, 50])
+async def test_available_rooms_query_count_is_constant(
+    test_db_session, test_character, statement_counter, room_count
+):
+    await _create_rooms(test_db_session, room_count)
+    test_db_session.expunge_all()
+    statement_counter.clear()
+
+    repo = RoomRepository(test_db_session)
+    results = await repo.get_available_rooms_with_users()
+
+    assert len(statement_counter) == 2
+    assert len(results) == room_count - room_count // 5
+    for room, host, room_users in results:
+        assert not room.is_playing
+        assert host.id == room.host_id
+        assert [ru.slot_index for ru in room_users] == [0, 1, 2]
+        assert all(ru.character.name == test_character.name for ru in room_users)
+    assert len(statement_counter) == 2
+
+
+@pytest.mark.asyncio
+async def test_available_rooms_without_rooms_runs_single_query(
+    test_db_session, statement_counter
+):
+    repo = RoomRepository(test_db_session)
+
+    assert await repo.get_available_rooms_with_users() == []
+    assert len(statement_counter) == 1
@@ -172,8 +172,9 @@ async def test_get_available_rooms_with_users(test_db_session, test_host):
     repo = RoomRepository(test_db_session)
     results = await repo.get_available_rooms_with_users()
     assert len(results) == 1
-    room, room_users = results[0]
+    room, host, room_users = results[0]
     assert room.id == room1.id
+    assert host.id == test_host.id
     assert room.name == "Available Room"
     assert room.is_playing is False
     assert len(room_users) == 2
@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from app.core.error import DomainErrorCode, MCRDomainError
+from app.models.room import Room
+from app.models.room_user import RoomUser
+from app.models.user import User
+from app.services.room_service import RoomService
+
+CLIENT_COUNT = 16
+
+
+async def _seed(session, user_count: int, *, is_playing: bool = False):
+    users = [
+        User(uid=f"{500000000 + i}", nickname=f"User{i}") for i in range(user_count)
+    ]
+    session.add_all(users)
+    await session.flush()
+    room = Room(
+        name="Race Room",
+        room_number=1,
+        max_users=4,
+        is_playing=is_playing,
+        host_id=users[0].id,
+    )
+    session.add(room)
+    await session.commit()
+    return room, users
+
+
+async def _join(session_factory, mocker, user, room) -> RoomUser | DomainErrorCode:
+    async with session_factory() as session:
+        service = RoomService(session=session, user_service=mocker.AsyncMock())
+        try:
+            return await service.join_room(user.id, room.id)
+        except MCRDomainError as e:
+            return e.code
+
+
+@pytest.mark.asyncio
+async def test_concurrent_joins_never_overfill(
+    test_db_session, test_character, session_factory, mocker
+):
+    room, users = await _seed(test_db_session, CLIENT_COUNT)
+
+    results = await asyncio.gather(
+        *(_join(session_factory, mocker, user, room) for user in users)
+    )
+
+    joined = [r for r in results if isinstance(r, RoomUser)]
+    rejected = [r for r in results if not isinstance(r, RoomUser)]
+    assert sorted(r.slot_index for r in joined) == [0, 1, 2, 3]
+    assert rejected == [DomainErrorCode.ROOM_IS_FULL] * (CLIENT_COUNT - 4)
+
+    slots = (
+        await test_db_session.execute(
+            select(RoomUser.slot_index).where(RoomUser.room_id == room.id)
+        )
+    ).scalars()
+    assert sorted(slots) == [0, 1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_join_takes_lowest_free_slot_in_two_statements(
+    test_db_session, test_character, statement_counter, mocker
+):
+    room, users = await _seed(test_db_session, 3)
+    service = RoomService(session=test_db_session, user_service=mocker.AsyncMock())
+    await service.join_room(users[0].id, room.id)
+    await service.join_room(users[1].id, room.id)
+    await test_db_session.execute(
+        RoomUser.__table__.delete().where(RoomUser.user_id == users[0].id)
+    )
+    await test_db_session.commit()
+    statement_counter.clear()
+
+    room_user = await service.join_room(users[2].id, room.id)
+
+    assert len(statement_counter) == 2
+    assert room_user.slot_index == 0
+    assert room_user.user_uid == users[2].uid
+    assert room_user.user_nickname == users[2].nickname
+    assert room_user.created_at is not None
+
+
+@pytest.mark.asyncio
+async def test_join_rejections(test_db_session, test_character, mocker):
+    room, users = await _seed(test_db_session, 2)
+    room_id, first_id, second_id = room.id, users[0].id, users[1].id
+    service = RoomService(session=test_db_session, user_service=mocker.AsyncMock())
+    await service.join_room(first_id, room_id)
+
+    with pytest.raises(MCRDomainError) as exc_info:
+        await service.join_room(first_id, room_id)
+    assert exc_info.value.code == DomainErrorCode.USER_ALREADY_IN_ROOM
+    assert exc_info.value.details["current_room_id"] == str(room_id)
+
+    with pytest.raises(MCRDomainError) as exc_info:
+        await service.join_room(User().id, room_id)
+    assert exc_info.value.code == DomainErrorCode.USER_NOT_FOUND
+
+    await test_db_session.execute(
+        Room.__table__.update().where(Room.id == room_id).values(is_playing=True)
+    )
+    await test_db_session.commit()
+    with pytest.raises(MCRDomainError) as exc_info:
+        await service.join_room(second_id, room_id)
+    assert exc_info.value.code == DomainErrorCode.ROOM_ALREADY_PLAYING
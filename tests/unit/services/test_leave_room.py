@@ -0,0 +1,167 @@
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import WebSocket
+from sqlalchemy import select
+
+from app.api.v1.endpoints.ws_room import RoomWebSocketHandler
+from app.core.error import DomainErrorCode, MCRDomainError
+from app.models.room import Room
+from app.models.room_user import RoomUser
+from app.models.user import User
+from app.services.room_service import RoomService
+
+
+async def _seed(session, room_number: int, seats: list[tuple[str, bool]]):
+    users = [
+        User(uid=f"{600000000 + room_number * 10 + i}", nickname=name)
+        for i, (name, _) in enumerate(seats)
+    ]
+    session.add_all(users)
+    await session.flush()
+    room = Room(
+        name=f"Room {room_number}", room_number=room_number, host_id=users[0].id
+    )
+    session.add(room)
+    await session.flush()
+    session.add_all(
+        [
+            RoomUser(
+                room_id=room.id,
+                user_id=user.id,
+                user_uid=user.uid,
+                user_nickname=user.nickname,
+                is_bot=is_bot,
+                slot_index=slot,
+            )
+            for slot, (user, (_, is_bot)) in enumerate(zip(users, seats, strict=True))
+        ]
+    )
+    await session.commit()
+    return room.id, [user.id for user in users]
+
+
+@pytest.fixture
+def room_service(test_db_session, mocker):
+    return RoomService(session=test_db_session, user_service=mocker.AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_host_leave_reassigns_host_in_one_commit(
+    test_db_session, test_character, statement_counter, room_service, mocker
+):
+    room_id, (host, second, third) = await _seed(
+        test_db_session, 1, [("Host", False), ("Second", False), ("Third", False)]
+    )
+    statement_counter.clear()
+    commit = mocker.spy(test_db_session, "commit")
+
+    remaining = await room_service.leave_room(host, room_id)
+
+    assert len(statement_counter) == 3
+    commit.assert_awaited_once()
+    assert [ru.nickname for ru in remaining] == ["Second", "Third"]
+    assert remaining[0].current_character.code == test_character.code
+    host_id = await test_db_session.scalar(
+        select(Room.host_id).where(Room.id == room_id)
+    )
+    assert host_id == second
+    seated = (await test_db_session.scalars(select(RoomUser.user_id))).all()
+    assert sorted(seated) == sorted([second, third])
+
+
+@pytest.mark.asyncio
+async def test_leave_with_only_bots_left_deletes_room(
+    test_db_session, test_character, room_service
+):
+    room_id, (human, _, _) = await _seed(
+        test_db_session, 2, [("Human", False), ("Bot1", True), ("Bot2", True)]
+    )
+
+    assert await room_service.leave_room(human, room_id) == []
+
+    assert await test_db_session.scalar(select(Room).where(Room.id == room_id)) is None
+    assert (await test_db_session.scalars(select(RoomUser))).all() == []
+
+
+@pytest.mark.asyncio
+async def test_last_user_leave_deletes_room(
+    test_db_session, test_character, room_service
+):
+    room_id, (host,) = await _seed(test_db_session, 3, [("Host", False)])
+
+    assert await room_service.leave_room(host, room_id) == []
+    assert await test_db_session.scalar(select(Room).where(Room.id == room_id)) is None
+
+
+@pytest.mark.asyncio
+async def test_disconnect_only_keeps_seat(
+    test_db_session, test_character, room_service
+):
+    room_id, (host, _) = await _seed(
+        test_db_session, 4, [("Host", False), ("Guest", False)]
+    )
+
+    remaining = await room_service.leave_room(host, room_id, disconnect_only=True)
+
+    assert [ru.nickname for ru in remaining] == ["Host", "Guest"]
+    host_id = await test_db_session.scalar(
+        select(Room.host_id).where(Room.id == room_id)
+    )
+    assert host_id == host
+
+
+@pytest.mark.asyncio
+async def test_leave_wrong_room(test_db_session, test_character, room_service):
+    room_id, _ = await _seed(test_db_session, 5, [("Host", False)])
+    _, (other,) = await _seed(test_db_session, 6, [("Other", False)])
+    stranger = User(uid="699999999", nickname="Stranger")
+    test_db_session.add(stranger)
+    await test_db_session.commit()
+    stranger_id = stranger.id
+
+    with pytest.raises(MCRDomainError) as exc_info:
+        await room_service.leave_room(other, room_id)
+    assert exc_info.value.code == DomainErrorCode.USER_NOT_FOUND
+
+    with pytest.raises(MCRDomainError) as exc_info:
+        await room_service.leave_room(stranger_id, room_id)
+    assert exc_info.value.code == DomainErrorCode.USER_NOT_IN_ROOM
+
+
+@pytest.mark.asyncio
+async def test_grace_expiry_frees_the_seat_and_hands_over_host(
+    test_db_session, test_character, room_service, mocker
+):
+    room_id, (host, second) = await _seed(
+        test_db_session, 4, [("Host", False), ("Second", False)]
+    )
+    mocker.patch(
+        "app.api.v1.endpoints.ws_room.presence_registry.is_live_elsewhere",
+        new=mocker.AsyncMock(return_value=False),
+    )
+    broadcast = mocker.patch(
+        "app.api.v1.endpoints.ws_room.room_manager.broadcast", new=mocker.AsyncMock()
+    )
+
+    @asynccontextmanager
+    async def scope():
+        yield room_service
+
+    handler = RoomWebSocketHandler(mocker.AsyncMock(spec=WebSocket), 4, scope)
+    handler.room_id, handler.user_id = room_id, host
+    handler.user = mocker.MagicMock(uid="600000040")
+
+    await handler.expire_grace()
+
+    seats = (
+        await test_db_session.execute(
+            select(RoomUser.user_id).where(RoomUser.room_id == room_id)
+        )
+    ).scalars()
+    assert list(seats) == [second]
+    room = await test_db_session.get(Room, room_id, populate_existing=True)
+    assert room.host_id == second
+    (left, _), (user_list, _) = (c.args for c in broadcast.await_args_list)
+    assert left.action == "user_left"
+    assert [u["nickname"] for u in user_list.data["users"]] == ["Second"]
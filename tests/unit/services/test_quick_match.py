@@ -0,0 +1,105 @@
+import pytest
+
+from app.core.lobby_cache import lobby_cache
+from app.core.metrics import quick_match_stats
+from app.core.room_number_allocator import room_number_allocator
+from app.models.room import Room
+from app.models.room_user import RoomUser
+from app.models.user import User
+from app.services.room_service import RoomService
+
+
+@pytest.fixture(autouse=True)
+def reset_state():
+    lobby_cache.invalidate()
+    lobby_cache.open_rooms = None
+    room_number_allocator.reset()
+    yield
+    lobby_cache.invalidate()
+    lobby_cache.open_rooms = None
+    room_number_allocator.reset()
+
+
+async def _seed(session, occupancy: dict[int, int]) -> list[User]:
+    users = [User(uid=f"{700000000 + i}", nickname=f"User{i}") for i in range(20)]
+    session.add_all(users)
+    await session.flush()
+    seated = iter(users)
+    for room_number, current_users in occupancy.items():
+        members = [next(seated) for _ in range(current_users)]
+        room = Room(
+            name=f"Room {room_number}",
+            room_number=room_number,
+            host_id=members[0].id,
+        )
+        session.add(room)
+        await session.flush()
+        session.add_all(
+            [
+                RoomUser(
+                    room_id=room.id,
+                    user_id=user.id,
+                    user_uid=user.uid,
+                    user_nickname=user.nickname,
+                    slot_index=slot,
+                )
+                for slot, user in enumerate(members)
+            ]
+        )
+    await session.commit()
+    return list(seated)
+
+
+@pytest.mark.asyncio
+async def test_quick_match_fills_fullest_room_then_creates(
+    test_db_session, test_character, mocker
+):
+    waiting = await _seed(test_db_session, {1: 1, 2: 3, 3: 4})
+    service = RoomService(session=test_db_session, user_service=mocker.AsyncMock())
+    joined, created = quick_match_stats.joined, quick_match_stats.created
+
+    first = await service.quick_match(waiting[0].id)
+    second = await service.quick_match(waiting[1].id)
+    third = await service.quick_match(waiting[2].id)
+    third_again = await service.quick_match(waiting[3].id)
+    fourth = await service.quick_match(waiting[4].id)
+
+    assert (first.room_number, first.slot_index) == (2, 3)
+    assert (second.room_number, second.slot_index) == (1, 1)
+    assert (third.room_number, third.slot_index) == (1, 2)
+    assert (third_again.room_number, third_again.slot_index) == (1, 3)
+    assert (fourth.room_number, fourth.slot_index) == (4, 0)
+    assert quick_match_stats.joined - joined == 4
+    assert quick_match_stats.created - created == 1
+    assert quick_match_stats.placement.count >= 5
+
+
+@pytest.mark.asyncio
+async def test_quick_match_reuses_the_index_across_lobby_changes(
+    test_db_session, test_character, mocker
+):
+    waiting = await _seed(test_db_session, {1: 1, 2: 3})
+    service = RoomService(session=test_db_session, user_service=mocker.AsyncMock())
+    load = mocker.spy(service, "get_lobby_snapshot")
+
+    placed = [(await service.quick_match(user.id)).room_number for user in waiting[:5]]
+
+    assert placed == [2, 1, 1, 1, 3]
+    assert load.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_quick_match_skips_rooms_filled_since_snapshot(
+    test_db_session, test_character, mocker
+):
+    waiting = await _seed(test_db_session, {1: 1, 2: 3})
+    service = RoomService(session=test_db_session, user_service=mocker.AsyncMock())
+    snapshot = await service.get_lobby_snapshot()
+    lobby_cache.open_rooms = snapshot.open_rooms
+
+    # Room 2 fills up behind the index's back.
+    await service.join_room(waiting[0].id, snapshot.room_ids[2])
+    placed = await service.quick_match(waiting[1].id)
+
+    assert placed.room_number == 1
+    assert [r.room_number for r in lobby_cache.open_rooms.candidates()] == [1]
@@ -0,0 +1,80 @@
+import pytest
+from sqlalchemy import select
+
+from app.models.room import Room
+from app.models.room_user import RoomUser
+from app.models.user import User
+from app.services.room_service import RoomService
+
+
+async def _create_room(session, room_number, users, *, is_playing=False) -> Room:
+    room = Room(
+        name=f"Room {room_number}",
+        room_number=room_number,
+        is_playing=is_playing,
+        host_id=users[0].id,
+    )
+    session.add(room)
+    await session.flush()
+    session.add_all(
+        [
+            RoomUser(
+                room_id=room.id,
+                user_id=user.id,
+                user_uid=user.uid,
+                user_nickname=user.nickname,
+                slot_index=slot,
+            )
+            for slot, user in enumerate(users[1:])
+        ]
+    )
+    return room
+
+
+@pytest.mark.asyncio
+async def test_cleanup_rooms_uses_set_based_deletes(
+    test_db_session, test_character, statement_counter, mocker
+):
+    users = [User(uid=f"20000000{i}", nickname=f"User{i}") for i in range(5)]
+    test_db_session.add_all(users)
+    await test_db_session.flush()
+    host, connected, disconnected, playing, lonely = users
+
+    kept_room = await _create_room(test_db_session, 1, [host, connected, disconnected])
+    playing_room = await _create_room(
+        test_db_session, 2, [host, playing], is_playing=True
+    )
+    await _create_room(test_db_session, 3, [host, lonely])
+    await _create_room(test_db_session, 4, [host], is_playing=True)
+    await test_db_session.commit()
+    statement_counter.clear()
+
+    service = RoomService(session=test_db_session, user_service=mocker.AsyncMock())
+    result = await service.cleanup_rooms(connected_user_ids={connected.id})
+
+    assert len(statement_counter) == 3
+    assert result.orphaned_room_users == 0
+    assert result.disconnected_room_users == 2
+    assert result.empty_rooms == 2
+
+    room_ids = set((await test_db_session.execute(select(Room.id))).scalars())
+    assert room_ids == {kept_room.id, playing_room.id}
+    user_ids = set((await test_db_session.execute(select(RoomUser.user_id))).scalars())
+    assert user_ids == {connected.id, playing.id}
+
+
+@pytest.mark.asyncio
+async def test_cleanup_rooms_with_nothing_connected(
+    test_db_session, test_character, mocker
+):
+    users = [User(uid=f"30000000{i}", nickname=f"User{i}") for i in range(3)]
+    test_db_session.add_all(users)
+    await test_db_session.flush()
+    await _create_room(test_db_session, 1, users)
+    await test_db_session.commit()
+
+    service = RoomService(session=test_db_session, user_service=mocker.AsyncMock())
+    result = await service.cleanup_rooms(connected_user_ids=set())
+
+    assert result.disconnected_room_users == 2
+    assert result.empty_rooms == 1
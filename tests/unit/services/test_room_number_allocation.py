@@ -0,0 +1,117 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app.core.room_number_allocator import room_number_allocator
+from app.models.room import Room
+from app.models.user import User
+from app.repositories.room_repository import RoomRepository
+from app.services.room_service import RoomService
+
+ROOM_COUNT = 200
+
+
+@pytest.fixture(autouse=True)
+def reset_allocator():
+    room_number_allocator.reset()
+    yield
+    room_number_allocator.reset()
+
+
+async def _create_users(session, count: int) -> list[User]:
+    users = [User(uid=f"{400000000 + i}", nickname=f"User{i}") for i in range(count)]
+    session.add_all(users)
+    await session.commit()
+    return users
+
+
+async def _create_room(session_factory, mocker, user: User) -> Room:
+    async with session_factory() as session:
+        service = RoomService(session=session, user_service=mocker.AsyncMock())
+        return await service.create_room(user.id)
+
+
+@pytest.mark.asyncio
+async def test_parallel_create_room_allocates_unique_numbers(
+    test_db_session, test_character, session_factory, mocker
+):
+    users = await _create_users(test_db_session, ROOM_COUNT)
+
+    rooms = await asyncio.gather(
+        *(_create_room(session_factory, mocker, user) for user in users)
+    )
+
+    assert sorted(room.room_number for room in rooms) == list(range(1, ROOM_COUNT + 1))
+
+
+@pytest.mark.asyncio
+async def test_released_numbers_are_reused(
+    test_db_session, test_character, session_factory, mocker
+):
+    users = await _create_users(test_db_session, 4)
+    rooms = [await _create_room(session_factory, mocker, user) for user in users[:3]]
+
+    async with session_factory() as session:
+        service = RoomService(session=session, user_service=mocker.AsyncMock())
+        await service.leave_room(users[1].id, rooms[1].id)
+
+    room = await _create_room(session_factory, mocker, users[3])
+
+    assert room.room_number == rooms[1].room_number == 2
+
+
+@pytest.mark.asyncio
+async def test_number_taken_by_another_worker_is_retried(
+    test_db_session, test_character, session_factory, mocker
+):
+    users = await _create_users(test_db_session, 2)
+    await _create_room(session_factory, mocker, users[0])
+    test_db_session.add(Room(name="other worker", room_number=2, host_id=users[0].id))
+    await test_db_session.commit()
+
+    room = await _create_room(session_factory, mocker, users[1])
+
+    assert room.room_number == 3
+    numbers = (await test_db_session.execute(select(Room.room_number))).scalars()
+    assert sorted(numbers) == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_number_is_released_when_creation_fails(
+    test_db_session, test_character, session_factory, mocker
+):
+    users = await _create_users(test_db_session, 2)
+    mocker.patch.object(
+        RoomService, "_join_room_internal", side_effect=RuntimeError("boom")
+    )
+    with pytest.raises(RuntimeError):
+        await _create_room(session_factory, mocker, users[0])
+    mocker.stopall()
+
+    room = await _create_room(session_factory, mocker, users[1])
+
+    assert room.room_number == 1
+
+
+@pytest.mark.asyncio
+async def test_only_the_room_number_index_counts_as_a_conflict(
+    test_db_session, test_character
+):
+    users = await _create_users(test_db_session, 1)
+    test_db_session.add(Room(name="first", room_number=1, host_id=users[0].id))
+    await test_db_session.commit()
+
+    test_db_session.add(Room(name="second", room_number=1, host_id=users[0].id))
+    with pytest.raises(IntegrityError) as duplicate:
+        await test_db_session.flush()
+    await test_db_session.rollback()
+    test_db_session.add(Room(name="orphan", room_number=2, host_id=uuid.uuid4()))
+    with pytest.raises(IntegrityError) as orphan:
+        await test_db_session.flush()
+    await test_db_session.rollback()
+
+    assert RoomRepository.is_room_number_conflict(duplicate.value)
+    assert not RoomRepository.is_room_number_conflict(orphan.value)
@@ -0,0 +1,138 @@
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import WebSocket
+from sqlalchemy import select, update
+
+from app.core.room_connection_manager import RoomConnectionManager
+from app.models.room import Room
+from app.models.room_presence import RoomPresence
+from app.models.room_user import RoomUser
+from app.models.user import User
+from app.services.presence_registry import PresenceRegistry
+from app.services.room_service import RoomService
+
+
+async def _worker(session_factory) -> PresenceRegistry:
+    return PresenceRegistry(
+        connections=RoomConnectionManager(),
+        session_factory=session_factory,
+        interval=60,
+        ttl=30,
+    )
+
+
+async def _connect(registry: PresenceRegistry, room_id, user_id) -> None:
+    await registry.connections.connect(AsyncMock(spec=WebSocket), room_id, user_id)
+
+
+def _close(registry: PresenceRegistry) -> None:
+    for queue in list(registry.connections.outbound.values()):
+        queue.close()
+
+
+@pytest.mark.asyncio
+async def test_refresh_is_one_batch_per_worker(test_db_session, session_factory):
+    first, second = await _worker(session_factory), await _worker(session_factory)
+    room_id = uuid.uuid4()
+    users = [uuid.uuid4() for _ in range(3)]
+    await _connect(first, room_id, users[0])
+    await _connect(first, room_id, users[1])
+    await _connect(second, room_id, users[2])
+
+    await first.flush()
+    await second.flush()
+
+    async with session_factory() as session:
+        assert await first.live_user_ids(session) == set(users)
+        assert await first.is_live_elsewhere(session, room_id, users[2])
+        assert not await first.is_live_elsewhere(session, room_id, users[0])
+
+    await first.connections.disconnect(room_id, users[1])
+    await first.flush()
+
+    async with session_factory() as session:
+        rows = (await session.execute(select(RoomPresence))).scalars().all()
+    assert {(row.user_id, row.worker_id) for row in rows} == {
+        (users[0], first.worker_id),
+        (users[2], second.worker_id),
+    }
+
+    await second.clear()
+    async with session_factory() as session:
+        assert await first.live_user_ids(session) == {users[0]}
+    _close(first)
+    _close(second)
+
+
+@pytest.mark.asyncio
+async def test_cleanup_keeps_users_connected_to_other_workers(
+    test_db_session, test_character, session_factory, mocker
+):
+    users = [User(uid=f"40000000{i}", nickname=f"User{i}") for i in range(3)]
+    test_db_session.add_all(users)
+    await test_db_session.flush()
+    host, remote, gone = users
+    room = Room(name="Room 1", room_number=1, host_id=host.id)
+    test_db_session.add(room)
+    await test_db_session.flush()
+    room_id = room.id
+    test_db_session.add_all(
+        [
+            RoomUser(
+                room_id=room_id,
+                user_id=user.id,
+                user_uid=user.uid,
+                user_nickname=user.nickname,
+                slot_index=slot,
+            )
+            for slot, user in enumerate(users)
+        ]
+    )
+    await test_db_session.commit()
+    remote_id, gone_id, host_id = remote.id, gone.id, host.id
+
+    other_worker = await _worker(session_factory)
+    await _connect(other_worker, room_id, host_id)
+    await _connect(other_worker, room_id, remote_id)
+    await other_worker.flush()
+    # A crashed worker's rows stop being refreshed and age out.
+    crashed = await _worker(session_factory)
+    await _connect(crashed, room_id, gone_id)
+    await crashed.flush()
+    async with session_factory() as session:
+        await session.execute(
+            update(RoomPresence)
+            .where(RoomPresence.worker_id == crashed.worker_id)
+            .values(last_seen_at=RoomPresence.last_seen_at - crashed.ttl * 2)
+        )
+        await session.commit()
+
+    service = RoomService(session=test_db_session, user_service=mocker.AsyncMock())
+    result = await service.cleanup_rooms()
+
+    assert result.disconnected_room_users == 1
+    seated = set((await test_db_session.scalars(select(RoomUser.user_id))).all())
+    assert seated == {host_id, remote_id}
+    workers = set((await test_db_session.scalars(select(RoomPresence.worker_id))).all())
+    assert workers == {other_worker.worker_id}
+    _close(other_worker)
+    _close(crashed)
+
+
+@pytest.mark.asyncio
+async def test_seat_in_grace_period_stays_live(test_db_session, session_factory):
+    worker, other = await _worker(session_factory), await _worker(session_factory)
+    room_id, user_id = uuid.uuid4(), uuid.uuid4()
+    websocket = AsyncMock(spec=WebSocket)
+    await worker.connections.connect(websocket, room_id, user_id)
+    worker.connections.start_grace(room_id, user_id, websocket, AsyncMock())
+
+    await worker.flush()
+
+    async with session_factory() as session:
+        assert await other.live_user_ids(session) == {user_id}
+        assert await other.is_live_elsewhere(session, room_id, user_id)
+    assert not worker.connections.is_user_in_room(room_id, user_id)
+    _close(worker)
@@ -4,6 +4,7 @@ import pytest
 import pytest_asyncio
 
 from app.core.error import DomainErrorCode, MCRDomainError
+from app.models.character import Character
 from app.models.room import Room
 from app.models.room_user import RoomUser
 from app.models.user import User
@@ -108,7 +109,6 @@ class TestRoomServiceCreateRoom:
 class TestRoomServiceJoinRoom:
     @pytest.mark.asyncio
     async def test_join_room_success(self, mock_room_service, user_id, room_id):
-        user = User(id=user_id, uid="123456789", nickname="TestUser")
         room = Room(
             id=room_id,
             name="엄숙한 패황전",
@@ -118,11 +118,10 @@ class TestRoomServiceJoinRoom:
         )
         room_user = RoomUser(room_id=room_id, user_id=user_id, is_ready=False)
 
-        mock_room_service.user_repository.filter_one_or_raise.return_value = user
-        mock_room_service.room_repository.filter_one_or_raise.return_value = room
-        mock_room_service.room_user_repository.filter.return_value = []
-        mock_room_service.room_user_repository.filter_one.return_value = None
-        mock_room_service.room_user_repository.create.return_value = room_user
+        mock_room_service.room_repository.get_for_update.return_value = room
+        mock_room_service.room_user_repository.insert_into_free_slot.return_value = (
+            room_user
+        )
 
         result = await mock_room_service.join_room(user_id, room_id)
 
@@ -133,7 +132,6 @@ class TestRoomServiceJoinRoom:
 
     @pytest.mark.asyncio
     async def test_join_room_is_playing(self, mock_room_service, user_id, room_id):
-        user = User(id=user_id, uid="123456789", nickname="TestUser")
         room = Room(
             id=room_id,
             name="엄숙한 패황전",
@@ -142,8 +140,7 @@ class TestRoomServiceJoinRoom:
             host_id=uuid.uuid4(),
         )
 
-        mock_room_service.user_repository.filter_one_or_raise.return_value = user
-        mock_room_service.room_repository.filter_one_or_raise.return_value = room
+        mock_room_service.room_repository.get_for_update.return_value = room
 
         with pytest.raises(MCRDomainError) as exc_info:
             await mock_room_service.join_room(user_id, room_id)
@@ -162,12 +159,10 @@ class TestRoomServiceJoinRoom:
             host_id=uuid.uuid4(),
         )
 
-        room_users = [RoomUser(room_id=room_id, user_id=uuid.uuid4()) for _ in range(4)]
-
         mock_room_service.user_repository.filter_one_or_raise.return_value = user
-        mock_room_service.room_repository.filter_one_or_raise.return_value = room
-        mock_room_service.room_user_repository.filter.return_value = room_users
-        mock_room_service.room_user_repository.filter_one.return_value = None
+        mock_room_service.room_repository.get_for_update.return_value = room
+        mock_room_service.room_user_repository.insert_into_free_slot.return_value = None
+        mock_room_service.room_user_repository.count.return_value = 4
 
         with pytest.raises(MCRDomainError) as exc_info:
             await mock_room_service.join_room(user_id, room_id)
@@ -192,21 +187,31 @@ class TestRoomServiceGameManagement:
             host_id=user_id,
         )
 
-        room_user1 = RoomUser(room_id=room_id, user_id=user_id, is_ready=True)
-        room_user2 = RoomUser(room_id=room_id, user_id=user2.id, is_ready=False)
+        character = Character(code="c0", name="기본 캐릭터")
+        room_user1 = RoomUser(
+            room_id=room_id,
+            user_id=user_id,
+            user_uid=user1.uid,
+            user_nickname=user1.nickname,
+            is_ready=True,
+            slot_index=0,
+            character=character,
+        )
+        room_user2 = RoomUser(
+            room_id=room_id,
+            user_id=user2.id,
+            user_uid=user2.uid,
+            user_nickname=user2.nickname,
+            is_ready=False,
+            slot_index=1,
+            character=character,
+        )
 
         mock_room_repo = mock_room_service.room_repository
         mock_room_repo.get_available_rooms_with_users.return_value = [
-            (room, [room_user1, room_user2])
+            (room, user1, [room_user1, room_user2])
         ]
 
-        mock_room_service.user_repository.filter_one_or_raise.side_effect = (
-            lambda id=None, **kwargs: {
-                user_id: user1,
-                user2.id: user2,
-            }.get(id or kwargs.get("id"))
-        )
-
         result = await mock_room_service.get_available_rooms()
 
         assert len(result) == 1
@@ -0,0 +1,52 @@
+import pytest
+
+from app.core.room_connection_manager import RoomConnectionManager
+from app.models.room import Room
+from app.models.room_user import RoomUser
+from app.models.user import User
+from app.services.room_service import RoomService
+from app.services.room_state import RoomStateStore
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_one_query_with_unsaved_ready_flags(
+    test_db_session, test_character, session_factory, statement_counter, mocker
+):
+    mocker.patch(
+        "app.services.room_service.room_state_store",
+        RoomStateStore(
+            connections=RoomConnectionManager(),
+            session_factory=session_factory,
+            interval=60,
+        ),
+    )
+    users = [User(uid=f"60000000{i}", nickname=f"User{i}") for i in range(3)]
+    test_db_session.add_all(users)
+    await test_db_session.flush()
+    room = Room(name="Room 1", room_number=1, host_id=users[1].id)
+    test_db_session.add(room)
+    await test_db_session.flush()
+    test_db_session.add_all(
+        RoomUser(
+            room_id=room.id,
+            user_id=user.id,
+            user_uid=user.uid,
+            user_nickname=user.nickname,
+            slot_index=slot,
+        )
+        for slot, user in reversed(list(enumerate(users)))
+    )
+    await test_db_session.commit()
+    service = RoomService(session=test_db_session, user_service=None)
+    await service.update_user_ready_status(users[2].id, room.id, True)
+
+    statement_counter.clear()
+    snapshot = await service.get_room_snapshot(room)
+
+    assert len(statement_counter) == 1
+    assert snapshot.host_uid == users[1].uid
+    assert [user.user_uid for user in snapshot.users] == [u.uid for u in users]
+    assert [user.is_ready for user in snapshot.users] == [False, False, True]
+    assert {user.current_character.code for user in snapshot.users} == {
+        test_character.code
+    }
@@ -0,0 +1,250 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import delete, select
+
+from app.core.error import DomainErrorCode, MCRDomainError
+from app.core.room_connection_manager import RoomConnectionManager
+from app.core.room_pubsub import InProcessBackend, InProcessBus
+from app.models.room import Room
+from app.models.room_user import RoomUser
+from app.models.user import User
+from app.services.room_service import RoomService
+from app.services.room_state import RoomStateStore
+
+
+@pytest.fixture
+def store(session_factory, mocker):
+    store = RoomStateStore(
+        connections=RoomConnectionManager(),
+        session_factory=session_factory,
+        interval=60,
+    )
+    mocker.patch("app.services.room_service.room_state_store", store)
+    return store
+
+
+async def _room(session, count: int) -> tuple[Room, list[User]]:
+    users = [User(uid=f"50000000{i}", nickname=f"User{i}") for i in range(count)]
+    session.add_all(users)
+    await session.flush()
+    room = Room(name="Room 1", room_number=1, host_id=users[0].id)
+    session.add(room)
+    await session.flush()
+    session.add_all(
+        RoomUser(
+            room_id=room.id,
+            user_id=user.id,
+            user_uid=user.uid,
+            user_nickname=user.nickname,
+            slot_index=slot,
+        )
+        for slot, user in enumerate(users)
+    )
+    await session.commit()
+    return room, users
+
+
+async def _ready_in_db(session_factory, room_id) -> dict:
+    async with session_factory() as session:
+        rows = await session.scalars(
+            select(RoomUser).where(RoomUser.room_id == room_id)
+        )
+        return {row.user_id: row.is_ready for row in rows}
+
+
+@pytest.mark.asyncio
+async def test_ready_toggles_are_written_behind_in_one_batch(
+    test_db_session, test_character, session_factory, store, statement_counter
+):
+    room, users = await _room(test_db_session, 4)
+    service = RoomService(session=test_db_session, user_service=None)
+
+    for user in users:
+        seat = await service.update_user_ready_status(user.id, room.id, True)
+        assert seat.is_ready is True
+    await service.update_user_ready_status(users[1].id, room.id, False)
+    await service.update_user_ready_status(users[1].id, room.id, True)
+
+    writes = [s for s in statement_counter if s.startswith("UPDATE")]
+    assert writes == []
+    assert set((await _ready_in_db(session_factory, room.id)).values()) == {False}
+    assert store.stats()["pending"] == 4
+
+    assert await store.flush() == 4
+    assert set((await _ready_in_db(session_factory, room.id)).values()) == {True}
+    assert store.stats()["pending"] == 0
+    assert store.loads == 1
+
+
+@pytest.mark.asyncio
+async def test_start_game_flushes_pending_ready_flags(
+    test_db_session, test_character, session_factory, store, mocker
+):
+    room, users = await _room(test_db_session, 4)
+    service = RoomService(session=test_db_session, user_service=None)
+    mocker.patch.object(
+        RoomService, "_call_game_server_api", return_value="ws://game/42"
+    )
+    mocker.patch(
+        "app.services.room_service.room_manager.broadcast_game_started",
+        new=mocker.AsyncMock(),
+    )
+
+    for user in users[:3]:
+        await service.update_user_ready_status(user.id, room.id, True)
+    with pytest.raises(MCRDomainError) as exc_info:
+        await service.start_game(room.id)
+    assert exc_info.value.code == DomainErrorCode.PLAYERS_NOT_READY
+    assert exc_info.value.details["not_ready_count"] == 1
+
+    await service.update_user_ready_status(users[3].id, room.id, True)
+    started = await service.start_game(room.id)
+
+    assert started.is_playing
+    assert set((await _ready_in_db(session_factory, room.id)).values()) == {True}
+    assert room.id not in store.rooms
+
+
+@pytest.mark.asyncio
+async def test_reload_after_join_keeps_unsaved_flags(
+    test_db_session, test_character, session_factory, store
+):
+    room, users = await _room(test_db_session, 2)
+    late = User(uid="599999999", nickname="Late")
+    test_db_session.add(late)
+    await test_db_session.commit()
+    service = RoomService(session=test_db_session, user_service=None)
+
+    await service.update_user_ready_status(users[1].id, room.id, True)
+    await service.join_room(late.id, room.id)
+    await service.update_user_ready_status(late.id, room.id, True)
+
+    assert store.loads == 2
+    members = await service.get_room_users(room.id)
+    assert [user.is_ready for user in members.users] == [False, True, True]
+
+    await store.flush_room(test_db_session, room.id)
+    assert await _ready_in_db(session_factory, room.id) == {
+        users[0].id: False,
+        users[1].id: True,
+        late.id: True,
+    }
+
+
+@pytest.mark.asyncio
+async def test_rejoined_seat_does_not_inherit_unsaved_flag(
+    test_db_session, test_character, session_factory, store
+):
+    room, users = await _room(test_db_session, 3)
+    service = RoomService(session=test_db_session, user_service=None)
+
+    await service.update_user_ready_status(users[1].id, room.id, True)
+    await service.leave_room(users[1].id, room.id)
+    await service.join_room(users[1].id, room.id)
+    await service.update_user_ready_status(users[2].id, room.id, True)
+
+    members = await service.get_room_users(room.id)
+    assert {user.user_uid: user.is_ready for user in members.users} == {
+        users[0].uid: False,
+        users[1].uid: False,
+        users[2].uid: True,
+    }
+    await store.flush_room(test_db_session, room.id)
+    assert await _ready_in_db(session_factory, room.id) == {
+        users[0].id: False,
+        users[1].id: False,
+        users[2].id: True,
+    }
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_flags_pending(
+    test_db_session, test_character, session_factory, store, mocker
+):
+    room, users = await _room(test_db_session, 2)
+    service = RoomService(session=test_db_session, user_service=None)
+    await service.update_user_ready_status(users[0].id, room.id, True)
+
+    mocker.patch(
+        "app.services.room_state.RoomUserRepository.update_ready_flags",
+        side_effect=ConnectionError("database went away"),
+    )
+    with pytest.raises(ConnectionError):
+        await store.flush()
+    assert store.stats()["pending"] == 1
+
+    mocker.stopall()
+    assert await store.flush() == 1
+    assert (await _ready_in_db(session_factory, room.id))[users[0].id] is True
+
+
+@pytest.mark.asyncio
+async def test_ready_for_a_user_outside_the_room_is_rejected(
+    test_db_session, test_character, store
+):
+    room, _ = await _room(test_db_session, 1)
+    service = RoomService(session=test_db_session, user_service=None)
+
+    with pytest.raises(MCRDomainError) as exc_info:
+        await service.update_user_ready_status(uuid.uuid4(), room.id, True)
+
+    assert exc_info.value.code == DomainErrorCode.USER_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_start_game_sees_flags_pending_on_another_worker(
+    test_db_session, test_character, session_factory, mocker
+):
+    bus = InProcessBus()
+    managers = [RoomConnectionManager(backend=InProcessBackend(bus)) for _ in range(2)]
+    for manager in managers:
+        await manager.start()
+    first, second = (
+        RoomStateStore(connections=manager, session_factory=session_factory)
+        for manager in managers
+    )
+    room, users = await _room(test_db_session, 4)
+    service = RoomService(session=test_db_session, user_service=None)
+    mocker.patch.object(
+        RoomService, "_call_game_server_api", return_value="ws://game/42"
+    )
+    mocker.patch(
+        "app.services.room_service.room_manager.broadcast_game_started",
+        new=mocker.AsyncMock(),
+    )
+
+    mocker.patch("app.services.room_service.room_state_store", first)
+    for user in users:
+        await service.update_user_ready_status(user.id, room.id, True)
+    await asyncio.sleep(0)
+
+    mocker.patch("app.services.room_service.room_state_store", second)
+    members = await service.get_room_users(room.id)
+    assert all(user.is_ready for user in members.users)
+    started = await service.start_game(room.id)
+
+    assert started.is_playing
+    assert second.stats()["remote"] == 0
+    for manager in managers:
+        await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_rows_written_counts_only_rows_still_there(
+    test_db_session, test_character, session_factory, store
+):
+    room, users = await _room(test_db_session, 2)
+    service = RoomService(session=test_db_session, user_service=None)
+    for user in users:
+        await service.update_user_ready_status(user.id, room.id, True)
+
+    # Seat removed behind this worker's back, e.g. by the cleanup sweeper.
+    await test_db_session.execute(
+        delete(RoomUser).where(RoomUser.user_id == users[1].id)
+    )
+    await test_db_session.commit()
+
+    assert await store.flush() == 1
+    assert store.stats()["rows_written"] == 1
@@ -0,0 +1,55 @@
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.schemas.room import RoomCleanupResponse
+from app.services.room_sweeper import RoomSweeper
+
+
+@pytest.fixture
+def room_service(mocker):
+    service = mocker.AsyncMock()
+    service.cleanup_rooms.return_value = RoomCleanupResponse(
+        disconnected_room_users=2, empty_rooms=1
+    )
+    return service
+
+
+@pytest.fixture
+def sweeper(room_service):
+    @asynccontextmanager
+    async def service_scope():
+        yield room_service
+
+    return RoomSweeper(service_scope=service_scope, interval=30.0, jitter=5.0)
+
+
+@pytest.mark.asyncio
+async def test_sweep_runs_cleanup_and_records_duration(sweeper, room_service):
+    result = await sweeper.sweep()
+
+    room_service.cleanup_rooms.assert_awaited_once_with()
+    assert result.total == 3
+    assert sweeper.last_result is result
+    assert sweeper.durations.count == 1
+    stats = sweeper.stats()
+    assert stats["last_result"]["empty_rooms"] == 1
+    assert stats["durations"]["count"] == 1
+
+
+def test_next_delay_is_jittered(sweeper):
+    delays = [sweeper.next_delay() for _ in range(100)]
+
+    assert all(30.0 <= delay <= 35.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+@pytest.mark.asyncio
+async def test_failed_sweep_does_not_record(sweeper, room_service):
+    room_service.cleanup_rooms.side_effect = RuntimeError("db down")
+
+    with pytest.raises(RuntimeError):
+        await sweeper.sweep()
+
+    assert sweeper.durations.count == 0
+    assert sweeper.last_result is None
@@ -0,0 +1,139 @@
+import asyncio
+import time
+import uuid
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import WebSocket
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.v1.endpoints.ws_room import RoomWebSocketHandler
+from app.core.config import get_test_settings
+from app.core.room_connection_manager import RoomConnectionManager
+from app.models.room import Room
+from app.models.room_user import RoomUser
+from app.models.user import User
+from app.services.room_service import RoomService
+from app.services.room_state import RoomStateStore
+
+SOCKETS = 500
+POOL_SIZE = 10
+
+
+async def _seed(session) -> list[tuple[int, uuid.UUID]]:
+    users = [
+        {"id": uuid.uuid4(), "uid": f"{700000000 + i}", "nickname": f"P{i}"}
+        for i in range(SOCKETS)
+    ]
+    await session.execute(insert(User), users)
+    rooms, seats = [], []
+    for number, start in enumerate(range(0, SOCKETS, 4), start=1):
+        room_id = uuid.uuid4()
+        rooms.append(
+            {
+                "id": room_id,
+                "name": f"Room {number}",
+                "room_number": number,
+                "host_id": users[start]["id"],
+            }
+        )
+        for slot, user in enumerate(users[start : start + 4]):
+            seats.append(
+                {
+                    "id": uuid.uuid4(),
+                    "room_id": room_id,
+                    "user_id": user["id"],
+                    "user_uid": user["uid"],
+                    "user_nickname": user["nickname"],
+                    "slot_index": slot,
+                }
+            )
+    await session.execute(insert(Room), rooms)
+    await session.execute(insert(RoomUser), seats)
+    await session.commit()
+    return [(i // 4 + 1, user["id"]) for i, user in enumerate(users)]
+
+
+@pytest.fixture
+async def small_pool():
+    engine = create_async_engine(
+        get_test_settings().database_uri,
+        pool_size=POOL_SIZE,
+        max_overflow=0,
+        pool_timeout=30,
+    )
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_idle_sockets_hold_no_pooled_connections(
+    test_db_session, test_character, small_pool, mocker
+):
+    seats = await _seed(test_db_session)
+    manager = RoomConnectionManager()
+    mocker.patch("app.api.v1.endpoints.ws_room.room_manager", manager)
+    mocker.patch("app.api.v1.endpoints.ws_room.presence_registry", MagicMock())
+    mocker.patch(
+        "app.api.v1.endpoints.ws_room.get_user_id_from_token", side_effect=uuid.UUID
+    )
+    sessions = async_sessionmaker(
+        small_pool, class_=AsyncSession, expire_on_commit=False
+    )
+    store = RoomStateStore(connections=manager, session_factory=sessions)
+    mocker.patch("app.services.room_service.room_state_store", store)
+
+    @asynccontextmanager
+    async def scope():
+        async with sessions() as session:
+            yield RoomService(session=session, user_service=AsyncMock())
+
+    handlers, idle = [], asyncio.Event()
+    for room_number, user_id in seats:
+        websocket = AsyncMock(spec=WebSocket)
+        websocket.query_params = {"authorization": str(user_id)}
+        websocket.headers = {}
+        websocket.receive_text.side_effect = idle.wait
+        handlers.append(RoomWebSocketHandler(websocket, room_number, scope))
+    tasks = [asyncio.create_task(handler.handle_connection()) for handler in handlers]
+
+    try:
+        async with asyncio.timeout(30):
+            while len(manager.get_connected_user_ids()) < SOCKETS:
+                await asyncio.sleep(0.05)
+        await asyncio.sleep(0.05)
+
+        assert small_pool.pool.checkedout() == 0
+
+        # Requests arriving while every socket is open never wait on the pool.
+        async def request() -> float:
+            started = time.perf_counter()
+            async with sessions() as session:
+                await session.execute(select(1))
+            return time.perf_counter() - started
+
+        latencies = await asyncio.gather(*(request() for _ in range(POOL_SIZE)))
+        assert max(latencies) < 0.5
+
+        # DB-backed actions borrow a connection and hand it straight back.
+        await asyncio.gather(
+            *(
+                handler.dispatch('{"action": "ready", "data": {"is_ready": true}}')
+                for handler in handlers[:50]
+            )
+        )
+        assert small_pool.pool.checkedout() == 0
+        assert await store.flush() == 50
+        assert small_pool.pool.checkedout() == 0
+        ready = await test_db_session.scalar(
+            select(RoomUser.id).where(RoomUser.is_ready == True).limit(1)  # noqa: E712
+        )
+        assert ready is not None
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for queue in list(manager.outbound.values()):
+            queue.close()
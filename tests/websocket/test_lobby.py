@@ -0,0 +1,33 @@
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import WebSocket, WebSocketDisconnect
+
+from app.api.v1.endpoints.ws_lobby import lobby_websocket
+
+
+@pytest.mark.asyncio
+async def test_malformed_frames_get_an_error_and_the_socket_stays_open(mocker):
+    manager = mocker.patch("app.api.v1.endpoints.ws_lobby.lobby_manager")
+    manager.connect = AsyncMock()
+    mocker.patch(
+        "app.api.v1.endpoints.ws_lobby.get_user_id_from_token", return_value="user"
+    )
+    websocket = AsyncMock(spec=WebSocket)
+    websocket.query_params = {"authorization": "token"}
+    websocket.receive_text.side_effect = [
+        "not json",
+        '{"action": "ping"}',
+        WebSocketDisconnect(),
+    ]
+
+    await lobby_websocket(websocket)
+
+    frames = [json.loads(c.args[0]) for c in websocket.send_text.await_args_list]
+    assert [(f["status"], f["action"]) for f in frames] == [
+        ("error", "error"),
+        ("success", "pong"),
+    ]
+    assert frames[0]["error"] == "Invalid message format"
+    manager.disconnect.assert_called_once_with(websocket)
@@ -1,3 +1,5 @@
+import json
+from contextlib import asynccontextmanager
 from unittest.mock import patch
 
 import pytest
@@ -10,6 +12,14 @@ from app.schemas.ws import WebSocketMessage, WSActionType
 pytestmark = pytest.mark.skip(reason="모든 테스트 스킵")
 
 
+def _scope(room_service):
+    @asynccontextmanager
+    async def scope():
+        yield room_service
+
+    return scope
+
+
 @pytest.mark.asyncio
 async def test_connection_success(room_ws_client, mocker):
     mock_room_service = mocker.AsyncMock()
@@ -27,7 +37,7 @@ async def test_connection_success(room_ws_client, mocker):
     handler = RoomWebSocketHandler(
         websocket=room_ws_client,
         room_number=room.room_number,
-        room_service=mock_room_service,
+        service_scope=_scope(mock_room_service),
     )
 
     with (
@@ -56,23 +66,22 @@ async def test_ping_pong(room_ws_client, mocker):
     handler = RoomWebSocketHandler(
         websocket=room_ws_client,
         room_number=room_ws_client.test_data["room"].room_number,
-        room_service=mock_room_service,
+        service_scope=_scope(mock_room_service),
     )
 
     handler.user_id = room_ws_client.test_data["user"].id
     handler.room_id = room_ws_client.test_data["room"].id
     handler.room_user = room_ws_client.test_data["room_user"]
 
-    with patch(
-        "app.core.room_connection_manager.room_manager.send_personal_message"
-    ) as mock_send:
+    with patch("app.core.room_connection_manager.room_manager.send_frame") as mock_send:
         await handler.handle_ping(WebSocketMessage(action="ping", data={}))
 
     mock_send.assert_called_once()
     args, _ = mock_send.call_args
-    assert args[0]["action"] == WSActionType.PONG
-    assert args[0]["status"] == "success"
-    assert "pong" in args[0]["data"]["message"]
+    frame = json.loads(args[2])
+    assert frame["action"] == WSActionType.PONG
+    assert frame["status"] == "success"
+    assert "pong" in frame["data"]["message"]
 
 
 @pytest.mark.asyncio
@@ -86,7 +95,7 @@ async def test_ready_status(room_ws_client, mocker):
     handler = RoomWebSocketHandler(
         websocket=room_ws_client,
         room_number=room_ws_client.test_data["room"].room_number,
-        room_service=mock_room_service,
+        service_scope=_scope(mock_room_service),
     )
     handler.user_id = room_ws_client.test_data["user"].id
     handler.room_id = room_ws_client.test_data["room"].id
@@ -98,17 +107,18 @@ async def test_ready_status(room_ws_client, mocker):
     with patch(
         "app.core.room_connection_manager.room_manager.broadcast"
     ) as mock_broadcast:
-        await handler.handle_ready(message)
+        async with handler.session():
+            await handler.handle_ready(message)
 
     mock_room_service.update_user_ready_status.assert_called_once_with(
         handler.user_id, handler.room_id, True
     )
     mock_broadcast.assert_called_once()
     args, _ = mock_broadcast.call_args
-    assert args[0]["action"] == WSActionType.USER_READY_CHANGED
-    assert args[0]["status"] == "success"
-    assert args[0]["data"]["user_uid"] == handler.user.uid
-    assert args[0]["data"]["is_ready"] is True
+    assert args[0].action == WSActionType.USER_READY_CHANGED
+    assert args[0].status == "success"
+    assert args[0].data["user_uid"] == handler.user.uid
+    assert args[0].data["is_ready"] is True
 
 
 @pytest.mark.asyncio
@@ -118,7 +128,7 @@ async def test_connection_invalid_token(room_ws_client, mocker):
     handler = RoomWebSocketHandler(
         websocket=room_ws_client,
         room_number=1234,
-        room_service=mock_room_service,
+        service_scope=_scope(mock_room_service),
     )
     result = await handler.handle_connection()
     assert not result
@@ -136,7 +146,7 @@ async def test_connection_room_not_found(room_ws_client, mocker):
     handler = RoomWebSocketHandler(
         websocket=room_ws_client,
         room_number=9999,
-        room_service=mock_room_service,
+        service_scope=_scope(mock_room_service),
     )
     result = await handler.handle_connection()
     assert not result
@@ -0,0 +1,258 @@
+import json
+import uuid
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import WebSocket, WebSocketDisconnect, status
+
+from app.api.v1.endpoints.ws_room import (
+    RoomWebSocketHandler,
+    decode_frame,
+    negotiate_protocol,
+)
+from app.core.rate_limit import ActionRateLimiter
+from app.core.room_connection_manager import RoomConnectionManager
+from app.core.ws_codec import pack
+from app.schemas.room import RoomUsersResponse
+from app.schemas.ws import RoomProtocol
+
+
+def _scope(room_service):
+    @asynccontextmanager
+    async def scope():
+        yield room_service
+
+    return scope
+
+
+@pytest.fixture
+def handler(mocker):
+    manager = mocker.patch("app.api.v1.endpoints.ws_room.room_manager")
+    manager.is_user_in_room.return_value = False
+    handler = RoomWebSocketHandler(AsyncMock(spec=WebSocket), 1, _scope(AsyncMock()))
+    handler.user_id, handler.room_id = uuid.uuid4(), uuid.uuid4()
+    handler.room_user, handler.user = MagicMock(), MagicMock(uid="123456789")
+    return handler
+
+
+def _sent(handler) -> list[dict]:
+    return [json.loads(c.args[0]) for c in handler.websocket.send_text.await_args_list]
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ('{"action": "ping"}', ("ping", None)),
+        (
+            '{"action": "ready", "data": {"is_ready": true}}',
+            ("ready", {"is_ready": True}),
+        ),
+        ("{}", ("", None)),
+        ("[1, 2]", None),
+        ('{"action": 3}', None),
+        ("not json", None),
+    ],
+)
+def test_decode_frame(text, expected):
+    assert decode_frame(text) == expected
+
+
+@pytest.mark.asyncio
+async def test_dispatch_skips_validation_for_data_free_actions(handler, mocker):
+    validate = mocker.patch("app.api.v1.endpoints.ws_room.WebSocketMessage")
+    handle_ping = mocker.patch.object(RoomWebSocketHandler, "handle_ping")
+    mocker.patch.dict(RoomWebSocketHandler.HANDLERS, {"ping": handle_ping})
+
+    await handler.dispatch('{"action": "ping", "data": {"ignored": 1}}')
+
+    validate.assert_not_called()
+    validate.model_construct.assert_called_once_with(action="ping", data=None)
+    handle_ping.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_validates_ready_payload(handler):
+    await handler.dispatch('{"action": "ready", "data": "yes"}')
+
+    (frame,) = _sent(handler)
+    assert frame["status"] == "error"
+    assert frame["error"].startswith("Invalid message format")
+    async with handler.session() as room_service:
+        room_service.update_user_ready_status.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_errors_use_cached_frames(handler):
+    await handler.dispatch("garbage")
+    await handler.dispatch("garbage")
+    await handler.dispatch('{"action": "fly"}')
+
+    first, second, unknown = (
+        c.args[0] for c in handler.websocket.send_text.await_args_list
+    )
+    assert first is second
+    assert json.loads(unknown) == {
+        "status": "error",
+        "action": "error",
+        "error": "Unknown action: fly",
+    }
+
+
+@pytest.mark.asyncio
+async def test_known_action_before_joining_is_a_state_error(handler):
+    handler.room_user = None
+
+    await handler.dispatch('{"action": "ready", "data": {"is_ready": true}}')
+
+    (frame,) = _sent(handler)
+    assert frame["error"] == "User or room user data is missing"
+    async with handler.session() as room_service:
+        room_service.update_user_ready_status.assert_not_awaited()
+
+
+@pytest.mark.parametrize(
+    ("offered", "expected"),
+    [
+        (None, None),
+        ("chat, superchat", None),
+        ("mcr.room.v2", RoomProtocol.V2),
+        ("chat, mcr.room.v1, mcr.room.v2", RoomProtocol.V1),
+        ("mcr.room.v2.msgpack, mcr.room.v2", RoomProtocol.V2_MSGPACK),
+    ],
+)
+def test_negotiate_protocol(offered, expected):
+    assert negotiate_protocol(offered) is expected
+
+
+@pytest.mark.asyncio
+async def test_over_limit_actions_get_an_error_then_a_1008_close(handler):
+    handler.rate_limiter = ActionRateLimiter({"*": (0.001, 1)}, strikes=2)
+
+    await handler.dispatch('{"action": "fly"}')
+    await handler.dispatch('{"action": "fly"}')
+    with pytest.raises(WebSocketDisconnect):
+        await handler.dispatch('{"action": "fly"}')
+
+    assert [frame["error"] for frame in _sent(handler)] == [
+        "Unknown action: fly",
+        "Rate limit exceeded",
+    ]
+    handler.websocket.close.assert_awaited_once_with(
+        code=status.WS_1008_POLICY_VIOLATION, reason="Rate limit exceeded"
+    )
+
+
+@pytest.mark.asyncio
+async def test_ready_spam_is_limited_before_touching_the_service(handler, mocker):
+    mocker.patch("app.api.v1.endpoints.ws_room.room_manager.broadcast", AsyncMock())
+    handler.rate_limiter = ActionRateLimiter({"ready": (0.001, 2)}, strikes=10)
+
+    for _ in range(4):
+        await handler.dispatch('{"action": "ready", "data": {"is_ready": true}}')
+
+    async with handler.session() as room_service:
+        assert room_service.update_user_ready_status.await_count == 2
+    assert [frame["error"] for frame in _sent(handler)] == ["Rate limit exceeded"] * 2
+
+
+def test_decode_frame_reads_msgpack_binary_frames():
+    assert decode_frame(pack({"action": "ready", "data": {"is_ready": True}})) == (
+        "ready",
+        {"is_ready": True},
+    )
+    assert decode_frame(b"\xc1") is None
+
+
+@pytest.mark.asyncio
+async def test_open_sends_a_snapshot_for_a_stale_resume_token(mocker):
+    manager = RoomConnectionManager()
+    mocker.patch("app.api.v1.endpoints.ws_room.room_manager", manager)
+    room_service = AsyncMock()
+    user, room = MagicMock(id=uuid.uuid4()), MagicMock(id=uuid.uuid4())
+    room_service.validate_room_user_connection.return_value = (user, room, None)
+    room_service.get_room_snapshot.return_value = RoomUsersResponse(
+        host_uid="123456789", users=[]
+    )
+    websocket = AsyncMock(spec=WebSocket)
+    websocket.headers = {"sec-websocket-protocol": "mcr.room.v1"}
+    websocket.query_params = {"resume_epoch": "gone", "resume_seq": "7"}
+    handler = RoomWebSocketHandler(websocket, 1, _scope(room_service))
+
+    await handler.open(user.id)
+    await manager.drain(room.id)
+
+    resume, snapshot = _sent(handler)
+    assert resume["data"]["resumed"] is False
+    assert snapshot["action"] == "room_snapshot"
+    assert snapshot["data"] == {"host_uid": "123456789", "users": []}
+    websocket.accept.assert_awaited_once_with(subprotocol="mcr.room.v1")
+    for queue in list(manager.outbound.values()):
+        queue.close()
+
+
+@pytest.mark.asyncio
+async def test_open_queues_the_snapshot_ahead_of_racing_events(mocker):
+    manager = RoomConnectionManager()
+    mocker.patch("app.api.v1.endpoints.ws_room.room_manager", manager)
+    room_service = AsyncMock()
+    user, room = MagicMock(id=uuid.uuid4()), MagicMock(id=uuid.uuid4())
+    room_service.validate_room_user_connection.return_value = (user, room, None)
+    other = AsyncMock(spec=WebSocket)
+    await manager.connect(other, room.id, uuid.uuid4())
+
+    async def snapshot(_):
+        await manager.broadcast(
+            {"status": "success", "action": "user_ready_changed", "data": {}}, room.id
+        )
+        return RoomUsersResponse(host_uid="123456789", users=[])
+
+    room_service.get_room_snapshot.side_effect = snapshot
+    websocket = AsyncMock(spec=WebSocket)
+    websocket.headers = {}
+    websocket.query_params = {}
+    handler = RoomWebSocketHandler(websocket, 1, _scope(room_service))
+
+    await handler.open(user.id)
+    await manager.drain(room.id)
+
+    assert [frame["action"] for frame in _sent(handler)] == [
+        "room_snapshot",
+        "user_ready_changed",
+    ]
+    websocket.accept.assert_awaited_once_with(subprotocol=None)
+    for queue in list(manager.outbound.values()):
+        queue.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        ({}, ["room_snapshot"]),
+        ({"sec-websocket-protocol": "mcr.room.v1"}, ["room_snapshot"]),
+        ({"sec-websocket-protocol": "mcr.room.v2"}, ["resume", "room_snapshot"]),
+    ],
+)
+async def test_only_v2_clients_get_an_unrequested_resume_frame(
+    mocker, headers, expected
+):
+    manager = RoomConnectionManager()
+    mocker.patch("app.api.v1.endpoints.ws_room.room_manager", manager)
+    room_service = AsyncMock()
+    user, room = MagicMock(id=uuid.uuid4()), MagicMock(id=uuid.uuid4())
+    room_service.validate_room_user_connection.return_value = (user, room, None)
+    room_service.get_room_snapshot.return_value = RoomUsersResponse(
+        host_uid="123456789", users=[]
+    )
+    websocket = AsyncMock(spec=WebSocket)
+    websocket.headers = headers
+    websocket.query_params = {}
+    handler = RoomWebSocketHandler(websocket, 1, _scope(room_service))
+
+    await handler.open(user.id)
+    await manager.drain(room.id)
+
+    assert [frame["action"] for frame in _sent(handler)] == expected
+    for queue in list(manager.outbound.values()):
+        queue.close()